@@ -4,7 +4,10 @@ from currency_convert.domain.agency.entities.agency import (
     AgencyNotFoundError,
     DuplicateAgencyError,
 )
-from currency_convert.domain.agency.entities.interface import AgencyRepository
+from currency_convert.domain.agency.entities.interface import (
+    AgencyRepository,
+    AsyncAgencyRepository,
+)
 
 
 class CreateAgencyHandler:
@@ -19,3 +22,17 @@ class CreateAgencyHandler:
             self.repository.save(agency)
             return agency
         raise DuplicateAgencyError(cmd.name)
+
+
+class AsyncCreateAgencyHandler:
+    def __init__(self, repository: AsyncAgencyRepository) -> None:
+        self.repository = repository
+
+    async def execute(self, cmd: CreateAgency) -> Agency:
+        try:
+            await self.repository.find_by_name(cmd.name)
+        except AgencyNotFoundError:
+            agency = Agency.create(cmd.base, cmd.name, cmd.address, cmd.country)
+            await self.repository.save(agency)
+            return agency
+        raise DuplicateAgencyError(cmd.name)
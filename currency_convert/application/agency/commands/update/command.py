@@ -1,7 +1,10 @@
 import dataclasses
 
 from currency_convert.application.primitives.command import Command
-from currency_convert.domain.agency.entities.interface import UpdateStrategy
+from currency_convert.domain.agency.entities.interface import (
+    AsyncUpdateStrategy,
+    UpdateStrategy,
+)
 
 
 @dataclasses.dataclass(frozen=True)
@@ -17,3 +20,18 @@ class UpdateByName(Update):
 @dataclasses.dataclass(frozen=True)
 class UpdateById(Update):
     id: str
+
+
+@dataclasses.dataclass(frozen=True)
+class AsyncUpdate(Command):
+    strategy: AsyncUpdateStrategy
+
+
+@dataclasses.dataclass(frozen=True)
+class AsyncUpdateByName(AsyncUpdate):
+    name: str
+
+
+@dataclasses.dataclass(frozen=True)
+class AsyncUpdateById(AsyncUpdate):
+    id: str
@@ -1,42 +1,138 @@
+from typing import Mapping, Sequence
+
 from currency_convert.application.agency.commands.update.command import (
+    AsyncUpdateById,
+    AsyncUpdateByName,
     UpdateById,
     UpdateByName,
 )
 from currency_convert.domain.agency.entities.agency import (
     AgencyNotFoundError,
+    GapFill,
     UpdateError,
 )
 from currency_convert.domain.agency.entities.interface import (
     AgencyRepository,
+    AsyncAgencyRepository,
+    RateObserver,
 )
 from currency_convert.domain.primitives.valueobject import ValueObjectError
 
 
 class ByNameUpdateHandler:
-    def __init__(self, repository: AgencyRepository) -> None:
+    def __init__(
+        self,
+        repository: AgencyRepository,
+        observers: Sequence[RateObserver] = (),
+        gap_fill: Mapping[str, GapFill] | None = None,
+    ) -> None:
         self.repository = repository
+        self.observers = observers
+        self.gap_fill = dict(gap_fill or {})
 
     def execute(self, cmd: UpdateByName) -> None:
         if (agency := self.repository.find_by_name(cmd.name)) is None:
             raise AgencyNotFoundError()
         try:
-            agency.update(rate_strategy=cmd.strategy)
+            added = agency.update(
+                rate_strategy=cmd.strategy, gap_fill=self.gap_fill.get(agency.name)
+            )
         except ValueObjectError as exc:
             raise UpdateError.from_exc(exc)
         else:
             self.repository.save(agency)
+            if not self.observers:
+                return
+            # tells observers whether they saw every write since they loaded
+            version = self.repository.find_version(agency.name)
+            for observer in self.observers:
+                observer.rates_added(agency, added, version)
 
 
 class ByIdUpdateHandler:
-    def __init__(self, repository: AgencyRepository) -> None:
+    def __init__(
+        self,
+        repository: AgencyRepository,
+        observers: Sequence[RateObserver] = (),
+        gap_fill: Mapping[str, GapFill] | None = None,
+    ) -> None:
         self.repository = repository
+        self.observers = observers
+        self.gap_fill = dict(gap_fill or {})
 
     def execute(self, cmd: UpdateById) -> None:
         if (agency := self.repository.find_by_id(cmd.id)) is None:
             raise AgencyNotFoundError()
         try:
-            agency.update(rate_strategy=cmd.strategy)
+            added = agency.update(
+                rate_strategy=cmd.strategy, gap_fill=self.gap_fill.get(agency.name)
+            )
         except ValueObjectError as exc:
             raise UpdateError.from_exc(exc)
         else:
             self.repository.save(agency)
+            if not self.observers:
+                return
+            # tells observers whether they saw every write since they loaded
+            version = self.repository.find_version(agency.name)
+            for observer in self.observers:
+                observer.rates_added(agency, added, version)
+
+
+class AsyncByNameUpdateHandler:
+    def __init__(
+        self,
+        repository: AsyncAgencyRepository,
+        observers: Sequence[RateObserver] = (),
+        gap_fill: Mapping[str, GapFill] | None = None,
+    ) -> None:
+        self.repository = repository
+        self.observers = observers
+        self.gap_fill = dict(gap_fill or {})
+
+    async def execute(self, cmd: AsyncUpdateByName) -> None:
+        # fetch first, so no connection is held while waiting on the source
+        fetched = await cmd.strategy()
+        agency = await self.repository.find_by_name(cmd.name)
+        try:
+            added = agency.update(
+                rate_strategy=lambda: fetched, gap_fill=self.gap_fill.get(agency.name)
+            )
+        except ValueObjectError as exc:
+            raise UpdateError.from_exc(exc)
+        else:
+            await self.repository.save(agency)
+            if not self.observers:
+                return
+            version = await self.repository.find_version(agency.name)
+            for observer in self.observers:
+                observer.rates_added(agency, added, version)
+
+
+class AsyncByIdUpdateHandler:
+    def __init__(
+        self,
+        repository: AsyncAgencyRepository,
+        observers: Sequence[RateObserver] = (),
+        gap_fill: Mapping[str, GapFill] | None = None,
+    ) -> None:
+        self.repository = repository
+        self.observers = observers
+        self.gap_fill = dict(gap_fill or {})
+
+    async def execute(self, cmd: AsyncUpdateById) -> None:
+        fetched = await cmd.strategy()
+        agency = await self.repository.find_by_id(cmd.id)
+        try:
+            added = agency.update(
+                rate_strategy=lambda: fetched, gap_fill=self.gap_fill.get(agency.name)
+            )
+        except ValueObjectError as exc:
+            raise UpdateError.from_exc(exc)
+        else:
+            await self.repository.save(agency)
+            if not self.observers:
+                return
+            version = await self.repository.find_version(agency.name)
+            for observer in self.observers:
+                observer.rates_added(agency, added, version)
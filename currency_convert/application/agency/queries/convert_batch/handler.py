@@ -0,0 +1,102 @@
+import collections
+import datetime
+import typing
+
+from currency_convert.application.agency.queries.convert_batch.query import (
+    ConvertBatch,
+)
+from currency_convert.domain.agency.entities.agency import (
+    Agency,
+    AgencyNotFoundError,
+    RateNotFoundError,
+)
+from currency_convert.domain.agency.entities.interface import (
+    AgencyRepository,
+    AsyncAgencyRepository,
+)
+from currency_convert.domain.agency.valueobjects.money import Money
+from currency_convert.domain.primitives.valueobject import ValueObjectError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+Key = tuple[str, str, datetime.datetime | None]
+INT64_MAX = 2**63 - 1
+
+
+class ConvertBatchHandler:
+    def __init__(self, repository: AgencyRepository) -> None:
+        self.repository = repository
+
+    def execute(self, query: ConvertBatch) -> tuple[Money | None, ...]:
+        if (agency := self.repository.find_by_name(query.agency_name)) is None:
+            raise AgencyNotFoundError()
+        return _convert(agency, query)
+
+
+class AsyncConvertBatchHandler:
+    def __init__(self, repository: AsyncAgencyRepository) -> None:
+        self.repository = repository
+
+    async def execute(self, query: ConvertBatch) -> tuple[Money | None, ...]:
+        return _convert(await self.repository.find_by_name(query.agency_name), query)
+
+
+def _convert(agency: Agency, query: ConvertBatch) -> tuple[Money | None, ...]:
+    groups: dict[Key, list[int]] = collections.defaultdict(list)
+    for position, c in enumerate(query.conversions):
+        groups[(c.currency_from, c.currency_to, c.dt)].append(position)
+
+    positions: list[int] = []
+    amounts: list[int] = []
+    rates: list[int] = []
+    for (currency_from, currency_to, dt), group in groups.items():
+        try:
+            rate = agency.get_rate(currency_from, currency_to, dt).rate
+        except (RateNotFoundError, ValueObjectError):
+            continue
+        for position in group:
+            try:
+                amount = Money.from_str(query.conversions[position].amount)
+            except ValueObjectError:
+                continue
+            positions.append(position)
+            amounts.append(amount.units)
+            rates.append(rate.units)
+
+    converted: list[Money | None] = [None] * len(query.conversions)
+    for position, units in zip(positions, _multiply(amounts, rates)):
+        # amounts that round to nothing stay null instead of failing the batch
+        if units > 0:
+            converted[position] = Money.from_units(units)
+    return tuple(converted)
+
+
+def _multiply(amounts: list[int], rates: list[int]) -> list[int]:
+    """Products in Money units, rounded like ``Money.multiply``, in one pass.
+
+    Runs on int64 arrays when numpy is installed and no product can
+    overflow, on arrays of Python ints otherwise.
+    """
+    if not amounts:
+        return []
+    if np is None:  # pragma: no cover
+        return [_product(amount, rate) for amount, rate in zip(amounts, rates)]
+    fits = max(amounts) * max(rates) <= INT64_MAX
+    dtype: typing.Any = np.int64 if fits else object
+    products = np.array(amounts, dtype=dtype) * np.array(rates, dtype=dtype)
+    quotient, remainder = products // Money.SCALE, products % Money.SCALE
+    # half to even, like Decimal.quantize
+    up = (2 * remainder > Money.SCALE) | (
+        (2 * remainder == Money.SCALE) & (quotient % 2 == 1)
+    )
+    return [int(units) for units in (quotient + up).tolist()]
+
+
+def _product(amount: int, rate: int) -> int:
+    try:
+        return Money.from_units(amount).multiply(Money.from_units(rate)).units
+    except ValueObjectError:
+        return 0
@@ -1,11 +1,25 @@
 import dataclasses
-from typing import Callable
+import datetime
 
 from currency_convert.application.primitives.query import Query
-from currency_convert.domain.agency.valueobjects.rate import Rate
+from currency_convert.domain.agency.entities.interface import RateFilter
+from currency_convert.domain.agency.valueobjects.rate import naive_utc
 
 
 @dataclasses.dataclass(frozen=True)
 class FetchAll(Query):
     agency_name: str
-    predicate: Callable[[Rate], bool]
+    filter: RateFilter = RateFilter()
+
+
+@dataclasses.dataclass(frozen=True)
+class FetchHistory(Query):
+    agency_name: str
+    currency_from: str | None = None
+    currency_to: str | None = None
+    start: datetime.datetime | None = None
+    end: datetime.datetime | None = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "start", naive_utc(self.start))
+        object.__setattr__(self, "end", naive_utc(self.end))
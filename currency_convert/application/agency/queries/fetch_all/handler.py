@@ -1,6 +1,13 @@
-from currency_convert.application.agency.queries.fetch_all.command import FetchAll
-from currency_convert.domain.agency.entities.agency import AgencyNotFoundError
-from currency_convert.domain.agency.entities.interface import AgencyRepository
+from typing import AsyncIterator, Iterator
+
+from currency_convert.application.agency.queries.fetch_all.command import (
+    FetchAll,
+    FetchHistory,
+)
+from currency_convert.domain.agency.entities.interface import (
+    AgencyRepository,
+    AsyncAgencyRepository,
+)
 from currency_convert.domain.agency.valueobjects.rate import Rate
 
 
@@ -9,6 +16,40 @@ class FetchAllHandler:
         self.repository = repository
 
     def execute(self, query: FetchAll) -> tuple[Rate, ...]:
-        if (agency := self.repository.find_by_name(query.agency_name)) is None:
-            raise AgencyNotFoundError()
-        return agency.get_rates(query.predicate)
+        return self.repository.select_rates(query.agency_name, query.filter)
+
+
+class FetchHistoryHandler:
+    def __init__(self, repository: AgencyRepository) -> None:
+        self.repository = repository
+
+    def execute(self, query: FetchHistory) -> Iterator[Rate]:
+        return self.repository.find_rates(
+            query.agency_name,
+            query.currency_from,
+            query.currency_to,
+            query.start,
+            query.end,
+        )
+
+
+class AsyncFetchAllHandler:
+    def __init__(self, repository: AsyncAgencyRepository) -> None:
+        self.repository = repository
+
+    async def execute(self, query: FetchAll) -> tuple[Rate, ...]:
+        return await self.repository.select_rates(query.agency_name, query.filter)
+
+
+class AsyncFetchHistoryHandler:
+    def __init__(self, repository: AsyncAgencyRepository) -> None:
+        self.repository = repository
+
+    async def execute(self, query: FetchHistory) -> AsyncIterator[Rate]:
+        return await self.repository.find_rates(
+            query.agency_name,
+            query.currency_from,
+            query.currency_to,
+            query.start,
+            query.end,
+        )
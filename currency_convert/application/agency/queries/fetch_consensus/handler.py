@@ -0,0 +1,42 @@
+from currency_convert.application.agency.queries.fetch_consensus.query import (
+    FetchConsensus,
+)
+from currency_convert.domain.agency.entities.interface import (
+    AgencyRepository,
+    AsyncAgencyRepository,
+)
+from currency_convert.domain.agency.services.consensus import Consensus
+from currency_convert.domain.agency.valueobjects.rate import Rate
+
+
+class FetchConsensusHandler:
+    def __init__(self, repository: AgencyRepository, consensus: Consensus) -> None:
+        self.repository = repository
+        self.consensus = consensus
+
+    def execute(self, query: FetchConsensus) -> Rate:
+        # versions first, an agency written meanwhile stays outdated
+        versions = self.repository.find_versions()
+        if outdated := self.consensus.outdated(versions):
+            if not self.consensus.is_loaded:
+                agencies = self.repository.find_all()
+            else:
+                agencies = [self.repository.find_by_name(name) for name in outdated]
+            self.consensus.load(agencies, versions)
+        return self.consensus.get_rate(query.currency_from, query.currency_to, query.dt)
+
+
+class AsyncFetchConsensusHandler:
+    def __init__(self, repository: AsyncAgencyRepository, consensus: Consensus) -> None:
+        self.repository = repository
+        self.consensus = consensus
+
+    async def execute(self, query: FetchConsensus) -> Rate:
+        versions = await self.repository.find_versions()
+        if outdated := self.consensus.outdated(versions):
+            if not self.consensus.is_loaded:
+                agencies = await self.repository.find_all()
+            else:
+                agencies = [await self.repository.find_by_name(n) for n in outdated]
+            self.consensus.load(agencies, versions)
+        return self.consensus.get_rate(query.currency_from, query.currency_to, query.dt)
@@ -1,6 +1,8 @@
 from currency_convert.application.agency.queries.fetch_one.query import FetchOne
-from currency_convert.domain.agency.entities.agency import AgencyNotFoundError
-from currency_convert.domain.agency.entities.interface import AgencyRepository
+from currency_convert.domain.agency.entities.interface import (
+    AgencyRepository,
+    AsyncAgencyRepository,
+)
 from currency_convert.domain.agency.valueobjects.rate import Rate
 
 
@@ -9,6 +11,26 @@ class FetchOneHandler:
         self.repository = repository
 
     def execute(self, query: FetchOne) -> Rate:
-        if (agency := self.repository.find_by_name(query.agency_name)) is None:
-            raise AgencyNotFoundError()
-        return agency.get_rate(query.currency_from, query.currency_to, query.dt)
+        return self.repository.find_rate(
+            query.agency_name,
+            query.currency_from,
+            query.currency_to,
+            query.dt,
+            as_of=query.as_of,
+            max_staleness=query.max_staleness,
+        )
+
+
+class AsyncFetchOneHandler:
+    def __init__(self, repository: AsyncAgencyRepository) -> None:
+        self.repository = repository
+
+    async def execute(self, query: FetchOne) -> Rate:
+        return await self.repository.find_rate(
+            query.agency_name,
+            query.currency_from,
+            query.currency_to,
+            query.dt,
+            as_of=query.as_of,
+            max_staleness=query.max_staleness,
+        )
@@ -2,6 +2,7 @@ import dataclasses
 import datetime
 
 from currency_convert.application.primitives.query import Query
+from currency_convert.domain.agency.valueobjects.rate import naive_utc
 
 
 @dataclasses.dataclass(frozen=True)
@@ -10,3 +11,8 @@ class FetchOne(Query):
     currency_from: str
     currency_to: str
     dt: datetime.datetime | None = None
+    as_of: bool = False
+    max_staleness: datetime.timedelta | None = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "dt", naive_utc(self.dt))
@@ -0,0 +1,39 @@
+from currency_convert.application.agency.queries.fetch_path.query import FetchPath
+from currency_convert.domain.agency.entities.interface import (
+    AgencyRepository,
+    AsyncAgencyRepository,
+)
+from currency_convert.domain.agency.services.graph import CurrencyGraph, Path
+
+
+class FetchPathHandler:
+    def __init__(self, repository: AgencyRepository, graph: CurrencyGraph) -> None:
+        self.repository = repository
+        self.graph = graph
+
+    def execute(self, query: FetchPath) -> Path:
+        # versions first, an agency written meanwhile stays outdated
+        versions = self.repository.find_versions()
+        if outdated := self.graph.outdated(versions):
+            if not self.graph.is_loaded:
+                agencies = self.repository.find_all()
+            else:
+                agencies = [self.repository.find_by_name(name) for name in outdated]
+            self.graph.load(agencies, versions)
+        return self.graph.find_path(query.currency_from, query.currency_to, query.dt)
+
+
+class AsyncFetchPathHandler:
+    def __init__(self, repository: AsyncAgencyRepository, graph: CurrencyGraph) -> None:
+        self.repository = repository
+        self.graph = graph
+
+    async def execute(self, query: FetchPath) -> Path:
+        versions = await self.repository.find_versions()
+        if outdated := self.graph.outdated(versions):
+            if not self.graph.is_loaded:
+                agencies = await self.repository.find_all()
+            else:
+                agencies = [await self.repository.find_by_name(n) for n in outdated]
+            self.graph.load(agencies, versions)
+        return self.graph.find_path(query.currency_from, query.currency_to, query.dt)
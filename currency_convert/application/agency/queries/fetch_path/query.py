@@ -0,0 +1,15 @@
+import dataclasses
+import datetime
+
+from currency_convert.application.primitives.query import Query
+from currency_convert.domain.agency.valueobjects.rate import naive_utc
+
+
+@dataclasses.dataclass(frozen=True)
+class FetchPath(Query):
+    currency_from: str
+    currency_to: str
+    dt: datetime.datetime | None = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "dt", naive_utc(self.dt))
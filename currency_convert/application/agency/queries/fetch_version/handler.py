@@ -0,0 +1,24 @@
+from currency_convert.application.agency.queries.fetch_version.query import (
+    FetchVersion,
+)
+from currency_convert.domain.agency.entities.interface import (
+    AgencyRepository,
+    AgencyVersion,
+    AsyncAgencyRepository,
+)
+
+
+class FetchVersionHandler:
+    def __init__(self, repository: AgencyRepository) -> None:
+        self.repository = repository
+
+    def execute(self, query: FetchVersion) -> AgencyVersion:
+        return self.repository.find_version(query.agency_name)
+
+
+class AsyncFetchVersionHandler:
+    def __init__(self, repository: AsyncAgencyRepository) -> None:
+        self.repository = repository
+
+    async def execute(self, query: FetchVersion) -> AgencyVersion:
+        return await self.repository.find_version(query.agency_name)
@@ -0,0 +1,8 @@
+import dataclasses
+
+from currency_convert.application.primitives.query import Query
+
+
+@dataclasses.dataclass(frozen=True)
+class FetchVersion(Query):
+    agency_name: str
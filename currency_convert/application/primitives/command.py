@@ -12,3 +12,7 @@ class Command:
 
 class CommandHandler(typing.Protocol[Ccontra, Tco]):
     def execute(self, q: Ccontra) -> Tco: ...
+
+
+class AsyncCommandHandler(typing.Protocol[Ccontra, Tco]):
+    async def execute(self, q: Ccontra) -> Tco: ...
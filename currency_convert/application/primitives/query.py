@@ -14,3 +14,7 @@ class Query:
 
 class QueryHandler(typing.Protocol[Qcontra, Tco]):
     def execute(self, query: Qcontra) -> Tco: ...
+
+
+class AsyncQueryHandler(typing.Protocol[Qcontra, Tco]):
+    async def execute(self, query: Qcontra) -> Tco: ...
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import bisect
 import dataclasses
 import datetime
+import heapq
+import itertools
 import typing
 import uuid
 
@@ -10,7 +13,11 @@ from currency_convert.domain.agency.valueobjects.rate import Rate
 from currency_convert.domain.primitives.entity import AggregateRoot, EntityError
 
 if typing.TYPE_CHECKING:
-    from currency_convert.domain.agency.entities.interface import UpdateStrategy
+    from currency_convert.domain.agency.entities.interface import (
+        CrossRateEngine,
+        RateFilter,
+        UpdateStrategy,
+    )
 
 
 class AgencyCreationError(EntityError):
@@ -33,6 +40,10 @@ class DuplicateRateError(EntityError):
     """Error raised when a duplicate rate is added to an agency."""
 
 
+class ReadOnlyAgencyError(EntityError):
+    """Error raised when a read-only agency is modified."""
+
+
 class RateNotFoundError(EntityError):
     """Error raised when a rate is not found for the given criteria."""
 
@@ -45,6 +56,9 @@ class RepositoryError(EntityError):
     """Base class for errors related to AgencyRepository."""
 
 
+GapFill = typing.Literal["forward", "linear"]
+
+
 @dataclasses.dataclass(slots=True, eq=False)
 class Agency(AggregateRoot):
     name: str
@@ -52,6 +66,21 @@ class Agency(AggregateRoot):
     address: str
     country: str
     rates: set[Rate] = dataclasses.field(default_factory=set)
+    _index: dict[int, list[Rate]] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+    _engine: CrossRateEngine | None = dataclasses.field(
+        default=None, init=False, repr=False
+    )
+    _added: list[Rate] = dataclasses.field(default_factory=list, init=False, repr=False)
+    _removed: list[Rate] = dataclasses.field(
+        default_factory=list, init=False, repr=False
+    )
+    _read_only: bool = dataclasses.field(default=False, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for rate in self.rates:
+            self._index_rate(rate)
 
     @classmethod
     def from_attributes(
@@ -88,50 +117,292 @@ class Agency(AggregateRoot):
         currency_to: str,
         rate: str,
         date: str,
-    ) -> None:
+    ) -> Rate | None:
         new_rate = Rate.create(
             currency_from=currency_from,
             currency_to=currency_to,
             rate=rate,
             dt=datetime.datetime.fromisoformat(date),
         )
-        self.rates.add(new_rate)
+        self._load(currency_to, new_rate.dt, new_rate.dt)
+        return self._put(new_rate)
+
+    def use_engine(self, engine: CrossRateEngine) -> None:
+        for rate in self.rates:
+            engine.add(rate)
+        self._engine = engine
+
+    def pending_rates(self) -> tuple[tuple[Rate, ...], tuple[Rate, ...]]:
+        """Rates added and removed since the agency was loaded or saved."""
+        return tuple(self._added), tuple(self._removed)
+
+    def mark_saved(self) -> None:
+        self._added.clear()
+        self._removed.clear()
+
+    def freeze(self) -> typing.Self:
+        """Load every rate and refuse further changes, for sharing the agency."""
+        self.materialize()
+        self._read_only = True
+        return self
+
+    def materialize(self) -> None:
+        """Hold every rate in ``rates``, which an agency always does."""
+
+    def update(
+        self, rate_strategy: UpdateStrategy, gap_fill: GapFill | None = None
+    ) -> list[Rate]:
+        added = (self.add_rate(**rate) for rate in rate_strategy())
+        rates = [rate for rate in added if rate is not None]
+        if gap_fill is not None:
+            rates.extend(self.fill_gaps(gap_fill, rates))
+        return rates
 
-    def update(self, rate_strategy: UpdateStrategy) -> None:
-        for rate in rate_strategy():
-            self.add_rate(**rate)
+    def fill_gaps(
+        self, method: GapFill, rates: typing.Iterable[Rate] | None = None
+    ) -> list[Rate]:
+        """Add derived rates for the calendar days without a published rate.
+
+        Only the gaps next to ``rates`` are filled, or every gap if omitted.
+        Derived rates are replaced once a published rate for their day is
+        added.
+        """
+        if rates is None:
+            self.materialize()
+            rates = tuple(self.rates)
+        else:
+            rates = tuple(rates)
+            for code in {rate.currency_to.code for rate in rates}:
+                self._load(code)
+        gaps = {
+            gap for rate in rates if not rate.derived for gap in self._gaps_around(rate)
+        }
+        added = []
+        for prev, next_ in gaps:
+            steps = (next_.dt - prev.dt).days
+            for step in range(1, steps):
+                value = prev.rate
+                if method == "linear":
+                    value = prev.rate.interpolate(next_.rate, step, steps)
+                derived = dataclasses.replace(
+                    prev,
+                    id=None,
+                    rate=value,
+                    dt=prev.dt + datetime.timedelta(days=step),
+                    derived=True,
+                )
+                if (rate := self._put(derived)) is not None:
+                    added.append(rate)
+        return added
+
+    @property
+    def currencies(self) -> tuple[Currency, ...]:
+        return tuple(series[0].currency_to for series in self._index.values() if series)
 
     def get_rate(
         self,
         currency_from: str,
         currency_to: str,
         dt: datetime.datetime | None = None,
+        *,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
     ) -> Rate:
-        def filter_on_base_currency(r: Rate) -> bool:
-            return r.currency_to == currency_to and (dt is None or dt == r.dt)
+        def find(code: str) -> Rate:
+            ordinal = Currency.ordinal_of(code)
+            return self._find_rate(ordinal, dt, as_of, max_staleness)
+
+        ordinal_from = Currency.ordinal_of(currency_from)
+        ordinal_to = Currency.ordinal_of(currency_to)
+        # as_of and latest lookups need the series up to dt, exact ones a day
+        window = (None, None) if dt is None or as_of else (dt, dt)
+        for code, ordinal in ((currency_from, ordinal_from), (currency_to, ordinal_to)):
+            if not self._is_base_currency(ordinal):
+                self._load(code, *window)
+        if (
+            self._engine is not None
+            and ordinal_from is not None
+            and ordinal_to is not None
+            and not self._is_base_currency(ordinal_from)
+            and not self._is_base_currency(ordinal_to)
+            and (rate := self._engine.lookup(ordinal_from, ordinal_to, dt))
+        ):
+            return rate
 
-        def filter_on_inverted_currency(r: Rate) -> bool:
-            return r.currency_to == currency_from and (dt is None or dt == r.dt)
+        return self.quote(self.base.code, currency_from, currency_to, find)
 
+    @staticmethod
+    def quote(
+        base: str,
+        currency_from: str,
+        currency_to: str,
+        find: typing.Callable[[str], Rate],
+    ) -> Rate:
+        """Combine the rates ``find`` returns against ``base`` into one pair."""
+        if currency_from == base:
+            return find(currency_to)
+        if currency_to == base:
+            return find(currency_from).invert()
+        return find(currency_to).multiply(find(currency_from).invert())
+
+    @staticmethod
+    def pick_rate(
+        latest: Rate | None,
+        dt: datetime.datetime | None,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate:
+        """Check the latest rate at or before ``dt`` against the lookup mode."""
         try:
-            if self._is_base_currency(currency_from):
-                return next(iter(self.get_rates(filter_on_base_currency)))
-            if self._is_base_currency(currency_to):
-                return next(iter(self.get_rates(filter_on_inverted_currency))).invert()
+            if latest is not None and (
+                dt is None
+                or latest.dt == dt
+                or (
+                    as_of and (max_staleness is None or dt - latest.dt <= max_staleness)
+                )
+            ):
+                return latest
+        except TypeError:
+            # naive and aware datetimes never compare equal
+            pass
+        raise RateNotFoundError("No rate with the given criteria found.")
+
+    def iter_rates(
+        self,
+        currency_from: str | None = None,
+        currency_to: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.Iterator[Rate]:
+        if currency_to is None:
+            candidates = list(self._index.values())
+        elif (ordinal := Currency.ordinal_of(currency_to)) in self._index:
+            candidates = [self._index[ordinal]]
+        else:
+            return
+        windows = (self._window(series, start, end) for series in candidates)
+        for rate in heapq.merge(*windows, key=_by_sort_key):
+            if currency_from is None or rate.currency_from == currency_from:
+                yield rate
 
-            return next(iter(self.get_rates(filter_on_base_currency))).multiply(
-                next(iter(self.get_rates(filter_on_inverted_currency))).invert()
+    def select_rates(self, spec: RateFilter) -> tuple[Rate, ...]:
+        start, end = (spec.start, spec.end) if spec.dt is None else (spec.dt, spec.dt)
+        rates: typing.Iterable[Rate] = self.iter_rates(
+            spec.currency_from, spec.currency_to, start, end
+        )
+        if spec.order == "desc":
+            rates = reversed(list(rates))
+        return tuple(itertools.islice(rates, spec.limit))
+
+    @staticmethod
+    def _window(
+        series: list[Rate],
+        start: datetime.datetime | None,
+        end: datetime.datetime | None,
+    ) -> typing.Iterator[Rate]:
+        lo = 0 if start is None else bisect.bisect_left(series, start, key=_by_date)
+        hi = None if end is None else bisect.bisect_right(series, end, key=_by_date)
+        return itertools.islice(series, lo, hi)
+
+    def _index_rate(self, rate: Rate) -> None:
+        series = self._index.setdefault(rate.currency_to.ordinal, [])
+        # ordered by date first, so the date bisects below stay valid
+        bisect.insort(series, rate, key=_by_sort_key)
+
+    def _put(self, rate: Rate) -> Rate | None:
+        if self._read_only:
+            raise ReadOnlyAgencyError(self.name)
+        if (existing := self._find_same(rate)) is not None:
+            # published rates are final, derived ones give way to new values
+            if not existing.derived or (rate.derived and existing == rate):
+                return None
+            self.rates.discard(existing)
+            self._index[rate.currency_to.ordinal].remove(existing)
+            if any(added is existing for added in self._added):
+                self._added = [added for added in self._added if added is not existing]
+            else:
+                self._removed.append(existing)
+        self._add(rate)
+        self._added.append(rate)
+        return rate
+
+    def _add(self, rate: Rate) -> None:
+        self.rates.add(rate)
+        self._index_rate(rate)
+        if self._engine is not None:
+            self._engine.add(rate)
+
+    def _load(
+        self,
+        currency_to: str,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> None:
+        """Make sure the rates to ``currency_to`` in the window are held."""
+
+    def _find_same(self, rate: Rate) -> Rate | None:
+        series = self._index.get(rate.currency_to.ordinal, [])
+        idx = bisect.bisect_left(series, rate.dt, key=_by_date)
+        same_day = itertools.takewhile(
+            lambda r: r.dt == rate.dt, itertools.islice(series, idx, None)
+        )
+        return next(
+            (r for r in same_day if r.currency_from == rate.currency_from), None
+        )
+
+    def _gaps_around(self, rate: Rate) -> typing.Iterator[tuple[Rate, Rate]]:
+        def published(rates: typing.Iterable[Rate]) -> Rate | None:
+            return next(
+                (
+                    r
+                    for r in rates
+                    if not r.derived and r.currency_from == rate.currency_from
+                ),
+                None,
             )
-        except StopIteration:
-            msg = "No rate with the given criteria found."
-            raise RateNotFoundError(msg)
 
-    def _is_base_currency(self, currency: str) -> bool:
-        return currency == self.base
+        series = self._index.get(rate.currency_to.ordinal, [])
+        lo = bisect.bisect_left(series, rate.dt, key=_by_date)
+        hi = bisect.bisect_right(series, rate.dt, key=_by_date)
+        if (prev := published(series[i] for i in range(lo - 1, -1, -1))) is not None:
+            yield prev, rate
+        if (next_ := published(itertools.islice(series, hi, None))) is not None:
+            yield rate, next_
+
+    def _find_rate(
+        self,
+        currency_to: int | None,
+        dt: datetime.datetime | None,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate:
+        series = [] if currency_to is None else self._index.get(currency_to, [])
+        try:
+            idx = (
+                len(series)
+                if dt is None
+                else bisect.bisect_right(series, dt, key=_by_date)
+            )
+        except TypeError:
+            idx = 0
+        latest = series[idx - 1] if idx else None
+        return self.pick_rate(latest, dt, as_of, max_staleness)
+
+    def _is_base_currency(self, ordinal: int | None) -> bool:
+        return ordinal == self.base.ordinal
 
     def get_rates(
         self,
         predicate: typing.Callable[[Rate], bool] = lambda _: True,
     ) -> tuple[Rate, ...]:
-        sorted_rates = sorted(self.rates, key=lambda r: r.dt, reverse=True)
+        self.materialize()
+        sorted_rates = sorted(self.rates, key=_by_sort_key, reverse=True)
         return tuple(filter(predicate, sorted_rates))
+
+
+def _by_date(rate: Rate) -> datetime.datetime:
+    return rate.dt
+
+
+def _by_sort_key(rate: Rate) -> tuple[datetime.datetime, str, str]:
+    return rate.sort_key
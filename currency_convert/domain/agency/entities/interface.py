@@ -1,8 +1,12 @@
+import dataclasses
+import datetime
 import typing
 
 from typing_extensions import TypedDict
 
 from currency_convert.domain.agency.entities.agency import Agency
+from currency_convert.domain.agency.valueobjects.currency import Currency
+from currency_convert.domain.agency.valueobjects.rate import Rate, naive_utc
 
 
 class UnprocessedRate(TypedDict):
@@ -16,10 +20,76 @@ class UnprocessableRate(UnprocessedRate):
     pass
 
 
+@dataclasses.dataclass(frozen=True, slots=True, kw_only=True)
+class RateFilter:
+    currency_from: str | None = None
+    currency_to: str | None = None
+    dt: datetime.datetime | None = None
+    start: datetime.datetime | None = None
+    end: datetime.datetime | None = None
+    limit: int | None = None
+    order: typing.Literal["asc", "desc"] = "desc"
+
+    def __post_init__(self) -> None:
+        for name in ("dt", "start", "end"):
+            object.__setattr__(self, name, naive_utc(getattr(self, name)))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class AgencyVersion:
+    """Counts the saves that changed the rates of an agency, and when."""
+
+    version: int
+    modified: datetime.datetime
+
+    def succeeds(self, other: "AgencyVersion | None") -> bool:
+        """Whether this is the version one save after ``other``."""
+        return other is not None and self.version == other.version + 1
+
+
 class UpdateStrategy(typing.Protocol):
     def __call__(self) -> list[UnprocessedRate]: ...
 
 
+class AsyncUpdateStrategy(typing.Protocol):
+    async def __call__(self) -> list[UnprocessedRate]: ...
+
+
+class CrossRateEngine(typing.Protocol):
+    def add(self, rate: Rate) -> None: ...
+
+    def lookup(
+        self,
+        currency_from: int,
+        currency_to: int,
+        dt: datetime.datetime | None,
+    ) -> Rate | None: ...
+
+
+class CrossRateEngineFactory(typing.Protocol):
+    def __call__(self, base: Currency) -> CrossRateEngine: ...
+
+
+class RateSource(typing.Protocol):
+    def currencies(self) -> list[str]: ...
+
+    def rates(
+        self,
+        currency_to: str,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.Iterable[Rate]: ...
+
+
+class RateObserver(typing.Protocol):
+    def rates_added(
+        self,
+        agency: Agency,
+        rates: typing.Sequence[Rate],
+        version: AgencyVersion | None = None,
+    ) -> None: ...
+
+
 class AgencyRepository(typing.Protocol):
     def find_by_id(self, agency_id: str) -> Agency: ...
 
@@ -27,4 +97,68 @@ class AgencyRepository(typing.Protocol):
 
     def find_all(self) -> list[Agency]: ...
 
+    def find_rates(
+        self,
+        agency_name: str,
+        currency_from: str | None = None,
+        currency_to: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.Iterator[Rate]: ...
+
+    def find_rate(
+        self,
+        agency_name: str,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+        *,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate: ...
+
+    def select_rates(self, agency_name: str, spec: RateFilter) -> tuple[Rate, ...]: ...
+
+    def find_version(self, agency_name: str) -> AgencyVersion: ...
+
+    def find_versions(self) -> dict[str, AgencyVersion]: ...
+
     def save(self, agency: Agency) -> None: ...
+
+
+class AsyncAgencyRepository(typing.Protocol):
+    async def find_by_id(self, agency_id: str) -> Agency: ...
+
+    async def find_by_name(self, name: str) -> Agency: ...
+
+    async def find_all(self) -> list[Agency]: ...
+
+    async def find_rates(
+        self,
+        agency_name: str,
+        currency_from: str | None = None,
+        currency_to: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.AsyncIterator[Rate]: ...
+
+    async def find_rate(
+        self,
+        agency_name: str,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+        *,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate: ...
+
+    async def select_rates(
+        self, agency_name: str, spec: RateFilter
+    ) -> tuple[Rate, ...]: ...
+
+    async def find_version(self, agency_name: str) -> AgencyVersion: ...
+
+    async def find_versions(self) -> dict[str, AgencyVersion]: ...
+
+    async def save(self, agency: Agency) -> None: ...
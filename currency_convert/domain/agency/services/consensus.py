@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import datetime
+import fractions
+import statistics
+import threading
+import typing
+
+from currency_convert.domain.agency.entities.agency import Agency, RateNotFoundError
+from currency_convert.domain.agency.entities.interface import AgencyVersion
+from currency_convert.domain.agency.valueobjects.currency import Currency
+from currency_convert.domain.agency.valueobjects.money import Money
+from currency_convert.domain.agency.valueobjects.rate import Rate
+
+Pair = tuple[int, int]
+Method = typing.Literal["median", "trimmed_mean"]
+
+
+class Consensus:
+    """Read model of the consensus rate per pair and date over all agencies.
+
+    Every quote also votes for the inverted pair, so an agency quoting
+    EUR->USD and another quoting USD->EUR agree on both directions.
+    ``rates_added`` only recomputes the pairs and dates it receives.
+
+    ``versions`` holds the version each agency is current at. Saves seen
+    by ``rates_added`` move it on by one; query handlers reload only the
+    agencies whose version in the repository differs (``outdated``), which
+    are the ones written by ``bulk_insert`` or other workers. The model is
+    never older than the versions read for the request.
+    """
+
+    def __init__(self, method: Method = "median", trim: float = 0.2) -> None:
+        self.method = method
+        self.trim = trim
+        self.is_loaded = False
+        self.versions: dict[str, AgencyVersion] = {}
+        self._currencies: dict[int, Currency] = {}
+        self._quotes: dict[tuple[Pair, datetime.datetime], dict[str, int]] = {}
+        self._consensus: dict[tuple[Pair, datetime.datetime], int] = {}
+        self._latest: dict[Pair, datetime.datetime] = {}
+        self._lock = threading.Lock()
+
+    def load(
+        self,
+        agencies: typing.Iterable[Agency],
+        versions: typing.Mapping[str, AgencyVersion] | None = None,
+    ) -> None:
+        # rates are never removed, applying all of them again is a refresh
+        with self._lock:
+            for agency in agencies:
+                self._apply(agency.name, agency.iter_rates())
+            self.versions.update(versions or {})
+            self.is_loaded = True
+
+    def outdated(self, versions: typing.Mapping[str, AgencyVersion]) -> list[str]:
+        with self._lock:
+            return [n for n, v in versions.items() if self.versions.get(n) != v]
+
+    def rates_added(
+        self,
+        agency: Agency,
+        rates: typing.Sequence[Rate],
+        version: AgencyVersion | None = None,
+    ) -> None:
+        with self._lock:
+            if not self.is_loaded:
+                return
+            self._apply(agency.name, rates)
+            # any other version means writes this process did not see
+            if rates and version is not None:
+                if version.succeeds(self.versions.get(agency.name)):
+                    self.versions[agency.name] = version
+
+    def get_rate(
+        self,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+    ) -> Rate:
+        source = Currency.ordinal_of(currency_from)
+        target = Currency.ordinal_of(currency_to)
+        if source is None or target is None:
+            raise RateNotFoundError("No consensus with the given criteria found.")
+        pair = (source, target)
+        if dt is None:
+            dt = self._latest.get(pair)
+        if dt is None or (units := self._consensus.get((pair, dt))) is None:
+            raise RateNotFoundError("No consensus with the given criteria found.")
+        return Rate(
+            currency_from=self._currencies[source],
+            currency_to=self._currencies[target],
+            rate=Money.from_units(units),
+            dt=dt,
+        )
+
+    def _apply(self, agency: str, rates: typing.Iterable[Rate]) -> None:
+        touched = set()
+        for rate in rates:
+            for quote in (rate, rate.invert()):
+                source, target = quote.currency_from, quote.currency_to
+                self._currencies[source.ordinal] = source
+                pair = (source.ordinal, target.ordinal)
+                self._quotes.setdefault((pair, quote.dt), {})[agency] = quote.rate.units
+                if (latest := self._latest.get(pair)) is None or latest < quote.dt:
+                    self._latest[pair] = quote.dt
+                touched.add((pair, quote.dt))
+        for key in touched:
+            self._consensus[key] = self._aggregate(self._quotes[key].values())
+
+    def _aggregate(self, quotes: typing.Iterable[int]) -> int:
+        values = sorted(map(fractions.Fraction, quotes))
+        if self.method == "median":
+            return round(statistics.median(values))
+        cut = int(len(values) * self.trim)
+        return round(statistics.mean(values[cut : len(values) - cut] or values))
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import functools
+import heapq
+import itertools
+import math
+import threading
+import typing
+
+from currency_convert.domain.agency.entities.agency import Agency, RateNotFoundError
+from currency_convert.domain.agency.entities.interface import AgencyVersion
+from currency_convert.domain.agency.valueobjects.currency import Currency
+from currency_convert.domain.agency.valueobjects.rate import Rate
+
+PathKey = tuple[int, int, datetime.datetime | None]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Hop:
+    agency: str
+    rate: Rate
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Path:
+    hops: tuple[Hop, ...]
+
+    @property
+    def rate(self) -> Rate:
+        return functools.reduce(
+            lambda rate, hop: hop.rate.multiply(rate),
+            self.hops[1:],
+            self.hops[0].rate,
+        )
+
+
+class CurrencyGraph:
+    """Conversion paths across the rates of several agencies.
+
+    Every agency contributes an edge between its base currency and each
+    currency it quotes. A path is the cheapest chain of edges that have a
+    rate at the requested date, where a hop through an agency costs
+    ``hop_costs[name]`` (1.0 by default), so lower costs mark more trusted
+    agencies. Paths are memoised per pair and date; ``rates_added``
+    only adds the edges of new rates and forgets the paths of their dates.
+
+    Like ``Consensus``, the graph keeps the ``versions`` it is current at
+    and query handlers reload ``outdated`` agencies before every search, so
+    writes observers never see are picked up by the next request. A reload
+    forgets the paths through the agency and those of dates it gained
+    rates at.
+    """
+
+    MAX_PATHS: typing.ClassVar[int] = 4096
+
+    def __init__(self, hop_costs: typing.Mapping[str, float] | None = None) -> None:
+        self.hop_costs = dict(hop_costs or {})
+        self.is_loaded = False
+        self.versions: dict[str, AgencyVersion] = {}
+        self._agencies: dict[str, Agency] = {}
+        self._currencies: dict[int, Currency] = {}
+        self._edges: dict[int, dict[int, set[str]]] = {}
+        self._paths: dict[PathKey, tuple[Hop, ...]] = {}
+        self._lock = threading.RLock()
+
+    def load(
+        self,
+        agencies: typing.Iterable[Agency],
+        versions: typing.Mapping[str, AgencyVersion] | None = None,
+    ) -> None:
+        with self._lock:
+            for agency in agencies:
+                if (loaded := self._agencies.get(agency.name)) is not None:
+                    self._forget(loaded, agency)
+                self._put(agency, agency.currencies)
+            self.versions.update(versions or {})
+            self.is_loaded = True
+
+    def outdated(self, versions: typing.Mapping[str, AgencyVersion]) -> list[str]:
+        with self._lock:
+            return [n for n, v in versions.items() if self.versions.get(n) != v]
+
+    def rates_added(
+        self,
+        agency: Agency,
+        rates: typing.Sequence[Rate],
+        version: AgencyVersion | None = None,
+    ) -> None:
+        with self._lock:
+            if not self.is_loaded:
+                return
+            if agency.name in self._agencies:
+                self._put(agency, (rate.currency_to for rate in rates))
+            else:
+                self._put(agency, agency.currencies)
+            dates = {rate.dt for rate in rates}
+            self._paths = {
+                key: hops
+                for key, hops in self._paths.items()
+                if key[2] is not None and key[2] not in dates
+            }
+            if rates and version is not None:
+                if version.succeeds(self.versions.get(agency.name)):
+                    self.versions[agency.name] = version
+
+    def find_path(
+        self,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+    ) -> Path:
+        source = Currency.ordinal_of(currency_from)
+        target = Currency.ordinal_of(currency_to)
+        if source is None or target is None or source == target:
+            raise RateNotFoundError("No conversion path with the given criteria found.")
+        key = (source, target, dt)
+        with self._lock:
+            if (hops := self._paths.get(key)) is None:
+                hops = self._search(source, target, dt)
+                if len(self._paths) >= self.MAX_PATHS:
+                    del self._paths[next(iter(self._paths))]
+                self._paths[key] = hops
+        return Path(hops)
+
+    def _forget(self, loaded: Agency, agency: Agency) -> None:
+        # rates already known only matter to the paths through the agency
+        known = {(r.currency_from, r.currency_to, r.dt) for r in loaded.iter_rates()}
+        dates = {
+            rate.dt
+            for rate in agency.iter_rates()
+            if (rate.currency_from, rate.currency_to, rate.dt) not in known
+        }
+        self._paths = {
+            key: hops
+            for key, hops in self._paths.items()
+            if key[2] is not None
+            and key[2] not in dates
+            and all(hop.agency != agency.name for hop in hops)
+        }
+
+    def _put(self, agency: Agency, currencies: typing.Iterable[Currency]) -> None:
+        self._agencies[agency.name] = agency
+        self._currencies[agency.base.ordinal] = agency.base
+        for currency in currencies:
+            self._currencies[currency.ordinal] = currency
+            self._connect(agency.name, agency.base.ordinal, currency.ordinal)
+            self._connect(agency.name, currency.ordinal, agency.base.ordinal)
+
+    def _connect(self, agency: str, source: int, target: int) -> None:
+        self._edges.setdefault(source, {}).setdefault(target, set()).add(agency)
+
+    def _search(
+        self, source: int, target: int, dt: datetime.datetime | None
+    ) -> tuple[Hop, ...]:
+        costs = {source: 0.0}
+        tiebreak = itertools.count()
+        queue: list[tuple[float, int, int, tuple[Hop, ...]]] = [
+            (0.0, next(tiebreak), source, ())
+        ]
+        while queue:
+            cost, _, node, hops = heapq.heappop(queue)
+            if node == target:
+                return hops
+            if cost > costs[node]:
+                continue
+            for neighbour, agencies in self._edges.get(node, {}).items():
+                for name in agencies:
+                    next_cost = cost + self.hop_costs.get(name, 1.0)
+                    if next_cost >= costs.get(neighbour, math.inf):
+                        continue
+                    try:
+                        rate = self._agencies[name].get_rate(
+                            self._currencies[node].code,
+                            self._currencies[neighbour].code,
+                            dt,
+                        )
+                    except RateNotFoundError:
+                        continue
+                    costs[neighbour] = next_cost
+                    hop = Hop(name, rate)
+                    heapq.heappush(
+                        queue, (next_cost, next(tiebreak), neighbour, (*hops, hop))
+                    )
+        raise RateNotFoundError("No conversion path with the given criteria found.")
@@ -1,12 +1,34 @@
 from __future__ import annotations
 
 import dataclasses
+import threading
 import typing
 
 from currency_convert.domain.primitives.valueobject import ValueObject, ValueObjectError
 
 T = typing.TypeVar("T")
 
+ISO_4217: typing.Final[tuple[str, ...]] = (
+    "AED", "AFN", "ALL", "AMD", "ANG", "AOA", "ARS", "AUD", "AWG", "AZN",
+    "BAM", "BBD", "BDT", "BGN", "BHD", "BIF", "BMD", "BND", "BOB", "BOV",
+    "BRL", "BSD", "BTN", "BWP", "BYN", "BZD", "CAD", "CDF", "CHE", "CHF",
+    "CHW", "CLF", "CLP", "CNY", "COP", "COU", "CRC", "CUP", "CVE", "CZK",
+    "DJF", "DKK", "DOP", "DZD", "EGP", "ERN", "ETB", "EUR", "FJD", "FKP",
+    "GBP", "GEL", "GHS", "GIP", "GMD", "GNF", "GTQ", "GYD", "HKD", "HNL",
+    "HTG", "HUF", "IDR", "ILS", "INR", "IQD", "IRR", "ISK", "JMD", "JOD",
+    "JPY", "KES", "KGS", "KHR", "KMF", "KPW", "KRW", "KWD", "KYD", "KZT",
+    "LAK", "LBP", "LKR", "LRD", "LSL", "LYD", "MAD", "MDL", "MGA", "MKD",
+    "MMK", "MNT", "MOP", "MRU", "MUR", "MVR", "MWK", "MXN", "MXV", "MYR",
+    "MZN", "NAD", "NGN", "NIO", "NOK", "NPR", "NZD", "OMR", "PAB", "PEN",
+    "PGK", "PHP", "PKR", "PLN", "PYG", "QAR", "RON", "RSD", "RUB", "RWF",
+    "SAR", "SBD", "SCR", "SDG", "SEK", "SGD", "SHP", "SLE", "SLL", "SOS",
+    "SRD", "SSP", "STN", "SVC", "SYP", "SZL", "THB", "TJS", "TMT", "TND",
+    "TOP", "TRY", "TTD", "TWD", "TZS", "UAH", "UGX", "USD", "USN", "UYI",
+    "UYU", "UYW", "UZS", "VED", "VES", "VND", "VUV", "WST", "XAF", "XAG",
+    "XAU", "XBA", "XBB", "XBC", "XBD", "XCD", "XDR", "XOF", "XPD", "XPF",
+    "XPT", "XSU", "XTS", "XUA", "XXX", "YER", "ZAR", "ZMW", "ZWL",
+)  # fmt: skip
+
 
 class InvalidCurrencyError(ValueObjectError):
     """Error raised when an invalid currency is provided."""
@@ -18,21 +40,47 @@ class Currency(ValueObject[str]):
     ERROR_MSG: typing.ClassVar[str] = (
         f"Currency code must be {VALID_LENGTH} characters long. Got: {{value}}"
     )
+    _registry: typing.ClassVar[dict[str, Currency]] = {}
+    _ordinals: typing.ClassVar[dict[str, int]] = {
+        code: ordinal for ordinal, code in enumerate(ISO_4217)
+    }
+    _lock: typing.ClassVar[threading.Lock] = threading.Lock()
 
     code: str
+    ordinal: int = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "ordinal", self._register(self.code))
 
     def __eq__(self, other: T) -> bool:
-        return isinstance(other, (str, Currency)) and self.code == other
+        if isinstance(other, Currency):
+            return self is other or self.ordinal == other.ordinal
+        return isinstance(other, str) and self.code == other
+
+    __hash__ = ValueObject.__hash__
 
     @classmethod
-    def from_str(cls, value: str) -> typing.Self:
+    def from_str(cls, value: str) -> Currency:
+        if (currency := cls._registry.get(value)) is not None:
+            return currency
         if cls.has_valid_length(value) and value.isalpha():
-            return cls(code=value)
+            return cls._registry.setdefault(value, cls(code=value))
         raise InvalidCurrencyError(cls.ERROR_MSG.format(value=value))
 
+    @classmethod
+    def ordinal_of(cls, code: str) -> int | None:
+        return cls._ordinals.get(code)
+
     @classmethod
     def has_valid_length(cls, code: typing.Sized) -> bool:
         return len(code) == cls.VALID_LENGTH
 
+    @classmethod
+    def _register(cls, code: str) -> int:
+        if (ordinal := cls._ordinals.get(code)) is None:
+            with cls._lock:
+                ordinal = cls._ordinals.setdefault(code, len(cls._ordinals))
+        return ordinal
+
     def get_values(self) -> typing.Iterator[str]:
         yield self.code
@@ -22,13 +22,26 @@ class NegativeError(MoneyError):
 
 @dataclasses.dataclass(frozen=True, slots=True, eq=False, kw_only=True)
 class Money(ValueObject[decimal.Decimal]):
-    PRECISION: typing.ClassVar[decimal.Decimal] = decimal.Decimal(10) ** -8
+    DIGITS: typing.ClassVar[int] = 8
+    SCALE: typing.ClassVar[int] = 10**DIGITS
+    PRECISION: typing.ClassVar[decimal.Decimal] = decimal.Decimal(10) ** -DIGITS
     ERROR_MSG: typing.ClassVar[str] = "Money value must be positive. Got: {{value}}"
-    amount: decimal.Decimal
+    units: int
+
+    @property
+    def amount(self) -> decimal.Decimal:
+        return decimal.Decimal(self.units).scaleb(-self.DIGITS)
 
     def get_values(self) -> Iterator[decimal.Decimal]:
         yield self.amount
 
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Money):
+            return self.units == other.units
+        return ValueObject.__eq__(self, other)
+
+    __hash__ = ValueObject.__hash__
+
     @classmethod
     def from_str(cls, value: str) -> typing.Self:
         try:
@@ -37,15 +50,33 @@ class Money(ValueObject[decimal.Decimal]):
             raise FormatError.from_exc(exc)
         else:
             if cls.is_positive(v):
-                return cls(amount=v)
+                return cls(units=int(v.scaleb(cls.DIGITS)))
             raise NegativeError(cls.ERROR_MSG.format(value=value))
 
+    @classmethod
+    def from_units(cls, units: int) -> typing.Self:
+        if units > 0:
+            return cls(units=units)
+        raise NegativeError(cls.ERROR_MSG.format(value=units))
+
     @classmethod
     def is_positive(cls, value: decimal.Decimal) -> bool:
         return value > decimal.Decimal(0)
 
-    def invert(self) -> str:
-        return str(1 / self.amount)
+    def invert(self) -> Money:
+        return self.from_units(_divide(self.SCALE * self.SCALE, self.units))
+
+    def multiply(self, other: Money) -> Money:
+        return self.from_units(_divide(self.units * other.units, self.SCALE))
+
+    def interpolate(self, other: Money, step: int, steps: int) -> Money:
+        delta = _divide((other.units - self.units) * step, steps)
+        return self.from_units(self.units + delta)
+
 
-    def multiply(self, other: Money) -> str:
-        return str(self.amount * other.amount)
+def _divide(numerator: int, denominator: int) -> int:
+    """Integer division rounded half to even, like ``Decimal.quantize``."""
+    quotient, remainder = divmod(numerator, denominator)
+    if 2 * remainder > denominator or (2 * remainder == denominator and quotient % 2):
+        quotient += 1
+    return quotient
@@ -23,6 +23,12 @@ class Rate(ValueObject[Currency | Money | datetime.datetime]):
     currency_to: Currency
     rate: Money
     dt: datetime.datetime
+    derived: bool = False
+
+    @property
+    def sort_key(self) -> tuple[datetime.datetime, str, str]:
+        """Order of rate listings: date, then currency_to and currency_from."""
+        return self.dt, self.currency_to.code, self.currency_from.code
 
     def get_values(self) -> typing.Iterator[Currency | Money | datetime.datetime]:
         yield self.currency_from
@@ -38,6 +44,7 @@ class Rate(ValueObject[Currency | Money | datetime.datetime]):
         currency_to: str,
         rate: str,
         dt: datetime.datetime,
+        derived: bool = False,
     ) -> typing.Self:
         return cls(
             id=id,
@@ -45,6 +52,7 @@ class Rate(ValueObject[Currency | Money | datetime.datetime]):
             currency_to=Currency.from_str(currency_to),
             rate=Money.from_str(rate),
             dt=dt,
+            derived=derived,
         )
 
     @classmethod
@@ -54,6 +62,7 @@ class Rate(ValueObject[Currency | Money | datetime.datetime]):
         currency_to: str,
         rate: str,
         dt: datetime.datetime,
+        derived: bool = False,
     ) -> typing.Self:
         if not isinstance(dt, datetime.datetime):
             raise InvalidDateError()
@@ -62,20 +71,38 @@ class Rate(ValueObject[Currency | Money | datetime.datetime]):
             currency_to=Currency.from_str(currency_to),
             rate=Money.from_str(rate),
             dt=dt,
+            derived=derived,
         )
 
     def multiply(self, other: Rate) -> Rate:
-        return self.create(
-            other.currency_from.code,
-            self.currency_to.code,
-            self.rate.multiply(other.rate),
-            self.dt,
+        return type(self)(
+            currency_from=other.currency_from,
+            currency_to=self.currency_to,
+            rate=self.rate.multiply(other.rate),
+            dt=self.dt,
+            derived=self.derived or other.derived,
         )
 
     def invert(self) -> Rate:
-        return self.create(
-            self.currency_to.code,
-            self.currency_from.code,
-            self.rate.invert(),
-            self.dt,
+        return type(self)(
+            currency_from=self.currency_to,
+            currency_to=self.currency_from,
+            rate=self.rate.invert(),
+            dt=self.dt,
+            derived=self.derived,
         )
+
+
+@typing.overload
+def naive_utc(dt: datetime.datetime) -> datetime.datetime: ...
+
+
+@typing.overload
+def naive_utc(dt: None) -> None: ...
+
+
+def naive_utc(dt: datetime.datetime | None) -> datetime.datetime | None:
+    """Rates are dated in naive UTC, aware lookup dates are converted to it."""
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(datetime.UTC).replace(tzinfo=None)
@@ -16,6 +16,9 @@ class ValueObjectError(ConverterError):
 @dataclasses.dataclass(frozen=True, slots=True)
 class ValueObject(abc.ABC, typing.Generic[T]):
     id: int | None = dataclasses.field(default=None, repr=False)
+    _hash: int | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @abc.abstractmethod
     def get_values(self) -> typing.Iterator[T]:
@@ -34,4 +37,7 @@ class ValueObject(abc.ABC, typing.Generic[T]):
         return all(self == other for self, other in zip(*_zipped))
 
     def __hash__(self) -> int:
-        return hash(self.get_values()) * 41
+        if (value := self._hash) is None:
+            value = hash(tuple(self.get_values())) * 41
+            object.__setattr__(self, "_hash", value)
+        return value
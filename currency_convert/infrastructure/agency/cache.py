@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import datetime
+import threading
+import time
+import typing
+
+from currency_convert.domain.agency.entities.agency import Agency
+from currency_convert.domain.agency.entities.interface import (
+    AgencyRepository,
+    AgencyVersion,
+    AsyncAgencyRepository,
+    RateFilter,
+)
+from currency_convert.domain.agency.valueobjects.rate import Rate
+
+
+@dataclasses.dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    outdated: int = 0
+    bypassed: int = 0
+
+
+class AgencyCache:
+    """Process wide LRU of read-only agencies that expire after ``ttl`` seconds.
+
+    Agencies are stored frozen along with the ``AgencyVersion`` they were
+    loaded at. Saves of an agency in this process drop it at once. A
+    lookup that passes the current version also drops an entry of another
+    version, which is how saves in other processes and ``bulk_insert`` are
+    seen before the entry expired.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 16,
+        ttl: float = 300.0,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: collections.OrderedDict[
+            str, tuple[float, AgencyVersion, Agency]
+        ] = collections.OrderedDict()
+        self._names: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, name: str, version: AgencyVersion | None = None, *, fill: bool = True
+    ) -> Agency | None:
+        with self._lock:
+            if (entry := self._entries.get(name)) is None:
+                self._miss(fill)
+                return None
+            expires, loaded, agency = entry
+            if expires <= self._clock():
+                self._drop(name)
+                self.stats.expirations += 1
+                self._miss(fill)
+                return None
+            if version is not None and loaded != version:
+                self._drop(name)
+                self.stats.outdated += 1
+                self._miss(fill)
+                return None
+            self._entries.move_to_end(name)
+            self.stats.hits += 1
+            return agency
+
+    def name_of(self, id: str) -> str | None:
+        with self._lock:
+            return self._names.get(id)
+
+    def put(self, agency: Agency, version: AgencyVersion) -> Agency:
+        agency.freeze()
+        with self._lock:
+            self._drop(agency.name)
+            self._entries[agency.name] = (self._clock() + self.ttl, version, agency)
+            self._names[agency.id.hex] = agency.name
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+                self.stats.evictions += 1
+        return agency
+
+    def invalidate(self, agency: Agency) -> None:
+        with self._lock:
+            if self._drop(agency.name):
+                self.stats.invalidations += 1
+
+    def _miss(self, fill: bool) -> None:
+        if fill:
+            self.stats.misses += 1
+        else:
+            self.stats.bypassed += 1
+
+    def _drop(self, name: str) -> bool:
+        if (entry := self._entries.pop(name, None)) is None:
+            return False
+        self._names.pop(entry[2].id.hex, None)
+        return True
+
+
+class CachedAgencyRepo:
+    """AgencyRepository that reads agencies through an ``AgencyCache``.
+
+    Found agencies are read-only. Command handlers pass ``read_only=False``
+    to get fresh agencies they can change; saving one drops it from the
+    cache either way. Rate lookups of agencies that are not cached go to
+    the repository's single row queries, unless ``load_on_miss`` loads the
+    agency first so a cross rate engine attached to it answers them.
+
+    Every read first asks the repository for the agency's version and only
+    uses a cached agency of that version, so responses validated by that
+    version never carry older rates. The version is read before the agency
+    is loaded, a write in between makes the entry look outdated rather
+    than current.
+    """
+
+    def __init__(
+        self,
+        repository: AgencyRepository,
+        cache: AgencyCache,
+        read_only: bool = True,
+        load_on_miss: bool = False,
+    ) -> None:
+        self.repository = repository
+        self.cache = cache
+        self.read_only = read_only
+        self.load_on_miss = load_on_miss
+
+    def find_by_id(self, agency_id: str) -> Agency:
+        if self.read_only and (name := self.cache.name_of(agency_id)) is not None:
+            return self.find_by_name(name)
+        return self.repository.find_by_id(agency_id)
+
+    def find_by_name(self, name: str) -> Agency:
+        if not self.read_only:
+            return self.repository.find_by_name(name)
+        version = self.repository.find_version(name)
+        if (agency := self.cache.get(name, version)) is None:
+            agency = self.cache.put(self.repository.find_by_name(name), version)
+        return agency
+
+    def find_all(self) -> list[Agency]:
+        return self.repository.find_all()
+
+    def find_rates(
+        self,
+        agency_name: str,
+        currency_from: str | None = None,
+        currency_to: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.Iterator[Rate]:
+        return self.repository.find_rates(
+            agency_name, currency_from, currency_to, start, end
+        )
+
+    def find_rate(
+        self,
+        agency_name: str,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+        *,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate:
+        # a cached agency answers in memory, a miss stays a targeted query
+        version = self.repository.find_version(agency_name)
+        agency = self.cache.get(agency_name, version, fill=self.load_on_miss)
+        if agency is None and self.load_on_miss:
+            agency = self.cache.put(self.repository.find_by_name(agency_name), version)
+        if agency is not None:
+            return agency.get_rate(
+                currency_from,
+                currency_to,
+                dt,
+                as_of=as_of,
+                max_staleness=max_staleness,
+            )
+        return self.repository.find_rate(
+            agency_name,
+            currency_from,
+            currency_to,
+            dt,
+            as_of=as_of,
+            max_staleness=max_staleness,
+        )
+
+    def select_rates(self, agency_name: str, spec: RateFilter) -> tuple[Rate, ...]:
+        version = self.repository.find_version(agency_name)
+        if (agency := self.cache.get(agency_name, version, fill=False)) is not None:
+            return agency.select_rates(spec)
+        return self.repository.select_rates(agency_name, spec)
+
+    def find_version(self, agency_name: str) -> AgencyVersion:
+        return self.repository.find_version(agency_name)
+
+    def find_versions(self) -> dict[str, AgencyVersion]:
+        return self.repository.find_versions()
+
+    def save(self, agency: Agency) -> None:
+        try:
+            self.repository.save(agency)
+        finally:
+            self.cache.invalidate(agency)
+
+
+class AsyncCachedAgencyRepo:
+    """CachedAgencyRepo for an AsyncAgencyRepository."""
+
+    def __init__(
+        self,
+        repository: AsyncAgencyRepository,
+        cache: AgencyCache,
+        read_only: bool = True,
+        load_on_miss: bool = False,
+    ) -> None:
+        self.repository = repository
+        self.cache = cache
+        self.read_only = read_only
+        self.load_on_miss = load_on_miss
+
+    async def find_by_id(self, agency_id: str) -> Agency:
+        if self.read_only and (name := self.cache.name_of(agency_id)) is not None:
+            return await self.find_by_name(name)
+        return await self.repository.find_by_id(agency_id)
+
+    async def find_by_name(self, name: str) -> Agency:
+        if not self.read_only:
+            return await self.repository.find_by_name(name)
+        version = await self.repository.find_version(name)
+        if (agency := self.cache.get(name, version)) is None:
+            agency = await self.repository.find_by_name(name)
+            agency = self.cache.put(agency, version)
+        return agency
+
+    async def find_all(self) -> list[Agency]:
+        return await self.repository.find_all()
+
+    async def find_rates(
+        self,
+        agency_name: str,
+        currency_from: str | None = None,
+        currency_to: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.AsyncIterator[Rate]:
+        return await self.repository.find_rates(
+            agency_name, currency_from, currency_to, start, end
+        )
+
+    async def find_rate(
+        self,
+        agency_name: str,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+        *,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate:
+        version = await self.repository.find_version(agency_name)
+        agency = self.cache.get(agency_name, version, fill=self.load_on_miss)
+        if agency is None and self.load_on_miss:
+            agency = await self.repository.find_by_name(agency_name)
+            agency = self.cache.put(agency, version)
+        if agency is not None:
+            return agency.get_rate(
+                currency_from,
+                currency_to,
+                dt,
+                as_of=as_of,
+                max_staleness=max_staleness,
+            )
+        return await self.repository.find_rate(
+            agency_name,
+            currency_from,
+            currency_to,
+            dt,
+            as_of=as_of,
+            max_staleness=max_staleness,
+        )
+
+    async def select_rates(
+        self, agency_name: str, spec: RateFilter
+    ) -> tuple[Rate, ...]:
+        version = await self.repository.find_version(agency_name)
+        if (agency := self.cache.get(agency_name, version, fill=False)) is not None:
+            return agency.select_rates(spec)
+        return await self.repository.select_rates(agency_name, spec)
+
+    async def find_version(self, agency_name: str) -> AgencyVersion:
+        return await self.repository.find_version(agency_name)
+
+    async def find_versions(self) -> dict[str, AgencyVersion]:
+        return await self.repository.find_versions()
+
+    async def save(self, agency: Agency) -> None:
+        try:
+            await self.repository.save(agency)
+        finally:
+            self.cache.invalidate(agency)
@@ -3,7 +3,7 @@ from __future__ import annotations
 import datetime
 from decimal import Decimal
 
-from sqlalchemy import ForeignKey, MetaData
+from sqlalchemy import DateTime, ForeignKey, Index, MetaData, false, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 metadata = MetaData(
@@ -23,11 +23,15 @@ class Base(DeclarativeBase):
 
 class Rate(Base):
     __tablename__ = "rates"
+    __table_args__ = (
+        Index(None, "agency_id", "currency_to", "currency_from", "date", unique=True),
+    )
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     currency_from: Mapped[str] = mapped_column()
     currency_to: Mapped[str] = mapped_column()
     rate: Mapped[Decimal] = mapped_column()
-    date: Mapped[datetime.datetime] = mapped_column()
+    date: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
+    derived: Mapped[bool] = mapped_column(default=False, server_default=false())
     agency_id: Mapped[str] = mapped_column(ForeignKey("agencies.id"))
     agency: Mapped[Agency] = relationship(back_populates="rates")
 
@@ -36,9 +40,13 @@ class Agency(Base):
     __tablename__ = "agencies"
     id: Mapped[str] = mapped_column(primary_key=True)
     base: Mapped[str] = mapped_column()
-    name: Mapped[str] = mapped_column()
+    name: Mapped[str] = mapped_column(index=True, unique=True)
     address: Mapped[str] = mapped_column()
     country: Mapped[str] = mapped_column()
+    version: Mapped[int] = mapped_column(default=0, server_default="0")
+    modified: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
     rates: Mapped[set[Rate]] = relationship(
         back_populates="agency",
         cascade="all, delete-orphan",
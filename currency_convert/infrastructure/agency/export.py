@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import io
+import itertools
+import typing
+
+from sqlalchemy import Engine, select, union
+
+from currency_convert.domain.agency.entities.agency import AgencyNotFoundError
+from currency_convert.domain.agency.valueobjects.money import Money
+from currency_convert.infrastructure.agency import dto
+
+try:
+    import pyarrow as pa  # type: ignore[import-untyped]
+    import pyarrow.parquet as pq  # type: ignore[import-untyped]
+except ImportError:  # pragma: no cover
+    pa = None
+
+ExportFormat = typing.Literal["arrow", "parquet"]
+
+if pa is not None:
+    _CODE = pa.dictionary(pa.int16(), pa.string())
+    SCHEMA = pa.schema(
+        [
+            pa.field("currency_from", _CODE, nullable=False),
+            pa.field("currency_to", _CODE, nullable=False),
+            pa.field(
+                "rate",
+                pa.int64(),
+                nullable=False,
+                metadata={"scale": str(Money.DIGITS)},
+            ),
+            pa.field("date", pa.timestamp("us", tz="UTC"), nullable=False),
+            pa.field("derived", pa.bool_(), nullable=False),
+        ]
+    )
+
+
+class RateExporter:
+    """Columnar export of the rates of one agency.
+
+    Rows are read from the ``rates`` table in chunks of ``CHUNK_SIZE`` and
+    turned into record batches without building domain objects. Currency
+    codes are dictionary encoded against the codes the agency uses, rates
+    are int64 in units of ``Money.PRECISION`` and dates are UTC timestamps.
+    """
+
+    CHUNK_SIZE: typing.ClassVar[int] = 10_000
+
+    def __init__(self, bind: Engine) -> None:
+        if pa is None:  # pragma: no cover
+            raise ImportError("RateExporter requires pyarrow to be installed.")
+        self.bind = bind
+
+    def __call__(
+        self,
+        agency_name: str,
+        sink: str | typing.BinaryIO,
+        format: ExportFormat = "arrow",
+    ) -> int:
+        rows = 0
+        with self._writer(sink, format) as writer:
+            for batch in self.batches(agency_name):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+    def stream(
+        self, agency_name: str, format: ExportFormat = "arrow"
+    ) -> typing.Iterator[bytes]:
+        batches = self.batches(agency_name)
+        # raise AgencyNotFoundError before the first chunk is sent
+        first = next(batches, None)
+        return self._stream(batches, first, format)
+
+    def batches(self, agency_name: str) -> typing.Iterator[pa.RecordBatch]:
+        with self.bind.connect() as conn:
+            query = select(dto.Agency.id).filter_by(name=agency_name)
+            if (agency_id := conn.scalar(query)) is None:
+                raise AgencyNotFoundError()
+            codes = self._codes(conn, agency_id)
+            dictionary = pa.array(codes, pa.string())
+            ordinals = {code: ordinal for ordinal, code in enumerate(codes)}
+            stmt = (
+                select(
+                    dto.Rate.currency_from,
+                    dto.Rate.currency_to,
+                    dto.Rate.rate,
+                    dto.Rate.date,
+                    dto.Rate.derived,
+                )
+                .filter_by(agency_id=agency_id)
+                .order_by(dto.Rate.date, dto.Rate.id)
+                .execution_options(yield_per=self.CHUNK_SIZE)
+            )
+            for chunk in conn.execute(stmt).partitions():
+                yield self._batch(chunk, dictionary, ordinals)
+
+    @staticmethod
+    def _codes(conn: typing.Any, agency_id: str) -> list[str]:
+        stmt = union(
+            select(dto.Rate.currency_from).filter_by(agency_id=agency_id),
+            select(dto.Rate.currency_to).filter_by(agency_id=agency_id),
+        )
+        return sorted(conn.scalars(stmt))
+
+    @staticmethod
+    def _batch(
+        chunk: typing.Sequence[typing.Any],
+        dictionary: pa.Array,
+        ordinals: dict[str, int],
+    ) -> pa.RecordBatch:
+        currency_from, currency_to, rate, date, derived = zip(*chunk)
+
+        def encode(codes: tuple[str, ...]) -> pa.DictionaryArray:
+            indices = pa.array([ordinals[code] for code in codes], pa.int16())
+            return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+        return pa.RecordBatch.from_arrays(
+            [
+                encode(currency_from),
+                encode(currency_to),
+                pa.array([round(r.scaleb(Money.DIGITS)) for r in rate], pa.int64()),
+                pa.array(date, SCHEMA.field("date").type),
+                pa.array(derived, pa.bool_()),
+            ],
+            schema=SCHEMA,
+        )
+
+    def _stream(
+        self,
+        batches: typing.Iterator[pa.RecordBatch],
+        first: pa.RecordBatch | None,
+        format: ExportFormat,
+    ) -> typing.Iterator[bytes]:
+        sink = _ChunkSink()
+        with self._writer(sink, format) as writer:
+            head = () if first is None else (first,)
+            for batch in itertools.chain(head, batches):
+                writer.write_batch(batch)
+                yield sink.drain()
+        yield sink.drain()
+
+    @staticmethod
+    def _writer(
+        sink: str | typing.BinaryIO | io.RawIOBase, format: ExportFormat
+    ) -> pa.ipc.RecordBatchFileWriter | pq.ParquetWriter:
+        if format == "parquet":
+            return pq.ParquetWriter(sink, SCHEMA)
+        return pa.ipc.new_file(sink, SCHEMA)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: typing.Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
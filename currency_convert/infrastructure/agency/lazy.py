@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import itertools
+import typing
+
+from currency_convert.domain.agency.entities.agency import Agency
+from currency_convert.domain.agency.valueobjects.currency import Currency
+from currency_convert.domain.agency.valueobjects.rate import Rate
+
+if typing.TYPE_CHECKING:
+    from currency_convert.domain.agency.entities.interface import RateSource
+
+Window = tuple[datetime.datetime | None, datetime.datetime | None]
+
+
+@dataclasses.dataclass(slots=True, eq=False)
+class LazyAgency(Agency):
+    """Agency that loads its rates from ``source`` on demand.
+
+    ``rates`` only holds the slices that were looked up so far;
+    ``materialize`` loads the rest and detaches the source. The source is
+    queried synchronously, so only the synchronous repository hands out
+    lazy agencies.
+    """
+
+    source: RateSource | None = dataclasses.field(default=None, repr=False)
+    _loaded: dict[str, list[Window]] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    @classmethod
+    def from_agency(cls, agency: Agency, source: RateSource) -> LazyAgency:
+        return cls(
+            id=agency.id,
+            name=agency.name,
+            base=agency.base,
+            address=agency.address,
+            country=agency.country,
+            rates=agency.rates,
+            source=source,
+        )
+
+    def materialize(self) -> None:
+        if self.source is None:
+            return
+        for code in self.source.currencies():
+            self._load(code)
+        self.source = None
+
+    @property
+    def currencies(self) -> tuple[Currency, ...]:
+        loaded = (series[0].currency_to for series in self._index.values() if series)
+        if self.source is None:
+            return tuple(loaded)
+        stored = map(Currency.from_str, self.source.currencies())
+        return tuple(dict.fromkeys(itertools.chain(stored, loaded)))
+
+    def iter_rates(
+        self,
+        currency_from: str | None = None,
+        currency_to: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.Iterator[Rate]:
+        if self.source is not None:
+            codes = self.source.currencies() if currency_to is None else [currency_to]
+            for code in codes:
+                self._load(code, start, end)
+        # slotted dataclasses are rebuilt, so zero argument super() fails here
+        yield from Agency.iter_rates(self, currency_from, currency_to, start, end)
+
+    def _load(
+        self,
+        currency_to: str,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> None:
+        if self.source is None:
+            return
+        loaded = self._loaded.setdefault(currency_to, [])
+        if any(_covers(window, start, end) for window in loaded):
+            return
+        for rate in self.source.rates(currency_to, start, end):
+            if self._find_same(rate) is None:
+                self._add(rate)
+        loaded.append((start, end))
+
+
+def _covers(
+    window: Window, start: datetime.datetime | None, end: datetime.datetime | None
+) -> bool:
+    lo, hi = window
+    return (lo is None or (start is not None and lo <= start)) and (
+        hi is None or (end is not None and end <= hi)
+    )
@@ -1,4 +1,5 @@
 import datetime
+import typing
 
 from currency_convert.domain.agency.entities.agency import Agency
 from currency_convert.domain.agency.valueobjects.rate import Rate
@@ -18,39 +19,59 @@ class AgencyMapper:
         )
 
     @staticmethod
-    def from_db(mapped: dto.Agency) -> Agency:
+    def from_db(mapped: dto.Agency, with_rates: bool = True) -> Agency:
         return Agency.from_attributes(
             mapped.id,
             mapped.base,
             mapped.name,
             mapped.address,
             mapped.country,
-            {AgencyMapper._from_db_rate(rate) for rate in mapped.rates},
+            {AgencyMapper.from_db_rate(rate) for rate in mapped.rates}
+            if with_rates
+            else set(),
         )
 
+    @staticmethod
+    def into_db_row(agency: Agency, rate: Rate) -> dict[str, typing.Any]:
+        return {
+            "agency_id": agency.id.hex,
+            "currency_from": rate.currency_from.code,
+            "currency_to": rate.currency_to.code,
+            "rate": rate.rate.amount,
+            "date": AgencyMapper.into_db_date(rate.dt),
+            "derived": rate.derived,
+        }
+
     @staticmethod
     def _into_db_rate(rate: Rate) -> dto.Rate:
         return dto.Rate(
             currency_from=next(rate.currency_from.get_values()),
             currency_to=next(rate.currency_to.get_values()),
             rate=next(rate.rate.get_values()),
-            date=rate.dt,
+            date=AgencyMapper.into_db_date(rate.dt),
+            derived=rate.derived,
         )
 
     @staticmethod
-    def _from_db_rate(mapped: dto.Rate) -> Rate:
-        match mapped.date:
-            case datetime.datetime():
-                date = mapped.date
-            case str(iso_str):
-                date = datetime.datetime.fromisoformat(iso_str)
-            case _:
-                err = "Invalid date type from dto: %s" % mapped
-                raise ValueError(err)
+    def from_db_rate(mapped: dto.Rate) -> Rate:
         return Rate.from_attributes(
             id=mapped.id,
             currency_from=mapped.currency_from,
             currency_to=mapped.currency_to,
             rate=str(mapped.rate),
-            dt=date,
+            dt=AgencyMapper.from_db_date(mapped.date),
+            derived=mapped.derived,
         )
+
+    @staticmethod
+    def into_db_date(dt: datetime.datetime) -> datetime.datetime:
+        # the domain treats naive datetimes as UTC, the column is timezone aware
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=datetime.UTC)
+        return dt.astimezone(datetime.UTC)
+
+    @staticmethod
+    def from_db_date(dt: datetime.datetime) -> datetime.datetime:
+        if dt.tzinfo is None:
+            return dt
+        return dt.astimezone(datetime.UTC).replace(tzinfo=None)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import datetime
+import typing
+
+from currency_convert.domain.agency.valueobjects.currency import Currency
+from currency_convert.domain.agency.valueobjects.money import Money
+from currency_convert.domain.agency.valueobjects.rate import Rate
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+if typing.TYPE_CHECKING:
+    Matrix = npt.NDArray[np.float64]
+
+
+class MatrixEngine:
+    """Cross rates of one agency as an N x N matrix per observation date.
+
+    Only rates quoted against the base currency feed the matrices. Cell
+    ``[i, j]`` holds the rate from column ``i`` to column ``j`` in units of
+    ``Money.PRECISION``, rounded the same way as ``Rate.multiply`` and
+    ``Rate.invert``. A matrix is built on first lookup of its date and
+    dropped again when a rate for that date is added. Cross rates are
+    derived if either leg is, as with ``Rate.multiply``.
+    """
+
+    def __init__(self, base: Currency) -> None:
+        if np is None:  # pragma: no cover
+            raise ImportError("MatrixEngine requires numpy to be installed.")
+        self.base = base
+        self._currencies: list[Currency] = [base]
+        self._columns: dict[int, int] = {base.ordinal: 0}
+        self._latest: dict[int, datetime.datetime] = {}
+        self._observations: dict[datetime.datetime, dict[int, int]] = {}
+        self._derived: dict[datetime.datetime, set[int]] = {}
+        self._matrices: dict[datetime.datetime, Matrix] = {}
+
+    def add(self, rate: Rate) -> None:
+        if rate.currency_from != self.base or rate.currency_to == self.base:
+            return
+        column = self._column(rate.currency_to)
+        self._observations.setdefault(rate.dt, {})[column] = rate.rate.units
+        derived = self._derived.setdefault(rate.dt, set())
+        if rate.derived:
+            derived.add(column)
+        else:
+            derived.discard(column)
+        self._matrices.pop(rate.dt, None)
+        if (latest := self._latest.get(column)) is None or latest < rate.dt:
+            self._latest[column] = rate.dt
+
+    def lookup(
+        self,
+        currency_from: int,
+        currency_to: int,
+        dt: datetime.datetime | None,
+    ) -> Rate | None:
+        row = self._columns.get(currency_from)
+        column = self._columns.get(currency_to)
+        if row is None or column is None:
+            return None
+        if dt is None and (dt := self._latest_common(row, column)) is None:
+            return None
+        if (matrix := self._matrix(dt)) is None or max(row, column) >= len(matrix):
+            return None
+        if np.isnan(units := matrix[row, column]):
+            return None
+        return Rate(
+            currency_from=self._currencies[row],
+            currency_to=self._currencies[column],
+            rate=Money.from_units(int(units)),
+            dt=dt,
+            derived=not self._derived.get(dt, set()).isdisjoint((row, column)),
+        )
+
+    def _column(self, currency: Currency) -> int:
+        if (column := self._columns.get(currency.ordinal)) is None:
+            column = self._columns[currency.ordinal] = len(self._currencies)
+            self._currencies.append(currency)
+        return column
+
+    def _latest_common(self, *columns: int) -> datetime.datetime | None:
+        dates = {self._latest.get(column) for column in columns if column != 0}
+        return dates.pop() if len(dates) == 1 else None
+
+    def _matrix(self, dt: datetime.datetime) -> Matrix | None:
+        if (matrix := self._matrices.get(dt)) is not None:
+            return matrix
+        if (observed := self._observations.get(dt)) is None:
+            return None
+        units = np.full(len(self._currencies), np.nan)
+        units[0] = Money.SCALE
+        units[list(observed)] = list(observed.values())
+        inverse = np.rint(Money.SCALE * Money.SCALE / units)
+        matrix = self._matrices[dt] = np.rint(np.outer(inverse, units) / Money.SCALE)
+        return matrix
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import datetime
+import typing
+
 from currency_convert.domain.agency.entities.agency import (
     Agency,
     AgencyNotFoundError,
     AgencySaveError,
 )
+from currency_convert.domain.agency.entities.interface import (
+    AgencyVersion,
+    RateFilter,
+)
+from currency_convert.domain.agency.valueobjects.rate import Rate
 
 
 class AgencyRepo:
     def __init__(self, agencies: set[Agency] | None = None) -> None:
         self.agencies = agencies or set()
+        self.versions: dict[str, AgencyVersion] = {}
+        self._created = _now()
 
     def find_by_id(self, id: str) -> Agency:
         if (agency := next((a for a in self.agencies if a.id == id), None)) is None:
@@ -24,9 +34,58 @@ class AgencyRepo:
     def find_all(self) -> list[Agency]:
         return list(self.agencies)
 
+    def find_rates(
+        self,
+        agency_name: str,
+        currency_from: str | None = None,
+        currency_to: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.Iterator[Rate]:
+        agency = self.find_by_name(agency_name)
+        return agency.iter_rates(currency_from, currency_to, start, end)
+
+    def find_rate(
+        self,
+        agency_name: str,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+        *,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate:
+        return self.find_by_name(agency_name).get_rate(
+            currency_from,
+            currency_to,
+            dt,
+            as_of=as_of,
+            max_staleness=max_staleness,
+        )
+
+    def select_rates(self, agency_name: str, spec: RateFilter) -> tuple[Rate, ...]:
+        return self.find_by_name(agency_name).select_rates(spec)
+
+    def find_version(self, agency_name: str) -> AgencyVersion:
+        if not any(a.name == agency_name for a in self.agencies):
+            raise AgencyNotFoundError()
+        return self.versions.get(agency_name, AgencyVersion(0, self._created))
+
+    def find_versions(self) -> dict[str, AgencyVersion]:
+        return {a.name: self.find_version(a.name) for a in self.agencies}
+
     def save(self, agency: Agency) -> None:
         try:
             self.agencies.discard(next(a for a in self.agencies if a.id == agency.id))
             self.agencies.add(agency)
         except StopIteration as exc:
             raise AgencySaveError from exc
+        added, removed = agency.pending_rates()
+        if added or removed:
+            version = self.find_version(agency.name).version
+            self.versions[agency.name] = AgencyVersion(version + 1, _now())
+        agency.mark_saved()
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
@@ -1,6 +1,18 @@
 from __future__ import annotations
 
+import csv
+import dataclasses
+import datetime
+import io
+import itertools
+import logging
+import time
+import typing
+
+from sqlalchemy import Insert, Select, and_, delete, func, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.session import Session
 
 from currency_convert.domain.agency.entities.agency import (
@@ -8,34 +20,419 @@ from currency_convert.domain.agency.entities.agency import (
     AgencyNotFoundError,
     AgencySaveError,
 )
+from currency_convert.domain.agency.entities.interface import (
+    AgencyVersion,
+    CrossRateEngineFactory,
+    RateFilter,
+)
+from currency_convert.domain.agency.valueobjects.rate import Rate
 from currency_convert.infrastructure.agency import dto
+from currency_convert.infrastructure.agency.lazy import LazyAgency
 from currency_convert.infrastructure.agency.mapper import AgencyMapper
 
+_logger = logging.getLogger(__name__)
+
+T = typing.TypeVar("T")
+
+COLUMNS = ("agency_id", "currency_from", "currency_to", "rate", "date", "derived")
+NATURAL_KEY = ("agency_id", "currency_to", "currency_from", "date")
+# Rate.sort_key, so listings agree with in-memory agencies and ties are stable
+LISTING_ORDER = (dto.Rate.date, dto.Rate.currency_to, dto.Rate.currency_from)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BulkWrite:
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+class RateSource:
+    """Rates of one agency, queried per currency and date window."""
+
+    def __init__(self, session: Session, agency_id: str) -> None:
+        self.session = session
+        self.agency_id = agency_id
+
+    def currencies(self) -> list[str]:
+        stmt = (
+            select(dto.Rate.currency_to).filter_by(agency_id=self.agency_id).distinct()
+        )
+        return list(self.session.scalars(stmt))
+
+    def rates(
+        self,
+        currency_to: str,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> list[Rate]:
+        stmt = select(dto.Rate).filter_by(
+            agency_id=self.agency_id, currency_to=currency_to
+        )
+        if start is not None:
+            stmt = stmt.where(dto.Rate.date >= AgencyMapper.into_db_date(start))
+        if end is not None:
+            stmt = stmt.where(dto.Rate.date <= AgencyMapper.into_db_date(end))
+        return [AgencyMapper.from_db_rate(m) for m in self.session.scalars(stmt)]
+
 
 class AgencyRepo:
-    def __init__(self, session: Session) -> None:
+    CHUNK_SIZE: typing.ClassVar[int] = 1000
+
+    def __init__(
+        self,
+        session: Session,
+        engine: CrossRateEngineFactory | None = None,
+        lazy: bool = False,
+    ) -> None:
         self.session = session
+        self.engine = engine
+        self.lazy = lazy
 
     def find_by_id(self, id: str) -> Agency:
         if (a := self.session.query(dto.Agency).filter_by(id=id).first()) is None:
             raise AgencyNotFoundError()
-        return AgencyMapper.from_db(a)
+        return self._from_db(a)
 
     def find_by_name(self, name: str) -> Agency:
         if (a := self.session.query(dto.Agency).filter_by(name=name).first()) is None:
             raise AgencyNotFoundError()
-        return AgencyMapper.from_db(a)
+        return self._from_db(a)
 
     def find_all(self) -> list[Agency]:
         return list(
-            AgencyMapper.from_db(agency)
-            for agency in self.session.query(dto.Agency).all()
+            self._from_db(agency) for agency in self.session.query(dto.Agency).all()
+        )
+
+    def find_rates(
+        self,
+        agency_name: str,
+        currency_from: str | None = None,
+        currency_to: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.Iterator[Rate]:
+        stmt = self._rates_of(agency_name, currency_from, currency_to, start, end)
+        return self._stream(stmt.order_by(*LISTING_ORDER))
+
+    def find_rate(
+        self,
+        agency_name: str,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+        *,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate:
+        """Look up one pair with at most two single row queries.
+
+        ``engine`` is not consulted, it needs the whole agency in memory;
+        ``CachedAgencyRepo(load_on_miss=True)`` keeps agencies loaded for it.
+        """
+        query = self.session.query(dto.Agency.id, dto.Agency.base)
+        if (agency := query.filter_by(name=agency_name).first()) is None:
+            raise AgencyNotFoundError()
+
+        def find(code: str) -> Rate:
+            # one row through the natural key index, newest first
+            stmt = select(dto.Rate).filter_by(
+                agency_id=agency.id, currency_to=code, currency_from=agency.base
+            )
+            if dt is not None:
+                stmt = stmt.where(dto.Rate.date <= AgencyMapper.into_db_date(dt))
+            stmt = stmt.order_by(dto.Rate.date.desc()).limit(1)
+            latest = self.session.scalars(stmt).first()
+            return Agency.pick_rate(
+                None if latest is None else AgencyMapper.from_db_rate(latest),
+                dt,
+                as_of,
+                max_staleness,
+            )
+
+        return Agency.quote(agency.base, currency_from, currency_to, find)
+
+    def select_rates(self, agency_name: str, spec: RateFilter) -> tuple[Rate, ...]:
+        start, end = (spec.start, spec.end) if spec.dt is None else (spec.dt, spec.dt)
+        stmt = self._rates_of(
+            agency_name, spec.currency_from, spec.currency_to, start, end
+        )
+        if spec.order == "desc":
+            stmt = stmt.order_by(*(column.desc() for column in LISTING_ORDER))
+        else:
+            stmt = stmt.order_by(*LISTING_ORDER)
+        rows = self.session.scalars(stmt.limit(spec.limit))
+        return tuple(AgencyMapper.from_db_rate(mapped) for mapped in rows)
+
+    def find_version(self, agency_name: str) -> AgencyVersion:
+        query = self.session.query(dto.Agency.version, dto.Agency.modified)
+        if (row := query.filter_by(name=agency_name).first()) is None:
+            raise AgencyNotFoundError()
+        return AgencyVersion(row.version, AgencyMapper.from_db_date(row.modified))
+
+    def find_versions(self) -> dict[str, AgencyVersion]:
+        query = self.session.query(
+            dto.Agency.name, dto.Agency.version, dto.Agency.modified
         )
+        return {
+            row.name: AgencyVersion(
+                row.version, AgencyMapper.from_db_date(row.modified)
+            )
+            for row in query
+        }
+
+    def _rates_of(
+        self,
+        agency_name: str,
+        currency_from: str | None,
+        currency_to: str | None,
+        start: datetime.datetime | None,
+        end: datetime.datetime | None,
+    ) -> Select[tuple[dto.Rate]]:
+        query = self.session.query(dto.Agency.id).filter_by(name=agency_name)
+        if (agency_id := query.scalar()) is None:
+            raise AgencyNotFoundError()
+        stmt = select(dto.Rate).filter_by(agency_id=agency_id)
+        if currency_from is not None:
+            stmt = stmt.filter_by(currency_from=currency_from)
+        if currency_to is not None:
+            stmt = stmt.filter_by(currency_to=currency_to)
+        if start is not None:
+            stmt = stmt.where(dto.Rate.date >= AgencyMapper.into_db_date(start))
+        if end is not None:
+            stmt = stmt.where(dto.Rate.date <= AgencyMapper.into_db_date(end))
+        return stmt
+
+    def _stream(self, stmt: Select[tuple[dto.Rate]]) -> typing.Iterator[Rate]:
+        # Streams outlive the request scoped session, so they read in chunks
+        # through a session of their own that is closed once exhausted.
+        with Session(self.session.get_bind()) as session:
+            rows = session.scalars(stmt.execution_options(yield_per=self.CHUNK_SIZE))
+            for mapped in rows:
+                yield AgencyMapper.from_db_rate(mapped)
+
+    def _from_db(self, mapped: dto.Agency) -> Agency:
+        agency = AgencyMapper.from_db(mapped, with_rates=not self.lazy)
+        if self.lazy:
+            agency = LazyAgency.from_agency(agency, RateSource(self.session, mapped.id))
+        if self.engine is not None:
+            agency.use_engine(self.engine(agency.base))
+        return agency
 
     def save(self, agency: Agency) -> None:
+        added, removed = agency.pending_rates()
         try:
-            self.session.merge(AgencyMapper.into_db(agency))
+            if self.session.get(dto.Agency, agency.id.hex) is None:
+                agency.materialize()
+                self.session.add(AgencyMapper.into_db(agency))
+            elif added or removed:
+                self._write_delta(agency, added, removed)
+                self._touch(agency)
             self.session.commit()
         except SQLAlchemyError as exc:
             self.session.rollback()
             raise AgencySaveError.from_exc(exc)
+        else:
+            agency.mark_saved()
+
+    def _write_delta(
+        self, agency: Agency, added: tuple[Rate, ...], removed: tuple[Rate, ...]
+    ) -> None:
+        if removed:
+            keys = (
+                and_(
+                    dto.Rate.currency_from == rate.currency_from.code,
+                    dto.Rate.currency_to == rate.currency_to.code,
+                    dto.Rate.date == AgencyMapper.into_db_date(rate.dt),
+                )
+                for rate in removed
+            )
+            self.session.execute(
+                delete(dto.Rate)
+                .filter_by(agency_id=agency.id.hex, derived=True)
+                .where(or_(*keys))
+            )
+        if added:
+            self._insert([AgencyMapper.into_db_row(agency, rate) for rate in added])
+
+    def _touch(self, agency: Agency) -> None:
+        # the version of an agency backs the validators of cached responses
+        self.session.execute(
+            update(dto.Agency)
+            .filter_by(id=agency.id.hex)
+            .values(version=dto.Agency.version + 1, modified=func.now())
+        )
+
+    def bulk_insert(self, agency: Agency, rates: typing.Iterable[Rate]) -> BulkWrite:
+        """Write ``rates`` of a stored agency without going through the aggregate.
+
+        Meant for backfills: rows go out in batches of ``CHUNK_SIZE``, through
+        ``COPY`` on PostgreSQL, and rates that are already stored are skipped.
+        """
+        rows = (AgencyMapper.into_db_row(agency, rate) for rate in rates)
+        started = time.perf_counter()
+        try:
+            if self._dialect == "postgresql":
+                written = self._copy(rows)
+            else:
+                written = sum(map(self._insert, _chunked(rows, self.CHUNK_SIZE)))
+            if written:
+                self._touch(agency)
+            self.session.commit()
+        except SQLAlchemyError as exc:
+            self.session.rollback()
+            raise AgencySaveError.from_exc(exc)
+        result = BulkWrite(written, time.perf_counter() - started)
+        _logger.info(
+            "Wrote %d rates of %s in %.3fs (%.0f rows/s)",
+            result.rows,
+            agency.name,
+            result.seconds,
+            result.rows_per_second,
+        )
+        return result
+
+    @property
+    def _dialect(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def _insert(self, rows: typing.Sequence[dict[str, typing.Any]]) -> int:
+        # a Core insert on the table, so the rows skip the ORM bulk machinery
+        table = dto.metadata.tables[dto.Rate.__tablename__]
+        stmt: Insert
+        match self._dialect:
+            case "postgresql":
+                stmt = postgresql.insert(table).on_conflict_do_nothing(
+                    index_elements=NATURAL_KEY
+                )
+            case "sqlite":
+                stmt = sqlite.insert(table).on_conflict_do_nothing(
+                    index_elements=NATURAL_KEY
+                )
+            case _:
+                stmt = insert(table)
+        return self.session.execute(stmt, rows).rowcount
+
+    def _copy(self, rows: typing.Iterable[dict[str, typing.Any]]) -> int:
+        # COPY cannot skip conflicting rows, so it fills a staging table that
+        # is then inserted with ON CONFLICT DO NOTHING in a single statement.
+        columns = ", ".join(COLUMNS)
+        cursor = self.session.connection().connection.cursor()
+        cursor.execute(
+            f"CREATE TEMP TABLE rates_staging ON COMMIT DROP AS "
+            f"SELECT {columns} FROM rates WITH NO DATA"
+        )
+        for chunk in _chunked(rows, self.CHUNK_SIZE):
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows([row[c] for c in COLUMNS] for row in chunk)
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY rates_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        cursor.execute(
+            f"INSERT INTO rates ({columns}) SELECT {columns} FROM rates_staging "
+            f"ON CONFLICT ({', '.join(NATURAL_KEY)}) DO NOTHING"
+        )
+        return cursor.rowcount
+
+
+class AsyncAgencyRepo:
+    """AgencyRepo on an ``AsyncSession``.
+
+    Everything but streams runs the synchronous repository through
+    ``AsyncSession.run_sync``, so both share one mapping and write path.
+    Agencies are always loaded eagerly, a lazy source would query outside
+    the event loop.
+    """
+
+    CHUNK_SIZE: typing.ClassVar[int] = AgencyRepo.CHUNK_SIZE
+
+    def __init__(
+        self, session: AsyncSession, engine: CrossRateEngineFactory | None = None
+    ) -> None:
+        self.session = session
+        self.engine = engine
+
+    async def find_by_id(self, id: str) -> Agency:
+        return await self._run(lambda repo: repo.find_by_id(id))
+
+    async def find_by_name(self, name: str) -> Agency:
+        return await self._run(lambda repo: repo.find_by_name(name))
+
+    async def find_all(self) -> list[Agency]:
+        return await self._run(lambda repo: repo.find_all())
+
+    async def find_rates(
+        self,
+        agency_name: str,
+        currency_from: str | None = None,
+        currency_to: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.AsyncIterator[Rate]:
+        stmt = await self._run(
+            lambda repo: repo._rates_of(
+                agency_name, currency_from, currency_to, start, end
+            )
+        )
+        return self._stream(stmt.order_by(*LISTING_ORDER))
+
+    async def find_rate(
+        self,
+        agency_name: str,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+        *,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate:
+        return await self._run(
+            lambda repo: repo.find_rate(
+                agency_name,
+                currency_from,
+                currency_to,
+                dt,
+                as_of=as_of,
+                max_staleness=max_staleness,
+            )
+        )
+
+    async def select_rates(
+        self, agency_name: str, spec: RateFilter
+    ) -> tuple[Rate, ...]:
+        return await self._run(lambda repo: repo.select_rates(agency_name, spec))
+
+    async def find_version(self, agency_name: str) -> AgencyVersion:
+        return await self._run(lambda repo: repo.find_version(agency_name))
+
+    async def find_versions(self) -> dict[str, AgencyVersion]:
+        return await self._run(lambda repo: repo.find_versions())
+
+    async def save(self, agency: Agency) -> None:
+        await self._run(lambda repo: repo.save(agency))
+
+    async def _run(self, call: typing.Callable[[AgencyRepo], T]) -> T:
+        return await self.session.run_sync(
+            lambda session: call(AgencyRepo(session, self.engine))
+        )
+
+    async def _stream(
+        self, stmt: Select[tuple[dto.Rate]]
+    ) -> typing.AsyncIterator[Rate]:
+        async with AsyncSession(self.session.bind) as session:
+            stmt = stmt.execution_options(yield_per=self.CHUNK_SIZE)
+            rows = await session.stream_scalars(stmt)
+            async for mapped in rows:
+                yield AgencyMapper.from_db_rate(mapped)
+
+
+def _chunked(
+    rows: typing.Iterable[dict[str, typing.Any]], size: int
+) -> typing.Iterator[list[dict[str, typing.Any]]]:
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
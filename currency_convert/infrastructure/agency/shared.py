@@ -0,0 +1,477 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import contextlib
+import datetime
+import fcntl
+import itertools
+import mmap
+import os
+import pathlib
+import struct
+import typing
+
+from currency_convert.domain.agency.entities.agency import Agency
+from currency_convert.domain.agency.entities.interface import (
+    AgencyRepository,
+    AgencyVersion,
+    AsyncAgencyRepository,
+    RateFilter,
+)
+from currency_convert.domain.agency.valueobjects.currency import Currency
+from currency_convert.domain.agency.valueobjects.money import Money
+from currency_convert.domain.agency.valueobjects.rate import Rate
+
+MAGIC = b"RATE"
+VERSION = 2
+# magic, version, base, generation, superseded by generation, record count,
+# version of the agency and when it was modified in µs since the epoch
+HEADER = struct.Struct("<4sH3sxQQQQq6x")
+SUPERSEDED = struct.Struct("<Q")
+SUPERSEDED_AT = 18
+# currency_from, currency_to, derived, date in µs since the epoch, Money units
+RECORD = struct.Struct("<3s3s?xqq")
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+Key = tuple[bytes, bytes, int]
+
+
+class SharedRateStore:
+    """Rates of each agency in a memory mapped file shared by all workers.
+
+    ``publish`` writes the rates of an agency as fixed width records sorted
+    by (currency_to, currency_from, date) into a new file that replaces the
+    old one, then stamps the old file with the new generation. Readers keep
+    their mapping until they see that stamp, so reads take no lock and no
+    system call. Point ``directory`` at a tmpfs such as ``/dev/shm``.
+
+    Each file records the ``AgencyVersion`` its rates were loaded at, so
+    readers can tell a file left behind by a restart or by writes that
+    never published, such as ``bulk_insert``, from a current one.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._mapped: dict[str, _Mapped] = {}
+
+    def publish(self, agency: Agency, version: AgencyVersion) -> int:
+        """Store the rates of ``agency`` at ``version``, return the generation.
+
+        Nothing is written if the file already holds ``version``.
+        """
+        path = self._path(agency.name)
+        with self._writer_lock():
+            generation, stored = self._header_of(path)
+            if stored == version:
+                return generation
+            generation += 1
+            agency.materialize()
+            rates = sorted(agency.rates, key=_key)
+            buffer = bytearray(HEADER.size + RECORD.size * len(rates))
+            HEADER.pack_into(
+                buffer,
+                0,
+                MAGIC,
+                VERSION,
+                agency.base.code.encode(),
+                generation,
+                0,
+                len(rates),
+                version.version,
+                _micros(version.modified),
+            )
+            for position, rate in enumerate(rates):
+                RECORD.pack_into(
+                    buffer, HEADER.size + position * RECORD.size, *_record(rate)
+                )
+            staged = path.with_suffix(f".{os.getpid()}.tmp")
+            staged.write_bytes(buffer)
+            with contextlib.ExitStack() as stack:
+                old = stack.enter_context(open(path, "r+b")) if path.exists() else None
+                os.replace(staged, path)
+                if old is not None:
+                    # readers of the old file pick up the new one from here
+                    old.seek(SUPERSEDED_AT)
+                    old.write(SUPERSEDED.pack(generation))
+        return generation
+
+    def generation(self, agency_name: str) -> int:
+        mapped = self._open(agency_name)
+        return 0 if mapped is None else mapped.generation
+
+    def version(self, agency_name: str) -> AgencyVersion | None:
+        """Version of the agency the stored rates were published at."""
+        mapped = self._open(agency_name)
+        return None if mapped is None else mapped.version
+
+    @contextlib.contextmanager
+    def claim(self, agency_name: str) -> typing.Iterator[bool]:
+        """Whether this caller is the one to publish ``agency_name`` now.
+
+        Never waits: while another worker or thread holds the claim, callers
+        get False and should answer from the database instead.
+        """
+        with open(self.directory / f"{agency_name}.claim", "a") as claim:
+            try:
+                fcntl.flock(claim, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(claim, fcntl.LOCK_UN)
+
+    def find_rate(
+        self,
+        agency_name: str,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+        *,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate | None:
+        """Same answer as ``Agency.get_rate``, None if the agency is not stored."""
+        if (mapped := self._open(agency_name)) is None:
+            return None
+
+        def find(code: str) -> Rate:
+            latest = mapped.latest(mapped.base, code, dt)
+            return Agency.pick_rate(latest, dt, as_of, max_staleness)
+
+        return Agency.quote(mapped.base, currency_from, currency_to, find)
+
+    def select_rates(
+        self, agency_name: str, spec: RateFilter
+    ) -> tuple[Rate, ...] | None:
+        """Same answer as ``Agency.select_rates``, None if the agency is not stored."""
+        if (mapped := self._open(agency_name)) is None:
+            return None
+        start, end = (spec.start, spec.end) if spec.dt is None else (spec.dt, spec.dt)
+        rates = sorted(
+            mapped.scan(spec.currency_from, spec.currency_to, start, end),
+            key=lambda rate: rate.sort_key,
+            reverse=spec.order == "desc",
+        )
+        return tuple(itertools.islice(rates, spec.limit))
+
+    def _open(self, agency_name: str) -> _Mapped | None:
+        mapped = self._mapped.get(agency_name)
+        if mapped is not None and not mapped.superseded:
+            return mapped
+        try:
+            with open(self._path(agency_name), "rb") as file:
+                mapped = _Mapped(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        except (FileNotFoundError, ValueError):
+            # ValueError: an empty file cannot be mapped
+            self._mapped.pop(agency_name, None)
+            return None
+        self._mapped[agency_name] = mapped
+        return mapped
+
+    def _path(self, agency_name: str) -> pathlib.Path:
+        return self.directory / f"{agency_name}.rates"
+
+    @staticmethod
+    def _header_of(path: pathlib.Path) -> tuple[int, AgencyVersion | None]:
+        """Generation and agency version of the stored file."""
+        if not path.exists():
+            return 0, None
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+        if len(header) < HEADER.size or header[4:6] != struct.pack("<H", VERSION):
+            # a file of another layout is replaced, not continued
+            return 0, None
+        _, _, _, generation, _, _, version, modified = HEADER.unpack(header)
+        return generation, AgencyVersion(version, EPOCH + modified * MICROSECOND)
+
+    @contextlib.contextmanager
+    def _writer_lock(self) -> typing.Iterator[None]:
+        with open(self.directory / ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class _Mapped:
+    """Read-only view of one mapped rate file."""
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        if len(buffer) < HEADER.size:
+            raise ValueError(f"Not a version {VERSION} rate file.")
+        magic, layout, base, generation, _, count, version, modified = (
+            HEADER.unpack_from(buffer)
+        )
+        if magic != MAGIC or layout != VERSION:
+            raise ValueError(f"Not a version {VERSION} rate file.")
+        self.buffer = buffer
+        self.base: str = base.decode()
+        self.generation: int = generation
+        self.version = AgencyVersion(version, EPOCH + modified * MICROSECOND)
+        self.positions = range(count)
+
+    @property
+    def superseded(self) -> bool:
+        superseded: int = SUPERSEDED.unpack_from(self.buffer, SUPERSEDED_AT)[0]
+        return superseded != 0
+
+    def latest(
+        self, currency_from: str, currency_to: str, dt: datetime.datetime | None
+    ) -> Rate | None:
+        pair = (currency_to.encode(), currency_from.encode())
+        until = _micros(dt) if dt is not None else 2**63 - 1
+        position = bisect.bisect_right(self.positions, (*pair, until), key=self._key)
+        if position == 0 or self._key(position - 1)[:2] != pair:
+            return None
+        return self._rate(position - 1)
+
+    def scan(
+        self,
+        currency_from: str | None,
+        currency_to: str | None,
+        start: datetime.datetime | None,
+        end: datetime.datetime | None,
+    ) -> typing.Iterator[Rate]:
+        positions = self.positions
+        if currency_to is not None:
+            code = currency_to.encode()
+            lo = bisect.bisect_left(positions, code, key=lambda p: self._key(p)[0])
+            hi = bisect.bisect_right(positions, code, key=lambda p: self._key(p)[0])
+            positions = positions[lo:hi]
+        first = -(2**63) if start is None else _micros(start)
+        last = 2**63 - 1 if end is None else _micros(end)
+        for position in positions:
+            from_, _, _, date, _ = self._unpack(position)
+            if first <= date <= last and (
+                currency_from is None or from_ == currency_from.encode()
+            ):
+                yield self._rate(position)
+
+    def _key(self, index: int) -> Key:
+        currency_from, currency_to, _, date, _ = self._unpack(index)
+        return currency_to, currency_from, date
+
+    def _unpack(self, index: int) -> tuple[bytes, bytes, bool, int, int]:
+        offset = HEADER.size + index * RECORD.size
+        return typing.cast(
+            tuple[bytes, bytes, bool, int, int],
+            RECORD.unpack_from(self.buffer, offset),
+        )
+
+    def _rate(self, index: int) -> Rate:
+        currency_from, currency_to, derived, date, units = self._unpack(index)
+        return Rate(
+            currency_from=Currency.from_str(currency_from.decode()),
+            currency_to=Currency.from_str(currency_to.decode()),
+            rate=Money.from_units(units),
+            dt=EPOCH + date * MICROSECOND,
+            derived=derived,
+        )
+
+
+class SharedRateRepo:
+    """AgencyRepository that answers rate lookups from a SharedRateStore.
+
+    Every lookup first reads the agency's version from ``repository``. An
+    agency missing from the store, or stored at another version, is loaded
+    by name and published again before the store answers, by the one
+    worker that gets the store's claim; the others answer that lookup from
+    ``repository``. This costs one single row query per lookup and sees
+    saves, ``bulk_insert`` and writes of other processes alike. Meant for
+    read repositories only, nothing is published on save.
+    """
+
+    def __init__(self, repository: AgencyRepository, store: SharedRateStore) -> None:
+        self.repository = repository
+        self.store = store
+
+    def find_by_id(self, agency_id: str) -> Agency:
+        return self.repository.find_by_id(agency_id)
+
+    def find_by_name(self, name: str) -> Agency:
+        return self.repository.find_by_name(name)
+
+    def find_all(self) -> list[Agency]:
+        return self.repository.find_all()
+
+    def find_rates(
+        self,
+        agency_name: str,
+        currency_from: str | None = None,
+        currency_to: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.Iterator[Rate]:
+        return self.repository.find_rates(
+            agency_name, currency_from, currency_to, start, end
+        )
+
+    def find_rate(
+        self,
+        agency_name: str,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+        *,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate:
+        if self._current(agency_name):
+            rate = self.store.find_rate(
+                agency_name,
+                currency_from,
+                currency_to,
+                dt,
+                as_of=as_of,
+                max_staleness=max_staleness,
+            )
+            if rate is not None:
+                return rate
+        return self.repository.find_rate(
+            agency_name,
+            currency_from,
+            currency_to,
+            dt,
+            as_of=as_of,
+            max_staleness=max_staleness,
+        )
+
+    def select_rates(self, agency_name: str, spec: RateFilter) -> tuple[Rate, ...]:
+        if self._current(agency_name):
+            if (rates := self.store.select_rates(agency_name, spec)) is not None:
+                return rates
+        return self.repository.select_rates(agency_name, spec)
+
+    def find_version(self, agency_name: str) -> AgencyVersion:
+        return self.repository.find_version(agency_name)
+
+    def find_versions(self) -> dict[str, AgencyVersion]:
+        return self.repository.find_versions()
+
+    def save(self, agency: Agency) -> None:
+        self.repository.save(agency)
+
+    def _current(self, agency_name: str) -> bool:
+        """Whether the store holds the current rates, publishing them if needed."""
+        version = self.find_version(agency_name)
+        if self.store.version(agency_name) == version:
+            return True
+        with self.store.claim(agency_name) as claimed:
+            if claimed:
+                # the version is read before the agency, so a racing write
+                # leaves the file labelled older than its rates
+                self.store.publish(self.repository.find_by_name(agency_name), version)
+        return claimed
+
+
+def _micros(dt: datetime.datetime) -> int:
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return (dt - EPOCH) // MICROSECOND
+
+
+def _key(rate: Rate) -> Key:
+    return (
+        rate.currency_to.code.encode(),
+        rate.currency_from.code.encode(),
+        _micros(rate.dt),
+    )
+
+
+def _record(rate: Rate) -> tuple[bytes, bytes, bool, int, int]:
+    currency_to, currency_from, date = _key(rate)
+    return currency_from, currency_to, rate.derived, date, rate.rate.units
+
+
+class AsyncSharedRateRepo:
+    """SharedRateRepo for an AsyncAgencyRepository, publishing off the loop."""
+
+    def __init__(
+        self, repository: AsyncAgencyRepository, store: SharedRateStore
+    ) -> None:
+        self.repository = repository
+        self.store = store
+
+    async def find_by_id(self, agency_id: str) -> Agency:
+        return await self.repository.find_by_id(agency_id)
+
+    async def find_by_name(self, name: str) -> Agency:
+        return await self.repository.find_by_name(name)
+
+    async def find_all(self) -> list[Agency]:
+        return await self.repository.find_all()
+
+    async def find_rates(
+        self,
+        agency_name: str,
+        currency_from: str | None = None,
+        currency_to: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> typing.AsyncIterator[Rate]:
+        return await self.repository.find_rates(
+            agency_name, currency_from, currency_to, start, end
+        )
+
+    async def find_rate(
+        self,
+        agency_name: str,
+        currency_from: str,
+        currency_to: str,
+        dt: datetime.datetime | None = None,
+        *,
+        as_of: bool = False,
+        max_staleness: datetime.timedelta | None = None,
+    ) -> Rate:
+        if await self._current(agency_name):
+            rate = self.store.find_rate(
+                agency_name,
+                currency_from,
+                currency_to,
+                dt,
+                as_of=as_of,
+                max_staleness=max_staleness,
+            )
+            if rate is not None:
+                return rate
+        return await self.repository.find_rate(
+            agency_name,
+            currency_from,
+            currency_to,
+            dt,
+            as_of=as_of,
+            max_staleness=max_staleness,
+        )
+
+    async def select_rates(
+        self, agency_name: str, spec: RateFilter
+    ) -> tuple[Rate, ...]:
+        if await self._current(agency_name):
+            if (rates := self.store.select_rates(agency_name, spec)) is not None:
+                return rates
+        return await self.repository.select_rates(agency_name, spec)
+
+    async def find_version(self, agency_name: str) -> AgencyVersion:
+        return await self.repository.find_version(agency_name)
+
+    async def find_versions(self) -> dict[str, AgencyVersion]:
+        return await self.repository.find_versions()
+
+    async def save(self, agency: Agency) -> None:
+        await self.repository.save(agency)
+
+    async def _current(self, agency_name: str) -> bool:
+        version = await self.find_version(agency_name)
+        if self.store.version(agency_name) == version:
+            return True
+        with self.store.claim(agency_name) as claimed:
+            if claimed:
+                agency = await self.repository.find_by_name(agency_name)
+                await asyncio.to_thread(self.store.publish, agency, version)
+        return claimed
@@ -0,0 +1,40 @@
+"""agency versions
+
+Revision ID: 5e7a2c9d1b84
+Revises: c41b7e93a5d2
+Create Date: 2026-10-18 19:12:05.204518
+
+Adds ``agencies.version`` and ``agencies.modified``, bumped by every save
+that changes the rates of an agency. Existing agencies start at version 0,
+modified at the time of the upgrade.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e7a2c9d1b84"
+down_revision: Union[str, None] = "c41b7e93a5d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "agencies",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # SQLite cannot add a column defaulting to the current time
+    op.add_column("agencies", sa.Column("modified", sa.DateTime(timezone=True)))
+    op.execute(sa.text("UPDATE agencies SET modified = CURRENT_TIMESTAMP"))
+    with op.batch_alter_table("agencies") as batch_op:
+        batch_op.alter_column("modified", nullable=False, server_default=sa.func.now())
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("agencies") as batch_op:
+        batch_op.drop_column("modified")
+        batch_op.drop_column("version")
@@ -0,0 +1,221 @@
+"""timestamp dates
+
+Revision ID: c41b7e93a5d2
+Revises: 8f2d4a61c0e9
+Create Date: 2026-10-18 16:40:12.730114
+
+Converts ``rates.date`` from a string to ``timestamp with time zone``.
+
+On PostgreSQL the column is rebuilt online: a trigger keeps a shadow
+column in sync with new writes while existing rows are converted in
+batches of ``BATCH_SIZE`` committed one by one, the unique index is
+rebuilt concurrently, and only the final swap takes a short exclusive
+lock. Existing strings are read as naive UTC datetimes.
+
+Run with ``alembic -x partition=year upgrade head`` to also turn ``rates``
+into a table partitioned by year. Years without a partition of their own
+land in ``rates_default``. ``downgrade`` merges the partitions back into a
+plain table first, the partition key's type cannot be changed in place.
+"""
+
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41b7e93a5d2"
+down_revision: Union[str, None] = "8f2d4a61c0e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10_000
+COLUMNS = "id, currency_from, currency_to, rate, date, derived, agency_id"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        # SQLite stores datetimes as text, only the format has to change and
+        # a batch rebuild would CAST the text to a number. Lookups compare
+        # the text, so it has to be exactly what DateTime binds, microseconds
+        # included.
+        op.execute(
+            sa.text(
+                "UPDATE rates SET date = datetime(date) || '.' || CASE "
+                "WHEN substr(date, 20, 1) = '.' "
+                "THEN substr(substr(date, 21, 6) || '000000', 1, 6) "
+                "ELSE '000000' END"
+            )
+        )
+        return
+
+    op.add_column("rates", sa.Column("date_ts", sa.DateTime(timezone=True)))
+    op.execute(
+        sa.text(
+            """
+            CREATE FUNCTION rates_sync_date_ts() RETURNS trigger AS $$
+            BEGIN
+                NEW.date_ts := NEW.date::timestamp AT TIME ZONE 'UTC';
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+    )
+    op.execute(
+        sa.text(
+            "CREATE TRIGGER rates_sync_date_ts BEFORE INSERT OR UPDATE OF date "
+            "ON rates FOR EACH ROW EXECUTE FUNCTION rates_sync_date_ts()"
+        )
+    )
+    with op.get_context().autocommit_block():
+        _in_batches(
+            "UPDATE rates SET date_ts = date::timestamp AT TIME ZONE 'UTC' "
+            "WHERE id > :low AND id <= :high AND date_ts IS NULL"
+        )
+        op.execute(
+            sa.text(
+                "ALTER TABLE rates ADD CONSTRAINT rates_date_ts_check "
+                "CHECK (date_ts IS NOT NULL) NOT VALID"
+            )
+        )
+        op.execute(sa.text("ALTER TABLE rates VALIDATE CONSTRAINT rates_date_ts_check"))
+        op.create_index(
+            "rates_date_ts_idx",
+            "rates",
+            ["agency_id", "currency_to", "currency_from", "date_ts"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+
+    op.execute(sa.text("LOCK TABLE rates IN ACCESS EXCLUSIVE MODE"))
+    op.execute(sa.text("DROP TRIGGER rates_sync_date_ts ON rates"))
+    op.execute(sa.text("DROP FUNCTION rates_sync_date_ts()"))
+    op.drop_index("rates_agency_id_idx", table_name="rates")
+    op.drop_column("rates", "date")
+    op.alter_column("rates", "date_ts", new_column_name="date")
+    # the validated check lets SET NOT NULL skip the table scan
+    op.alter_column("rates", "date", nullable=False)
+    op.drop_constraint("rates_date_ts_check", "rates", type_="check")
+    op.execute(sa.text("ALTER INDEX rates_date_ts_idx RENAME TO rates_agency_id_idx"))
+
+    if context.get_x_argument(as_dictionary=True).get("partition") == "year":
+        _partition_by_year()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        op.execute(
+            sa.text("UPDATE rates SET date = strftime('%Y-%m-%dT%H:%M:%S', date)")
+        )
+        return
+    if _is_partitioned():
+        _merge_partitions()
+    op.alter_column(
+        "rates",
+        "date",
+        type_=sa.String(),
+        postgresql_using=(
+            "to_char(date AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS')"
+        ),
+    )
+
+
+def _in_batches(statement: str) -> int:
+    """Run ``statement`` for each id range of ``BATCH_SIZE``, return the last id."""
+    bind = op.get_bind()
+    stmt = sa.text("SELECT COALESCE(MAX(id), 0) FROM rates")
+    last: int = bind.execute(stmt).scalar_one()
+    for low in range(0, last, BATCH_SIZE):
+        bind.execute(sa.text(statement), {"low": low, "high": low + BATCH_SIZE})
+    return last
+
+
+def _is_partitioned() -> bool:
+    stmt = sa.text("SELECT relkind FROM pg_class WHERE oid = 'rates'::regclass")
+    return bool(op.get_bind().execute(stmt).scalar_one() == "p")
+
+
+def _merge_partitions() -> None:
+    """Undo ``_partition_by_year``, rows and ids are kept."""
+    op.execute(sa.text("LOCK TABLE rates IN EXCLUSIVE MODE"))
+    op.execute(sa.text("CREATE TABLE rates_plain (LIKE rates INCLUDING DEFAULTS)"))
+    op.execute(
+        sa.text(f"INSERT INTO rates_plain ({COLUMNS}) SELECT {COLUMNS} FROM rates")
+    )
+    op.execute(sa.text("ALTER SEQUENCE rates_id_seq OWNED BY rates_plain.id"))
+    # drops rates_default and the rates_<year> partitions with it
+    op.execute(sa.text("DROP TABLE rates"))
+    op.execute(sa.text("ALTER TABLE rates_plain RENAME TO rates"))
+    op.create_primary_key("rates_pkey", "rates", ["id"])
+    op.create_index(
+        "rates_agency_id_idx",
+        "rates",
+        ["agency_id", "currency_to", "currency_from", "date"],
+        unique=True,
+    )
+    op.create_foreign_key(
+        "rates_agency_id_fkey", "rates", "agencies", ["agency_id"], ["id"]
+    )
+
+
+def _partition_by_year() -> None:
+    bind = op.get_bind()
+    op.execute(
+        sa.text(
+            "CREATE TABLE rates_by_year (LIKE rates INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (date)"
+        )
+    )
+    first, last = bind.execute(
+        sa.text(
+            "SELECT COALESCE(EXTRACT(YEAR FROM MIN(date)), EXTRACT(YEAR FROM now())),"
+            " EXTRACT(YEAR FROM now()) + 1 FROM rates"
+        )
+    ).one()
+    for year in range(int(first), int(last) + 1):
+        op.execute(
+            sa.text(
+                f"CREATE TABLE rates_{year} PARTITION OF rates_by_year "
+                f"FOR VALUES FROM ('{year}-01-01 00:00:00+00') "
+                f"TO ('{year + 1}-01-01 00:00:00+00')"
+            )
+        )
+    op.execute(sa.text("CREATE TABLE rates_default PARTITION OF rates_by_year DEFAULT"))
+
+    with op.get_context().autocommit_block():
+        # copy while rates stays writable, rows written meanwhile follow below
+        copied = _in_batches(
+            f"INSERT INTO rates_by_year ({COLUMNS}) SELECT {COLUMNS} FROM rates "
+            f"WHERE id > :low AND id <= :high"
+        )
+
+    op.execute(sa.text("LOCK TABLE rates IN EXCLUSIVE MODE"))
+    bind.execute(
+        sa.text(
+            f"INSERT INTO rates_by_year ({COLUMNS}) SELECT {COLUMNS} FROM rates "
+            f"WHERE id > :copied"
+        ),
+        {"copied": copied},
+    )
+    op.execute(
+        sa.text(
+            "DELETE FROM rates_by_year p "
+            "WHERE NOT EXISTS (SELECT 1 FROM rates r WHERE r.id = p.id)"
+        )
+    )
+    op.execute(sa.text("ALTER SEQUENCE rates_id_seq OWNED BY rates_by_year.id"))
+    op.execute(sa.text("DROP TABLE rates"))
+    op.execute(sa.text("ALTER TABLE rates_by_year RENAME TO rates"))
+    # unique keys of a partitioned table have to include the partition key
+    op.create_primary_key("rates_pkey", "rates", ["id", "date"])
+    op.create_index(
+        "rates_agency_id_idx",
+        "rates",
+        ["agency_id", "currency_to", "currency_from", "date"],
+        unique=True,
+    )
+    op.create_foreign_key(
+        "rates_agency_id_fkey", "rates", "agencies", ["agency_id"], ["id"]
+    )
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+import typing
+
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool, QueuePool
+
+
+@dataclasses.dataclass(slots=True)
+class PoolMetrics:
+    """Counters of one engine's connection pool, for sizing it from data.
+
+    ``wait_seconds`` is the time spent getting a connection out of the pool,
+    including opening it when the pool grows. Waits are only measured on
+    the metered pools below.
+    """
+
+    checkouts: int = 0
+    checkins: int = 0
+    connects: int = 0
+    invalidations: int = 0
+    timeouts: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    peak_overflow: int = 0
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def observe(self, engine: Engine) -> PoolMetrics:
+        event.listen(engine, "connect", lambda *_: self._count("connects"))
+        event.listen(engine, "checkout", lambda *_: self._count("checkouts"))
+        event.listen(engine, "checkin", lambda *_: self._count("checkins"))
+        event.listen(engine, "invalidate", lambda *_: self._count("invalidations"))
+        event.listen(engine, "soft_invalidate", lambda *_: self._count("invalidations"))
+        if isinstance(engine.pool, MeteredQueuePool):
+            engine.pool.metrics = self
+        return self
+
+    def waited(self, seconds: float, overflow: int, timed_out: bool) -> None:
+        with self._lock:
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+            self.timeouts += timed_out
+
+    def snapshot(self, pool: Pool) -> dict[str, int | float]:
+        with self._lock:
+            counters = {
+                field.name: getattr(self, field.name)
+                for field in dataclasses.fields(self)
+                if not field.name.startswith("_")
+            }
+        if isinstance(pool, QueuePool):
+            counters |= {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+            }
+        return counters
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that reports checkout waits to its ``metrics``."""
+
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        if self.metrics is None:
+            return super()._do_get()
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.metrics.waited(waited, self.overflow(), timed_out)
+
+    def recreate(self) -> QueuePool:
+        # engine.dispose() swaps in a fresh pool, the counters carry over
+        pool = typing.cast(MeteredQueuePool, super().recreate())
+        pool.metrics = self.metrics
+        return pool
+
+
+class AsyncMeteredQueuePool(MeteredQueuePool, AsyncAdaptedQueuePool):
+    """MeteredQueuePool for engines created with ``create_async_engine``."""
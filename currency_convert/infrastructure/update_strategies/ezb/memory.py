@@ -7,3 +7,11 @@ class MemoryUpdateStrategy:
 
     def __call__(self) -> list[UnprocessedRate]:
         return self.rates
+
+
+class AsyncMemoryUpdateStrategy:
+    def __init__(self, rates: list[UnprocessedRate]) -> None:
+        self.rates: list[UnprocessedRate] = rates or []
+
+    async def __call__(self) -> list[UnprocessedRate]:
+        return self.rates
@@ -29,7 +29,20 @@ class RequestHandler(typing.Protocol):
     def get(self, url: str, **kwargs: typing.Any) -> ResponseLike: ...
 
 
-class EZBUpdateStrategy:
+class AsyncRequestHandler(typing.Protocol):
+    async def __aenter__(self) -> typing.Self: ...
+
+    async def __aexit__(
+        self,
+        exc_type: typing.Type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None: ...
+
+    async def get(self, url: str, **kwargs: typing.Any) -> ResponseLike: ...
+
+
+class EZBSeries:
     URL: typing.ClassVar[str] = "https://data-api.ecb.europa.eu/service"
     RECOURCE: typing.ClassVar[str] = "data"
     TYPE: typing.ClassVar[str] = "EXR"
@@ -38,24 +51,21 @@ class EZBUpdateStrategy:
 
     def __init__(
         self,
-        request_handler: RequestHandler,
         xml_parser: XmlParser,
         from_date: datetime.datetime | None = None,
     ) -> None:
-        self._request_handler = request_handler
         self._parser = xml_parser
         self._from_date = from_date or (
             datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(days=1)
         )
 
-    def __call__(self) -> list[UnprocessedRate]:
-        url = f"{self.URL}/{self.RECOURCE}/{self.TYPE}/{self.KEY}"
-        params = {"updatedAfter": self._from_date.isoformat()}
+    @property
+    def _url(self) -> str:
+        return f"{self.URL}/{self.RECOURCE}/{self.TYPE}/{self.KEY}"
 
-        with self._request_handler as session:
-            response = session.get(url, params=params).raise_for_status()
-            data = self._parser.parse(response.text)
-            return self._match_data(data)
+    @property
+    def _params(self) -> dict[str, str]:
+        return {"updatedAfter": self._from_date.isoformat()}
 
     def _match_data(self, data: dict[str, typing.Any]) -> list[UnprocessedRate]:
         match data:
@@ -103,3 +113,37 @@ class EZBUpdateStrategy:
                 )
             case _:
                 raise ValueError(self.ERR_MESSAGE % series)
+
+
+class EZBUpdateStrategy(EZBSeries):
+    def __init__(
+        self,
+        request_handler: RequestHandler,
+        xml_parser: XmlParser,
+        from_date: datetime.datetime | None = None,
+    ) -> None:
+        super().__init__(xml_parser, from_date)
+        self._request_handler = request_handler
+
+    def __call__(self) -> list[UnprocessedRate]:
+        with self._request_handler as session:
+            response = session.get(self._url, params=self._params).raise_for_status()
+            data = self._parser.parse(response.text)
+            return self._match_data(data)
+
+
+class AsyncEZBUpdateStrategy(EZBSeries):
+    def __init__(
+        self,
+        request_handler: AsyncRequestHandler,
+        xml_parser: XmlParser,
+        from_date: datetime.datetime | None = None,
+    ) -> None:
+        super().__init__(xml_parser, from_date)
+        self._request_handler = request_handler
+
+    async def __call__(self) -> list[UnprocessedRate]:
+        async with self._request_handler as session:
+            response = await session.get(self._url, params=self._params)
+            data = self._parser.parse(response.raise_for_status().text)
+            return self._match_data(data)
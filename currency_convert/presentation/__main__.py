@@ -1,8 +1,11 @@
-from fastapi import FastAPI
+from typing import Annotated
+
+from fastapi import Depends, FastAPI
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from currency_convert.presentation.config import get_app_settings
+from currency_convert.presentation.converter import dependencies
 from currency_convert.presentation.converter import router as converter
 
 settings, app_configs = get_app_settings()
@@ -26,8 +29,24 @@ app.add_middleware(
 
 
 @app.get("/healthcheck", include_in_schema=False)
-def healthcheck() -> dict[str, str]:
+async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics/pool", include_in_schema=False)
+async def pool_metrics(
+    metrics: Annotated[
+        dict[str, dict[str, int | float]], Depends(dependencies.get_pool_metrics)
+    ],
+) -> dict[str, dict[str, int | float]]:
+    return metrics
+
+
+@app.get("/metrics/cache", include_in_schema=False)
+async def cache_stats(
+    stats: Annotated[dict[str, int], Depends(dependencies.get_cache_stats)],
+) -> dict[str, int]:
+    return stats
+
+
 app.include_router(converter.router, prefix="/converter", tags=["converter"])
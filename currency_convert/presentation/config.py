@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import PostgresDsn, model_validator
 from pydantic_settings import BaseSettings
@@ -9,6 +9,11 @@ from currency_convert.presentation.constants import Environment
 
 class Config(BaseSettings):
     DATABASE_URL: PostgresDsn
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
 
     SITE_DOMAIN: str = "foo_bar.com"
 
@@ -22,6 +27,16 @@ class Config(BaseSettings):
 
     APP_VERSION: str = "1"
 
+    RATE_MATRIX: bool = False
+    GRAPH_HOP_COSTS: dict[str, float] = {}
+    CONSENSUS_METHOD: Literal["median", "trimmed_mean"] = "median"
+    CONSENSUS_TRIM: float = 0.2
+    GAP_FILL: dict[str, Literal["forward", "linear"]] = {}
+    AGENCY_CACHE_SIZE: int = 16
+    AGENCY_CACHE_TTL: float = 300.0
+    SHARED_RATES_DIR: str | None = None
+    RATES_MAX_AGE: int = 60
+
     @model_validator(mode="after")
     def validate_sentry_non_local(self) -> "Config":
         if self.ENVIRONMENT.is_deployed and not self.SENTRY_DSN:
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import logging
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request
+
+from currency_convert.application.agency.queries.fetch_version.query import (
+    FetchVersion,
+)
+from currency_convert.application.primitives.query import AsyncQueryHandler
+from currency_convert.domain.agency.entities.agency import AgencyNotFoundError
+from currency_convert.domain.agency.entities.interface import AgencyVersion
+from currency_convert.presentation.config import get_app_settings
+from currency_convert.presentation.converter.dependencies import (
+    get_version_query_handler,
+)
+from currency_convert.presentation.converter.validators import not_modified
+
+_logger = logging.getLogger(__name__)
+settings, _ = get_app_settings()
+
+
+async def conditional(
+    agency_name: str,
+    request: Request,
+    handler: Annotated[
+        AsyncQueryHandler[FetchVersion, AgencyVersion],
+        Depends(get_version_query_handler),
+    ],
+) -> dict[str, str]:
+    """Answer 304 from the agency version before the route loads any rates.
+
+    Returns the headers the route sends along with its body.
+    """
+    try:
+        version = await handler.execute(FetchVersion(agency_name))
+    except AgencyNotFoundError as exc:
+        _logger.exception(exc)
+        raise HTTPException(status_code=404, detail=str(exc))
+    return not_modified(version, request, settings.RATES_MAX_AGE)
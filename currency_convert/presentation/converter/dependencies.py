@@ -1,88 +1,227 @@
 from __future__ import annotations
 
-from typing import Annotated, Iterator
+import dataclasses
+from typing import Annotated, AsyncIterator
 
 import httpx
 import xmltodict
 from fastapi import Depends
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from currency_convert.application.agency.commands.create.handler import (
-    CreateAgencyHandler,
+    AsyncCreateAgencyHandler,
 )
 from currency_convert.application.agency.commands.update.handler import (
-    ByNameUpdateHandler,
+    AsyncByNameUpdateHandler,
+)
+from currency_convert.application.agency.queries.convert_batch.handler import (
+    AsyncConvertBatchHandler,
 )
 from currency_convert.application.agency.queries.fetch_all.handler import (
-    FetchAllHandler,
+    AsyncFetchAllHandler,
+    AsyncFetchHistoryHandler,
+)
+from currency_convert.application.agency.queries.fetch_consensus.handler import (
+    AsyncFetchConsensusHandler,
 )
 from currency_convert.application.agency.queries.fetch_one.handler import (
-    FetchOneHandler,
+    AsyncFetchOneHandler,
+)
+from currency_convert.application.agency.queries.fetch_path.handler import (
+    AsyncFetchPathHandler,
+)
+from currency_convert.application.agency.queries.fetch_version.handler import (
+    AsyncFetchVersionHandler,
 )
 from currency_convert.application.primitives.command import CommandHandler
 from currency_convert.domain.agency.entities.interface import (
-    AgencyRepository,
-    UpdateStrategy,
+    AsyncAgencyRepository,
+    AsyncUpdateStrategy,
+)
+from currency_convert.domain.agency.services.consensus import Consensus
+from currency_convert.domain.agency.services.graph import CurrencyGraph
+from currency_convert.infrastructure.agency.cache import (
+    AgencyCache,
+    AsyncCachedAgencyRepo,
+)
+from currency_convert.infrastructure.agency.export import RateExporter
+from currency_convert.infrastructure.agency.matrix import MatrixEngine
+from currency_convert.infrastructure.agency.repository import AsyncAgencyRepo
+from currency_convert.infrastructure.agency.shared import (
+    AsyncSharedRateRepo,
+    SharedRateStore,
+)
+from currency_convert.infrastructure.pool import (
+    AsyncMeteredQueuePool,
+    MeteredQueuePool,
+    PoolMetrics,
 )
-from currency_convert.infrastructure.agency.repository import AgencyRepo
 from currency_convert.infrastructure.update_strategies.ezb.real import (
-    EZBUpdateStrategy,
-    RequestHandler,
+    AsyncEZBUpdateStrategy,
+    AsyncRequestHandler,
     XmlParser,
 )
 from currency_convert.presentation.config import get_app_settings
 
 settings, _ = get_app_settings()
 
-engine = create_engine(str(settings.DATABASE_URL))
+pool_options = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+engine = create_engine(
+    str(settings.DATABASE_URL), poolclass=MeteredQueuePool, **pool_options
+)
+async_engine = create_async_engine(
+    make_url(str(settings.DATABASE_URL)).set(drivername="postgresql+asyncpg"),
+    poolclass=AsyncMeteredQueuePool,
+    **pool_options,
+)
+pool_metrics = {
+    "sync": PoolMetrics().observe(engine),
+    "async": PoolMetrics().observe(async_engine.sync_engine),
+}
+graph = CurrencyGraph(settings.GRAPH_HOP_COSTS)
+consensus = Consensus(settings.CONSENSUS_METHOD, settings.CONSENSUS_TRIM)
+agency_cache = (
+    AgencyCache(settings.AGENCY_CACHE_SIZE, settings.AGENCY_CACHE_TTL)
+    if settings.AGENCY_CACHE_SIZE > 0
+    else None
+)
+shared_rates = (
+    SharedRateStore(settings.SHARED_RATES_DIR) if settings.SHARED_RATES_DIR else None
+)
 
 
-def get_db() -> Iterator[Session]:
-    with Session(engine) as session:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSession(async_engine) as session:
         yield session
 
 
 def get_agency_repository(
-    session: Annotated[Session, Depends(get_db)],
-) -> AgencyRepository:
-    return AgencyRepo(session)
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> AsyncAgencyRepository:
+    return _repository(session, read_only=True)
+
+
+def get_command_repository(
+    session: Annotated[AsyncSession, Depends(get_db)],
+) -> AsyncAgencyRepository:
+    return _repository(session, read_only=False)
+
+
+def _repository(session: AsyncSession, read_only: bool) -> AsyncAgencyRepository:
+    repo: AsyncAgencyRepository = AsyncAgencyRepo(
+        session, MatrixEngine if settings.RATE_MATRIX else None
+    )
+    if agency_cache is not None:
+        # the matrix only pays off for agencies that stay in the cache
+        repo = AsyncCachedAgencyRepo(
+            repo, agency_cache, read_only, load_on_miss=settings.RATE_MATRIX
+        )
+    if shared_rates is not None and read_only:
+        # commands change the agency they load, publishing it would be wasted
+        repo = AsyncSharedRateRepo(repo, shared_rates)
+    return repo
 
 
 def get_creation_handler(
-    repo: Annotated[AgencyRepository, Depends(get_agency_repository)],
-) -> CreateAgencyHandler:
-    return CreateAgencyHandler(repo)
+    repo: Annotated[AsyncAgencyRepository, Depends(get_command_repository)],
+) -> AsyncCreateAgencyHandler:
+    return AsyncCreateAgencyHandler(repo)
+
+
+def get_currency_graph() -> CurrencyGraph:
+    return graph
+
+
+def get_consensus() -> Consensus:
+    return consensus
 
 
 def get_update_handler_by_name(
-    repo: Annotated[AgencyRepository, Depends(get_agency_repository)],
-) -> ByNameUpdateHandler:
-    return ByNameUpdateHandler(repo)
+    repo: Annotated[AsyncAgencyRepository, Depends(get_command_repository)],
+    graph: Annotated[CurrencyGraph, Depends(get_currency_graph)],
+    consensus: Annotated[Consensus, Depends(get_consensus)],
+) -> AsyncByNameUpdateHandler:
+    return AsyncByNameUpdateHandler(repo, (graph, consensus), settings.GAP_FILL)
 
 
 def get_one_query_handler(
-    repo: Annotated[AgencyRepository, Depends(get_agency_repository)],
-) -> FetchOneHandler:
-    return FetchOneHandler(repo)
+    repo: Annotated[AsyncAgencyRepository, Depends(get_agency_repository)],
+) -> AsyncFetchOneHandler:
+    return AsyncFetchOneHandler(repo)
 
 
 def get_all_query_handler(
-    repo: Annotated[AgencyRepository, Depends(get_agency_repository)],
-) -> FetchAllHandler:
-    return FetchAllHandler(repo)
+    repo: Annotated[AsyncAgencyRepository, Depends(get_agency_repository)],
+) -> AsyncFetchAllHandler:
+    return AsyncFetchAllHandler(repo)
+
+
+def get_version_query_handler(
+    repo: Annotated[AsyncAgencyRepository, Depends(get_agency_repository)],
+) -> AsyncFetchVersionHandler:
+    return AsyncFetchVersionHandler(repo)
+
+
+def get_path_query_handler(
+    repo: Annotated[AsyncAgencyRepository, Depends(get_agency_repository)],
+    graph: Annotated[CurrencyGraph, Depends(get_currency_graph)],
+) -> AsyncFetchPathHandler:
+    return AsyncFetchPathHandler(repo, graph)
+
+
+def get_consensus_query_handler(
+    repo: Annotated[AsyncAgencyRepository, Depends(get_agency_repository)],
+    consensus: Annotated[Consensus, Depends(get_consensus)],
+) -> AsyncFetchConsensusHandler:
+    return AsyncFetchConsensusHandler(repo, consensus)
+
+
+def get_history_query_handler(
+    repo: Annotated[AsyncAgencyRepository, Depends(get_agency_repository)],
+) -> AsyncFetchHistoryHandler:
+    return AsyncFetchHistoryHandler(repo)
+
+
+def get_batch_query_handler(
+    repo: Annotated[AsyncAgencyRepository, Depends(get_agency_repository)],
+) -> AsyncConvertBatchHandler:
+    return AsyncConvertBatchHandler(repo)
+
+
+def get_pool_metrics() -> dict[str, dict[str, int | float]]:
+    return {
+        "sync": pool_metrics["sync"].snapshot(engine.pool),
+        "async": pool_metrics["async"].snapshot(async_engine.sync_engine.pool),
+    }
+
+
+def get_cache_stats() -> dict[str, int]:
+    if agency_cache is None:
+        return {}
+    return dataclasses.asdict(agency_cache.stats)
+
+
+def get_rate_exporter() -> RateExporter:
+    return RateExporter(engine)
 
 
 def get_xml_parser() -> XmlParser:
     return xmltodict  # type: ignore [return-value]
 
 
-def get_request_handler() -> RequestHandler:
-    return httpx.Client()  # type: ignore [return-value]
+def get_request_handler() -> AsyncRequestHandler:
+    return httpx.AsyncClient()  # type: ignore [return-value]
 
 
 def get_agency_update_strategy(
-    handler: Annotated[RequestHandler, Depends(get_request_handler)],
+    handler: Annotated[AsyncRequestHandler, Depends(get_request_handler)],
     parser: Annotated[XmlParser, Depends(get_xml_parser)],
-) -> UpdateStrategy:
-    return EZBUpdateStrategy(handler, parser)
+) -> AsyncUpdateStrategy:
+    return AsyncEZBUpdateStrategy(handler, parser)
@@ -1,30 +1,56 @@
 import datetime
 import logging
-from dataclasses import asdict
-from typing import Annotated, Callable, Literal
+from typing import Annotated, AsyncIterator, Callable, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from currency_convert.application.agency.commands.create.command import CreateAgency
-from currency_convert.application.agency.commands.update.command import UpdateByName
-from currency_convert.application.agency.queries.fetch_all.command import FetchAll
+from currency_convert.application.agency.commands.update.command import (
+    AsyncUpdateByName,
+)
+from currency_convert.application.agency.queries.convert_batch.query import (
+    Conversion,
+    ConvertBatch,
+)
+from currency_convert.application.agency.queries.fetch_all.command import (
+    FetchAll,
+    FetchHistory,
+)
+from currency_convert.application.agency.queries.fetch_consensus.query import (
+    FetchConsensus,
+)
 from currency_convert.application.agency.queries.fetch_one.query import FetchOne
-from currency_convert.application.primitives.command import CommandHandler
-from currency_convert.application.primitives.query import QueryHandler
+from currency_convert.application.agency.queries.fetch_path.query import FetchPath
+from currency_convert.application.primitives.command import AsyncCommandHandler
+from currency_convert.application.primitives.query import AsyncQueryHandler
 from currency_convert.domain.agency import valueobjects
 from currency_convert.domain.agency.entities.agency import (
     AgencyNotFoundError,
     DuplicateAgencyError,
+    RateNotFoundError,
+)
+from currency_convert.domain.agency.entities.interface import (
+    AsyncUpdateStrategy,
+    RateFilter,
 )
-from currency_convert.domain.agency.entities.interface import UpdateStrategy
+from currency_convert.domain.agency.services.graph import Path
 from currency_convert.domain.agency.valueobjects.currency import InvalidCurrencyError
 from currency_convert.domain.primitives.valueobject import ValueObjectError
-from currency_convert.presentation.converter import schemas
+from currency_convert.infrastructure.agency.export import ExportFormat, RateExporter
+from currency_convert.presentation.converter import schemas, serializers
+from currency_convert.presentation.converter.conditional import conditional
 from currency_convert.presentation.converter.dependencies import (
     get_agency_update_strategy,
     get_all_query_handler,
+    get_batch_query_handler,
+    get_consensus_query_handler,
     get_creation_handler,
+    get_history_query_handler,
     get_one_query_handler,
+    get_path_query_handler,
+    get_rate_exporter,
     get_update_handler_by_name,
 )
 
@@ -33,18 +59,18 @@ router = APIRouter()
 
 
 @router.post("/{agency_name}/create", status_code=201)
-def api_create_agency(
+async def api_create_agency(
     agency_name: str,
     base: str,
     url: str,
     country: str,
     handler: Annotated[
-        CommandHandler[CreateAgency, schemas.Agency], Depends(get_creation_handler)
+        AsyncCommandHandler[CreateAgency, schemas.Agency], Depends(get_creation_handler)
     ],
 ) -> schemas.Product[schemas.Agency]:
     cmd = CreateAgency(agency_name, base, url, country)
     try:
-        result = handler.execute(cmd)
+        result = await handler.execute(cmd)
     except DuplicateAgencyError as exc:
         _logger.exception(exc)
         raise HTTPException(status_code=409, detail=str(exc))
@@ -59,16 +85,17 @@ def api_create_agency(
 
 
 @router.put("/{agency_name}/update", status_code=200)
-def api_update(
+async def api_update(
     agency_name: str,
-    strategy: Annotated[UpdateStrategy, Depends(get_agency_update_strategy)],
+    strategy: Annotated[AsyncUpdateStrategy, Depends(get_agency_update_strategy)],
     handler: Annotated[
-        CommandHandler[UpdateByName, None], Depends(get_update_handler_by_name)
+        AsyncCommandHandler[AsyncUpdateByName, None],
+        Depends(get_update_handler_by_name),
     ],
 ) -> Literal[200]:
-    cmd = UpdateByName(strategy, agency_name)
+    cmd = AsyncUpdateByName(strategy, agency_name)
     try:
-        handler.execute(cmd)
+        await handler.execute(cmd)
     except AgencyNotFoundError as exc:
         _logger.exception(exc)
         raise HTTPException(status_code=404, detail=str(exc))
@@ -82,29 +109,84 @@ def api_update(
         return 200
 
 
-@router.get("/{agency_name}/rates", response_model=schemas.Products[schemas.Rate])
-def api_get_rates(
+@router.get("/graph/rate", response_model=schemas.Product[schemas.Path])
+async def api_get_path(
+    currency_from: str,
+    currency_to: str,
+    handler: Annotated[
+        AsyncQueryHandler[FetchPath, Path],
+        Depends(get_path_query_handler),
+    ],
+    dt: datetime.datetime | None = None,
+) -> schemas.Product[schemas.Path]:
+    cmd = FetchPath(currency_from=currency_from, currency_to=currency_to, dt=dt)
+    try:
+        path = await handler.execute(cmd)
+    except RateNotFoundError as exc:
+        _logger.exception(exc)
+        raise HTTPException(status_code=404, detail=str(exc))
+    except Exception as e:
+        _logger.critical("Unreachable code path.")
+        raise HTTPException(status_code=500, detail="Internal server error.") from e
+    else:
+        return schemas.Product(data=schemas.Path.model_validate(path))
+
+
+@router.get("/consensus/rate", response_model=schemas.Product[schemas.Rate])
+async def api_get_consensus(
+    currency_from: str,
+    currency_to: str,
+    handler: Annotated[
+        AsyncQueryHandler[FetchConsensus, valueobjects.Rate],
+        Depends(get_consensus_query_handler),
+    ],
+    dt: datetime.datetime | None = None,
+) -> schemas.Product[schemas.Rate]:
+    cmd = FetchConsensus(currency_from=currency_from, currency_to=currency_to, dt=dt)
+    try:
+        rate = await handler.execute(cmd)
+    except RateNotFoundError as exc:
+        _logger.exception(exc)
+        raise HTTPException(status_code=404, detail=str(exc))
+    except Exception as e:
+        _logger.critical("Unreachable code path.")
+        raise HTTPException(status_code=500, detail="Internal server error.") from e
+    else:
+        return schemas.Product(data=schemas.Rate.model_validate(rate))
+
+
+@router.get(
+    "/{agency_name}/rates",
+    response_model=schemas.Products[schemas.Rate],
+    response_class=serializers.TrustedJSONResponse,
+)
+async def api_get_rates(
     agency_name: str,
+    headers: Annotated[dict[str, str], Depends(conditional)],
     handler: Annotated[
-        QueryHandler[FetchAll, tuple[valueobjects.Rate, ...]],
+        AsyncQueryHandler[FetchAll, tuple[valueobjects.Rate, ...]],
         Depends(get_all_query_handler),
     ],
     currency_from: str | None = None,
     currency_to: str | None = None,
     dt: datetime.datetime | None = None,
-) -> schemas.Products[schemas.Rate]:
-    def predicate(rate: valueobjects.Rate) -> bool:
-        if currency_from and rate.currency_from != currency_from:
-            return False
-        if currency_to and rate.currency_to != currency_to:
-            return False
-        if dt and rate.dt != dt:
-            return False
-        return True
-
-    cmd = FetchAll(agency_name=agency_name, predicate=predicate)
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    limit: Annotated[int | None, Query(gt=0)] = None,
+    order: Literal["asc", "desc"] = "desc",
+) -> serializers.TrustedJSONResponse:
+    spec = RateFilter(
+        currency_from=currency_from,
+        currency_to=currency_to,
+        dt=dt,
+        start=start,
+        end=end,
+        limit=limit,
+        order=order,
+    )
+    cmd = FetchAll(agency_name=agency_name, filter=spec)
     try:
-        rates = handler.execute(cmd)
+        rates = await handler.execute(cmd)
     except AgencyNotFoundError as exc:
         _logger.exception(exc)
         raise HTTPException(status_code=404, detail=str(exc))
@@ -112,33 +194,148 @@ def api_get_rates(
         _logger.critical("Unreachable code path.")
         raise HTTPException(status_code=500, detail="Internal server error.") from e
     else:
-        return schemas.Products(data=[schemas.Rate(**asdict(rate)) for rate in rates])
+        return serializers.TrustedJSONResponse(
+            serializers.products_json(rates), headers=headers
+        )
 
 
-@router.get("/{agency_name}/rate", response_model=schemas.Product[schemas.Rate])
-def api_get_rate(
+@router.get("/{agency_name}/rates/history", response_class=StreamingResponse)
+async def api_get_history(
+    agency_name: str,
+    handler: Annotated[
+        AsyncQueryHandler[FetchHistory, AsyncIterator[valueobjects.Rate]],
+        Depends(get_history_query_handler),
+    ],
+    currency_from: str | None = None,
+    currency_to: str | None = None,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    format: Literal["ndjson", "csv"] = "ndjson",
+) -> StreamingResponse:
+    cmd = FetchHistory(
+        agency_name=agency_name,
+        currency_from=currency_from,
+        currency_to=currency_to,
+        start=start,
+        end=end,
+    )
+    try:
+        rates = await handler.execute(cmd)
+    except AgencyNotFoundError as exc:
+        _logger.exception(exc)
+        raise HTTPException(status_code=404, detail=str(exc))
+    except Exception as e:
+        _logger.critical("Unreachable code path.")
+        raise HTTPException(status_code=500, detail="Internal server error.") from e
+    else:
+        if format == "csv":
+            return StreamingResponse(
+                serializers.csv_lines(rates), media_type="text/csv"
+            )
+        return StreamingResponse(
+            serializers.ndjson_lines(rates), media_type="application/x-ndjson"
+        )
+
+
+@router.get("/{agency_name}/rates/export", response_class=StreamingResponse)
+async def api_export_rates(
+    agency_name: str,
+    exporter: Annotated[RateExporter, Depends(get_rate_exporter)],
+    format: ExportFormat = "arrow",
+) -> StreamingResponse:
+    try:
+        chunks = await run_in_threadpool(exporter.stream, agency_name, format)
+    except AgencyNotFoundError as exc:
+        _logger.exception(exc)
+        raise HTTPException(status_code=404, detail=str(exc))
+    except Exception as e:
+        _logger.critical("Unreachable code path.")
+        raise HTTPException(status_code=500, detail="Internal server error.") from e
+    else:
+        media_type, suffix = serializers.EXPORT_MEDIA_TYPES[format]
+        return StreamingResponse(
+            chunks,
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f'attachment; filename="{agency_name}{suffix}"'
+            },
+        )
+
+
+@router.get(
+    "/{agency_name}/rate",
+    response_model=schemas.Product[schemas.Rate],
+    response_class=serializers.TrustedJSONResponse,
+)
+async def api_get_rate(
     agency_name: str,
     currency_from: str,
     currency_to: str,
+    headers: Annotated[dict[str, str], Depends(conditional)],
     handler: Annotated[
-        QueryHandler[FetchOne, valueobjects.Rate],
+        AsyncQueryHandler[FetchOne, valueobjects.Rate],
         Depends(get_one_query_handler),
     ],
     dt: datetime.datetime | None = None,
-) -> schemas.Product[schemas.Rate]:
+    as_of: bool = False,
+    max_staleness: datetime.timedelta | None = None,
+) -> serializers.TrustedJSONResponse:
     cmd = FetchOne(
         agency_name=agency_name,
         currency_from=currency_from,
         currency_to=currency_to,
         dt=dt,
+        as_of=as_of,
+        max_staleness=max_staleness,
+    )
+    try:
+        rate = await handler.execute(cmd)
+    except (AgencyNotFoundError, RateNotFoundError) as exc:
+        _logger.exception(exc)
+        raise HTTPException(status_code=404, detail=str(exc))
+    except Exception as e:
+        _logger.critical("Unreachable code path.")
+        raise HTTPException(status_code=500, detail="Internal server error.") from e
+    else:
+        return serializers.TrustedJSONResponse(
+            serializers.product_json(rate), headers=headers
+        )
+
+
+@router.post(
+    "/{agency_name}/convert/batch",
+    response_model=schemas.Products[schemas.Money | None],
+)
+async def api_convert_batch(
+    agency_name: str,
+    conversions: list[schemas.Conversion],
+    handler: Annotated[
+        AsyncQueryHandler[ConvertBatch, tuple[valueobjects.Money | None, ...]],
+        Depends(get_batch_query_handler),
+    ],
+) -> schemas.Products[schemas.Money | None]:
+    cmd = ConvertBatch(
+        agency_name=agency_name,
+        conversions=tuple(
+            Conversion(c.currency_from, c.currency_to, str(c.amount), c.dt)
+            for c in conversions
+        ),
     )
     try:
-        rate = handler.execute(cmd)
+        converted = await handler.execute(cmd)
     except AgencyNotFoundError as exc:
         _logger.exception(exc)
         raise HTTPException(status_code=404, detail=str(exc))
+    except ValueObjectError as exc:
+        _logger.exception(exc)
+        raise HTTPException(status_code=400, detail=str(exc))
     except Exception as e:
         _logger.critical("Unreachable code path.")
         raise HTTPException(status_code=500, detail="Internal server error.") from e
     else:
-        return schemas.Product(data=schemas.Rate(**asdict(rate)))
+        return schemas.Products(
+            data=[
+                None if money is None else schemas.Money.model_validate(money)
+                for money in converted
+            ]
+        )
@@ -3,24 +3,52 @@ import decimal
 import uuid
 from typing import Any, Generic, TypeVar
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 T = TypeVar("T")
 
 
 class Currency(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     code: str = Field(max_length=3, min_length=3)
 
 
 class Money(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     amount: decimal.Decimal = Field(gt=0)
 
 
 class Rate(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     currency_from: Currency
     currency_to: Currency
     rate: Money
     dt: datetime.datetime
+    derived: bool = False
+
+
+class Hop(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    agency: str
+    rate: Rate
+
+
+class Path(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    rate: Rate
+    hops: list[Hop]
+
+
+class Conversion(BaseModel):
+    currency_from: str = Field(max_length=3, min_length=3)
+    currency_to: str = Field(max_length=3, min_length=3)
+    amount: decimal.Decimal = Field(gt=0)
+    dt: datetime.datetime | None = None
 
 
 class Agency(BaseModel):
@@ -0,0 +1,74 @@
+import datetime
+import functools
+import json
+from typing import AsyncIterable, AsyncIterator, Sequence
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+
+from currency_convert.domain.agency import valueobjects
+
+CSV_HEADER = "currency_from,currency_to,rate,dt,derived\n"
+EXPORT_MEDIA_TYPES = {
+    "arrow": ("application/vnd.apache.arrow.file", ".arrow"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+
+_DATETIME = TypeAdapter(datetime.datetime)
+
+
+class TrustedJSONResponse(Response):
+    """Response for JSON bodies already encoded by the functions below."""
+
+    media_type = "application/json"
+
+
+def rate_json(rate: valueobjects.Rate) -> str:
+    """Encode ``rate`` exactly as ``schemas.Rate`` would, without validating it.
+
+    Domain rates already hold the invariants the schema checks.
+    """
+    return (
+        f'{{"currency_from":{_currency_json(rate.currency_from.code)},'
+        f'"currency_to":{_currency_json(rate.currency_to.code)},'
+        f'"rate":{{"amount":"{rate.rate.amount}"}},'
+        f'"dt":"{_datetime_json(rate.dt)}",'
+        f'"derived":{"true" if rate.derived else "false"}}}'
+    )
+
+
+def product_json(rate: valueobjects.Rate) -> bytes:
+    return f'{{"data":{rate_json(rate)}}}'.encode()
+
+
+def products_json(rates: Sequence[valueobjects.Rate]) -> bytes:
+    data = ",".join(map(rate_json, rates))
+    return f'{{"data":[{data}],"count":{len(rates)}}}'.encode()
+
+
+@functools.cache
+def _currency_json(code: str) -> str:
+    return json.dumps({"code": code}, ensure_ascii=False, separators=(",", ":"))
+
+
+def _datetime_json(dt: datetime.datetime) -> str:
+    if dt.tzinfo is None:
+        return dt.isoformat()
+    # pydantic writes UTC as "Z" and drops the seconds of other offsets
+    encoded: str = _DATETIME.dump_python(dt, mode="json")
+    return encoded
+
+
+async def ndjson_lines(rates: AsyncIterable[valueobjects.Rate]) -> AsyncIterator[str]:
+    async for rate in rates:
+        yield rate_json(rate) + "\n"
+
+
+async def csv_lines(rates: AsyncIterable[valueobjects.Rate]) -> AsyncIterator[str]:
+    yield CSV_HEADER
+    async for rate in rates:
+        yield (
+            f"{rate.currency_from.code},{rate.currency_to.code},"
+            f"{rate.rate.amount},{rate.dt.isoformat()},{str(rate.derived).lower()}\n"
+        )
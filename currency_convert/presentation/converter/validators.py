@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import HTTPException, Request
+
+from currency_convert.domain.agency.entities.interface import AgencyVersion
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Validators:
+    etag: str
+    last_modified: datetime.datetime
+
+    @classmethod
+    def of(cls, version: AgencyVersion, request: Request) -> Validators:
+        # one version of an agency has one body per path and query string
+        digest = hashlib.blake2b(digest_size=8)
+        for part in (version.modified.isoformat(), request.url.path, request.url.query):
+            digest.update(part.encode() + b"\0")
+        modified = version.modified.replace(tzinfo=datetime.UTC, microsecond=0)
+        return cls(f'"{version.version}-{digest.hexdigest()}"', modified)
+
+    def headers(self, max_age: int) -> dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            "Cache-Control": f"public, max-age={max_age}",
+        }
+
+    def fresh(self, request: Request) -> bool:
+        """Whether the client's copy is current, If-None-Match taking precedence."""
+        if (if_none_match := request.headers.get("if-none-match")) is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag in tags
+        if (if_modified_since := request.headers.get("if-modified-since")) is None:
+            return False
+        try:
+            return self.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+
+def not_modified(
+    version: AgencyVersion, request: Request, max_age: int
+) -> dict[str, str]:
+    """Raise 304 if the client's copy is of ``version``, else return the headers.
+
+    ``version`` has to be read before the body. The repositories only serve
+    rates of the version they read themselves, which is the same or newer,
+    so a body is never older than its validators: a client may be sent a
+    200 once too often but never a 304 for rates it does not have.
+    """
+    validators = Validators.of(version, request)
+    headers = validators.headers(max_age)
+    if validators.fresh(request):
+        raise HTTPException(status_code=304, headers=headers)
+    return headers
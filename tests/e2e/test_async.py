@@ -0,0 +1,173 @@
+import datetime
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from currency_convert.application.agency.commands.create.command import CreateAgency
+from currency_convert.application.agency.commands.create.handler import (
+    AsyncCreateAgencyHandler,
+)
+from currency_convert.application.agency.commands.update.command import (
+    AsyncUpdateByName,
+)
+from currency_convert.application.agency.commands.update.handler import (
+    AsyncByNameUpdateHandler,
+)
+from currency_convert.application.agency.queries.convert_batch.handler import (
+    AsyncConvertBatchHandler,
+)
+from currency_convert.application.agency.queries.convert_batch.query import (
+    Conversion,
+    ConvertBatch,
+)
+from currency_convert.application.agency.queries.fetch_all.command import (
+    FetchAll,
+    FetchHistory,
+)
+from currency_convert.application.agency.queries.fetch_all.handler import (
+    AsyncFetchAllHandler,
+    AsyncFetchHistoryHandler,
+)
+from currency_convert.application.agency.queries.fetch_one.handler import (
+    AsyncFetchOneHandler,
+)
+from currency_convert.application.agency.queries.fetch_one.query import FetchOne
+from currency_convert.domain.agency.entities.agency import (
+    AgencyNotFoundError,
+    DuplicateAgencyError,
+)
+from currency_convert.domain.agency.entities.interface import (
+    RateFilter,
+    UnprocessedRate,
+)
+from currency_convert.domain.agency.valueobjects.money import Money
+from currency_convert.infrastructure.agency.cache import (
+    AgencyCache,
+    AsyncCachedAgencyRepo,
+)
+from currency_convert.infrastructure.agency.dto import Base
+from currency_convert.infrastructure.agency.repository import AsyncAgencyRepo
+from currency_convert.infrastructure.update_strategies.ezb.memory import (
+    AsyncMemoryUpdateStrategy,
+)
+from tests.data import INSERTS
+
+pytestmark = pytest.mark.anyio
+
+EZB = CreateAgency("EZB", "EUR", "https://test.com", "Test Country")
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def AsyncRepository(tmp_path: Path) -> AsyncIterator[AsyncAgencyRepo]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'rates.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        repo = AsyncAgencyRepo(session)
+        await AsyncCreateAgencyHandler(repo).execute(EZB)
+        strategy = AsyncMemoryUpdateStrategy(INSERTS)
+        await AsyncByNameUpdateHandler(repo).execute(AsyncUpdateByName(strategy, "EZB"))
+        yield repo
+    await engine.dispose()
+
+
+async def test_async_update_should_store_fetched_rates(
+    AsyncRepository: AsyncAgencyRepo,
+) -> None:
+    agency = await AsyncRepository.find_by_name("EZB")
+
+    assert len(agency.rates) == len(INSERTS)
+
+
+async def test_async_create_when_name_taken_should_raise_duplicate_agency_error(
+    AsyncRepository: AsyncAgencyRepo,
+) -> None:
+    with pytest.raises(DuplicateAgencyError):
+        await AsyncCreateAgencyHandler(AsyncRepository).execute(EZB)
+
+
+async def test_async_query_one_should_return_cross_rate(
+    AsyncRepository: AsyncAgencyRepo,
+) -> None:
+    query = FetchOne("EZB", "USD", "GBP", datetime.datetime(2021, 1, 2), as_of=True)
+
+    rate = await AsyncFetchOneHandler(AsyncRepository).execute(query)
+
+    assert (rate.currency_from, rate.currency_to) == ("USD", "GBP")
+
+
+async def test_async_query_all_should_apply_filter(
+    AsyncRepository: AsyncAgencyRepo,
+) -> None:
+    query = FetchAll("EZB", RateFilter(order="asc", limit=2))
+
+    rates = await AsyncFetchAllHandler(AsyncRepository).execute(query)
+
+    assert [rate.currency_to for rate in rates] == ["USD", "GBP"]
+
+
+async def test_async_query_history_should_stream_rates_oldest_first(
+    AsyncRepository: AsyncAgencyRepo,
+) -> None:
+    rates = await AsyncFetchHistoryHandler(AsyncRepository).execute(FetchHistory("EZB"))
+
+    assert [rate.currency_to async for rate in rates] == ["USD", "GBP", "RUB"]
+
+
+async def test_async_query_history_when_agency_missing_should_raise_before_stream(
+    AsyncRepository: AsyncAgencyRepo,
+) -> None:
+    with pytest.raises(AgencyNotFoundError):
+        await AsyncFetchHistoryHandler(AsyncRepository).execute(FetchHistory("FED"))
+
+
+async def test_async_convert_batch_should_convert_amounts(
+    AsyncRepository: AsyncAgencyRepo,
+) -> None:
+    dt = datetime.datetime(2021, 1, 1)
+    query = ConvertBatch("EZB", (Conversion("EUR", "USD", "10", dt),))
+
+    converted = await AsyncConvertBatchHandler(AsyncRepository).execute(query)
+
+    assert converted == (Money.from_str("11"),)
+
+
+async def test_async_cached_repo_should_invalidate_on_save(
+    AsyncRepository: AsyncAgencyRepo,
+) -> None:
+    cache = AgencyCache()
+    reader = AsyncCachedAgencyRepo(AsyncRepository, cache)
+    writer = AsyncCachedAgencyRepo(AsyncRepository, cache, read_only=False)
+    cached = await reader.find_by_name("EZB")
+    assert await reader.find_by_name("EZB") is cached
+
+    agency = await writer.find_by_name("EZB")
+    agency.add_rate("EUR", "CHF", "0.95", "2021-01-04T00:00:00")
+    await writer.save(agency)
+
+    assert await reader.find_rate("EZB", "EUR", "CHF") == agency.get_rate("EUR", "CHF")
+    assert (cache.stats.hits, cache.stats.invalidations) == (1, 1)
+
+
+async def test_async_update_should_fetch_before_loading_agency(
+    AsyncRepository: AsyncAgencyRepo,
+) -> None:
+    in_transaction: list[bool] = []
+    fetch = AsyncMemoryUpdateStrategy(INSERTS)
+
+    async def strategy() -> list[UnprocessedRate]:
+        in_transaction.append(AsyncRepository.session.in_transaction())
+        return await fetch()
+
+    await AsyncByNameUpdateHandler(AsyncRepository).execute(
+        AsyncUpdateByName(strategy, "EZB")
+    )
+
+    assert in_transaction == [False]
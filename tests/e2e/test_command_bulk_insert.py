@@ -0,0 +1,48 @@
+import datetime
+
+import pytest
+
+from currency_convert.domain.agency.valueobjects.rate import Rate
+from currency_convert.infrastructure.agency.repository import AgencyRepo
+from tests.data import INSERTS
+
+
+def _rates(days: int) -> list[Rate]:
+    start = datetime.datetime(2020, 1, 1)
+    return [
+        Rate.create("EUR", "USD", "1.1", start + datetime.timedelta(days=day))
+        for day in range(days)
+    ]
+
+
+@pytest.mark.parametrize(
+    "chunk_size",
+    [1000, 7],
+    ids=[
+        "bulk_insert_when_single_batch_should_write_all_rates",
+        "bulk_insert_when_several_batches_should_write_all_rates",
+    ],
+)
+def test_bulk_insert(MemoryAgencyRepository: AgencyRepo, chunk_size: int) -> None:
+    MemoryAgencyRepository.CHUNK_SIZE = chunk_size
+    agency = MemoryAgencyRepository.find_by_name("EZB")
+
+    result = MemoryAgencyRepository.bulk_insert(agency, _rates(30))
+
+    assert result.rows == 30
+    assert result.rows_per_second > 0
+    in_db = MemoryAgencyRepository.find_by_name("EZB")
+    assert len(in_db.rates) == len(INSERTS) + 30
+
+
+def test_bulk_insert_when_rates_stored_should_skip_them(
+    MemoryAgencyRepository: AgencyRepo,
+) -> None:
+    agency = MemoryAgencyRepository.find_by_name("EZB")
+    MemoryAgencyRepository.bulk_insert(agency, _rates(10))
+
+    result = MemoryAgencyRepository.bulk_insert(agency, _rates(20))
+
+    assert result.rows == 10
+    in_db = MemoryAgencyRepository.find_by_name("EZB")
+    assert len(in_db.rates) == len(INSERTS) + 20
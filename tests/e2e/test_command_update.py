@@ -1,3 +1,5 @@
+import datetime
+
 from currency_convert.application.agency.commands.update.command import (
     UpdateById,
     UpdateByName,
@@ -8,8 +10,15 @@ from currency_convert.application.agency.commands.update.handler import (
 )
 from currency_convert.domain.agency.entities.interface import (
     AgencyRepository,
+    UnprocessedRate,
     UpdateStrategy,
 )
+from currency_convert.domain.agency.services.consensus import Consensus
+from currency_convert.domain.agency.valueobjects.money import Money
+from currency_convert.infrastructure.agency.repository import AgencyRepo
+from currency_convert.infrastructure.update_strategies.ezb.memory import (
+    MemoryUpdateStrategy,
+)
 
 
 def test_update_command_by_name(
@@ -36,3 +45,100 @@ def test_update_command_by_id(
 
     in_db = EmptyAgencyRepository.find_by_name("EZB")
     assert len(in_db.rates) == 3
+
+
+def test_update_command_should_notify_observers(
+    MemoryStrategy: UpdateStrategy, EmptyAgencyRepository: AgencyRepository
+) -> None:
+    consensus = Consensus()
+    consensus.load(EmptyAgencyRepository.find_all())
+    cmd = UpdateByName(MemoryStrategy, "EZB")
+    handler = ByNameUpdateHandler(EmptyAgencyRepository, (consensus,))
+
+    handler.execute(cmd)
+
+    assert consensus.get_rate("EUR", "USD").rate == Money.from_str("1.1")
+
+
+def test_update_command_when_gap_fill_configured_should_store_derived_rates(
+    EmptyAgencyRepository: AgencyRepository,
+) -> None:
+    strategy = MemoryUpdateStrategy(
+        [
+            UnprocessedRate(
+                currency_from="EUR",
+                currency_to="USD",
+                rate="1.10",
+                date="2021-01-01T00:00:00",
+            ),
+            UnprocessedRate(
+                currency_from="EUR",
+                currency_to="USD",
+                rate="1.13",
+                date="2021-01-04T00:00:00",
+            ),
+        ]
+    )
+    cmd = UpdateByName(strategy, "EZB")
+    handler = ByNameUpdateHandler(EmptyAgencyRepository, gap_fill={"EZB": "linear"})
+
+    handler.execute(cmd)
+
+    in_db = EmptyAgencyRepository.find_by_name("EZB")
+    sunday = in_db.get_rate("EUR", "USD", datetime.datetime(2021, 1, 3))
+    assert sunday.rate == Money.from_str("1.12")
+    assert sunday.derived
+    assert sum(rate.derived for rate in in_db.rates) == 2
+
+
+def test_update_command_when_lazy_should_keep_stored_rates(
+    MemoryStrategy: UpdateStrategy, MemoryAgencyRepository: AgencyRepo
+) -> None:
+    lazy_repo = AgencyRepo(MemoryAgencyRepository.session, lazy=True)
+    strategy = MemoryUpdateStrategy(
+        [
+            UnprocessedRate(
+                currency_from="EUR",
+                currency_to="USD",
+                rate="1.2",
+                date="2021-01-04T00:00:00",
+            )
+        ]
+    )
+
+    ByNameUpdateHandler(lazy_repo).execute(UpdateByName(strategy, "EZB"))
+
+    in_db = MemoryAgencyRepository.find_by_name("EZB")
+    assert len(in_db.rates) == 4
+
+
+def test_update_command_should_leave_stored_rates_untouched(
+    EmptyAgencyRepository: AgencyRepo,
+) -> None:
+    def update(*rates: tuple[str, str]) -> None:
+        strategy = MemoryUpdateStrategy(
+            [
+                UnprocessedRate(
+                    currency_from="EUR", currency_to="USD", rate=rate, date=date
+                )
+                for rate, date in rates
+            ]
+        )
+        handler = ByNameUpdateHandler(EmptyAgencyRepository, gap_fill={"EZB": "linear"})
+        handler.execute(UpdateByName(strategy, "EZB"))
+
+    def stored() -> dict[datetime.datetime, tuple[int | None, bool]]:
+        agency = EmptyAgencyRepository.find_by_name("EZB")
+        return {rate.dt: (rate.id, rate.derived) for rate in agency.rates}
+
+    update(("1.10", "2021-01-01T00:00:00"), ("1.13", "2021-01-04T00:00:00"))
+    before = stored()
+    update(("1.20", "2021-01-03T00:00:00"))
+    after = stored()
+
+    first, last = datetime.datetime(2021, 1, 1), datetime.datetime(2021, 1, 4)
+    assert len(after) == 4
+    assert after[first] == before[first]
+    assert after[last] == before[last]
+    assert not after[datetime.datetime(2021, 1, 3)][1]
+    assert after[datetime.datetime(2021, 1, 2)][1]
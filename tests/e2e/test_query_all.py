@@ -1,13 +1,28 @@
 import datetime
+from pathlib import Path
+
+import pytest
 
 from currency_convert.application.agency.queries.fetch_all.command import FetchAll
 from currency_convert.application.agency.queries.fetch_all.handler import (
     FetchAllHandler,
 )
-from currency_convert.domain.agency.entities.interface import AgencyRepository
+from currency_convert.domain.agency.entities.interface import (
+    AgencyRepository,
+    RateFilter,
+)
 from currency_convert.domain.agency.valueobjects.rate import Rate
+from currency_convert.infrastructure.agency import memory
+from currency_convert.infrastructure.agency.cache import AgencyCache, CachedAgencyRepo
+from currency_convert.infrastructure.agency.repository import AgencyRepo
+from currency_convert.infrastructure.agency.shared import (
+    SharedRateRepo,
+    SharedRateStore,
+)
 from tests.data import INSERTS
 
+CET = datetime.timezone(datetime.timedelta(hours=1))
+
 
 def test_query_all_rates(MemoryAgencyRepository: AgencyRepository) -> None:
     expected = tuple(
@@ -20,7 +35,98 @@ def test_query_all_rates(MemoryAgencyRepository: AgencyRepository) -> None:
         for rate in sorted(INSERTS, key=lambda x: x["date"], reverse=True)
     )
 
-    cmd = FetchAll("EZB", lambda _: True)
+    cmd = FetchAll("EZB")
     handler = FetchAllHandler(MemoryAgencyRepository)
 
     assert handler.execute(cmd) == expected
+
+
+@pytest.mark.parametrize(
+    "spec, expected_currencies",
+    [
+        (RateFilter(currency_to="GBP"), ["GBP"]),
+        (RateFilter(dt=datetime.datetime(2021, 1, 3)), ["RUB"]),
+        (
+            RateFilter(
+                start=datetime.datetime(2021, 1, 2),
+                end=datetime.datetime(2021, 1, 3),
+            ),
+            ["RUB", "GBP"],
+        ),
+        (RateFilter(order="asc", limit=2), ["USD", "GBP"]),
+        (RateFilter(limit=1), ["RUB"]),
+        (RateFilter(currency_from="USD"), []),
+        (
+            RateFilter(
+                start=datetime.datetime(2021, 1, 2, 1, tzinfo=CET),
+                end=datetime.datetime(2021, 1, 3, tzinfo=datetime.UTC),
+            ),
+            ["RUB", "GBP"],
+        ),
+        (RateFilter(dt=datetime.datetime(2021, 1, 3, 1, tzinfo=CET)), ["RUB"]),
+    ],
+    ids=[
+        "query_all_when_currency_to_given_should_return_its_rates",
+        "query_all_when_dt_given_should_return_rates_of_dt",
+        "query_all_when_range_given_should_return_rates_in_range",
+        "query_all_when_ascending_with_limit_should_return_oldest",
+        "query_all_when_limit_given_should_return_newest",
+        "query_all_when_nothing_matches_should_return_empty",
+        "query_all_when_aware_range_given_should_compare_in_utc",
+        "query_all_when_aware_dt_given_should_compare_in_utc",
+    ],
+)
+@pytest.mark.parametrize("source", ["sql", "memory", "cached"])
+def test_query_all_rates_should_apply_filter(
+    MemoryAgencyRepository: AgencyRepository,
+    spec: RateFilter,
+    expected_currencies: list[str],
+    source: str,
+) -> None:
+    repository = MemoryAgencyRepository
+    if source == "memory":
+        agency = MemoryAgencyRepository.find_by_name("EZB")
+        repository = memory.AgencyRepo({agency})
+    elif source == "cached":
+        repository = CachedAgencyRepo(MemoryAgencyRepository, AgencyCache())
+        repository.find_by_name("EZB")
+
+    rates = FetchAllHandler(repository).execute(FetchAll("EZB", spec))
+
+    assert [rate.currency_to for rate in rates] == expected_currencies
+
+
+@pytest.mark.parametrize(
+    "order, expected_currencies",
+    [("desc", ["USD", "JPY"]), ("asc", ["CHF", "GBP"])],
+    ids=[
+        "query_all_when_same_day_descending_should_break_ties_by_currency",
+        "query_all_when_same_day_ascending_should_break_ties_by_currency",
+    ],
+)
+@pytest.mark.parametrize("source", ["sql", "memory", "cached", "shared"])
+def test_query_all_rates_when_same_day_with_limit(
+    MemoryAgencyRepository: AgencyRepo,
+    tmp_path: Path,
+    order: str,
+    expected_currencies: list[str],
+    source: str,
+) -> None:
+    agency = MemoryAgencyRepository.find_by_name("EZB")
+    for code in ("JPY", "CHF", "USD", "GBP"):
+        agency.add_rate("EUR", code, "2", "2021-01-05T00:00:00")
+    MemoryAgencyRepository.save(agency)
+    repository: AgencyRepository = MemoryAgencyRepository
+    if source == "memory":
+        repository = memory.AgencyRepo({MemoryAgencyRepository.find_by_name("EZB")})
+    elif source == "cached":
+        repository = CachedAgencyRepo(MemoryAgencyRepository, AgencyCache())
+        repository.find_by_name("EZB")
+    elif source == "shared":
+        repository = SharedRateRepo(MemoryAgencyRepository, SharedRateStore(tmp_path))
+        repository.find_by_name("EZB")
+    spec = RateFilter(dt=datetime.datetime(2021, 1, 5), limit=2, order=order)  # type: ignore[arg-type]
+
+    rates = FetchAllHandler(repository).execute(FetchAll("EZB", spec))
+
+    assert [rate.currency_to for rate in rates] == expected_currencies
@@ -0,0 +1,83 @@
+import datetime
+
+import pytest
+
+from currency_convert.application.agency.queries.convert_batch.handler import (
+    ConvertBatchHandler,
+)
+from currency_convert.application.agency.queries.convert_batch.query import (
+    Conversion,
+    ConvertBatch,
+)
+from currency_convert.domain.agency.entities.interface import AgencyRepository
+from currency_convert.domain.agency.valueobjects.money import Money
+
+
+def test_query_batch_conversion(MemoryAgencyRepository: AgencyRepository) -> None:
+    cmd = ConvertBatch(
+        "EZB",
+        (
+            Conversion("EUR", "USD", "100", datetime.datetime(2021, 1, 1)),
+            Conversion("USD", "EUR", "11"),
+            Conversion("EUR", "JPY", "100"),
+            Conversion("EUR", "USD", "2.5", datetime.datetime(2021, 1, 1)),
+            Conversion("EUR", "USD", "1", datetime.datetime(2021, 1, 2)),
+        ),
+    )
+    handler = ConvertBatchHandler(MemoryAgencyRepository)
+
+    assert handler.execute(cmd) == (
+        Money.from_str("110"),
+        Money.from_str("10.00000001"),
+        None,
+        Money.from_str("2.75"),
+        None,
+    )
+
+
+def test_query_batch_conversion_when_amount_rounds_to_zero_should_be_null(
+    MemoryAgencyRepository: AgencyRepository,
+) -> None:
+    agency = MemoryAgencyRepository.find_by_name("EZB")
+    agency.add_rate("EUR", "JPY", "155", "2021-01-01T00:00:00")
+    MemoryAgencyRepository.save(agency)
+    dt = datetime.datetime(2021, 1, 1)
+    cmd = ConvertBatch(
+        "EZB",
+        (
+            Conversion("JPY", "EUR", "0.00000001", dt),
+            Conversion("EUR", "USD", "0.000000001", dt),
+            Conversion("USD", "EUR", "11", dt),
+        ),
+    )
+
+    converted = ConvertBatchHandler(MemoryAgencyRepository).execute(cmd)
+
+    assert converted == (None, None, Money.from_str("10.00000001"))
+
+
+@pytest.mark.parametrize(
+    "amount",
+    ["123.45678901", "0.00000005", "100000000000"],
+    ids=[
+        "query_batch_conversion_should_round_like_money_multiply",
+        "query_batch_conversion_when_half_unit_should_round_to_even",
+        "query_batch_conversion_when_product_exceeds_int64_should_stay_exact",
+    ],
+)
+def test_query_batch_conversion_should_match_money_multiply(
+    MemoryAgencyRepository: AgencyRepository, amount: str
+) -> None:
+    agency = MemoryAgencyRepository.find_by_name("EZB")
+    pairs = [("EUR", "USD"), ("USD", "EUR"), ("EUR", "GBP"), ("GBP", "USD")]
+    cmd = ConvertBatch(
+        "EZB",
+        tuple(Conversion(source, target, amount) for source, target in pairs),
+    )
+
+    converted = ConvertBatchHandler(MemoryAgencyRepository).execute(cmd)
+
+    assert converted == tuple(
+        Money.from_str(amount).multiply(agency.get_rate(source, target).rate)
+        for source, target in pairs
+    )
@@ -0,0 +1,73 @@
+import datetime
+import typing
+
+from currency_convert.application.agency.commands.update.command import UpdateByName
+from currency_convert.application.agency.commands.update.handler import (
+    ByNameUpdateHandler,
+)
+from currency_convert.application.agency.queries.fetch_consensus.handler import (
+    FetchConsensusHandler,
+)
+from currency_convert.application.agency.queries.fetch_consensus.query import (
+    FetchConsensus,
+)
+from currency_convert.domain.agency.entities.agency import Agency
+from currency_convert.domain.agency.entities.interface import AgencyVersion
+from currency_convert.domain.agency.services.consensus import Consensus
+from currency_convert.domain.agency.valueobjects.money import Money
+from currency_convert.domain.agency.valueobjects.rate import Rate
+from currency_convert.infrastructure.agency.cache import AgencyCache, CachedAgencyRepo
+from currency_convert.infrastructure.agency.repository import AgencyRepo
+from currency_convert.infrastructure.update_strategies.ezb.memory import (
+    MemoryUpdateStrategy,
+)
+
+
+class CountingConsensus(Consensus):
+    loaded: list[str]
+
+    def load(
+        self,
+        agencies: typing.Iterable[Agency],
+        versions: typing.Mapping[str, AgencyVersion] | None = None,
+    ) -> None:
+        agencies = list(agencies)
+        self.loaded = getattr(self, "loaded", []) + [a.name for a in agencies]
+        super().load(agencies, versions)
+
+
+def test_query_consensus_when_rates_bulk_inserted_should_reload_agency(
+    MemoryAgencyRepository: AgencyRepo,
+) -> None:
+    repo = CachedAgencyRepo(MemoryAgencyRepository, AgencyCache())
+    handler = FetchConsensusHandler(repo, Consensus())
+    assert handler.execute(FetchConsensus("EUR", "USD")).rate == Money.from_str("1.1")
+
+    added = Rate.create("EUR", "USD", "1.3", datetime.datetime(2021, 1, 5))
+    MemoryAgencyRepository.bulk_insert(repo.find_by_name("EZB"), [added])
+
+    assert handler.execute(FetchConsensus("EUR", "USD")) == added
+
+
+def test_query_consensus_when_updated_in_process_should_not_reload_agency(
+    MemoryAgencyRepository: AgencyRepo,
+) -> None:
+    consensus = CountingConsensus()
+    handler = FetchConsensusHandler(MemoryAgencyRepository, consensus)
+    handler.execute(FetchConsensus("EUR", "USD"))
+    strategy = MemoryUpdateStrategy(
+        [
+            {
+                "currency_from": "EUR",
+                "currency_to": "USD",
+                "rate": "1.3",
+                "date": "2021-01-05T00:00:00",
+            }
+        ]
+    )
+
+    update = ByNameUpdateHandler(MemoryAgencyRepository, (consensus,))
+    update.execute(UpdateByName(strategy, "EZB"))
+
+    assert handler.execute(FetchConsensus("EUR", "USD")).rate == Money.from_str("1.3")
+    assert consensus.loaded == ["EZB"]
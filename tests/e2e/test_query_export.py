@@ -0,0 +1,77 @@
+import datetime
+import io
+
+import pytest
+from sqlalchemy.engine.base import Engine
+
+from currency_convert.domain.agency.entities.agency import AgencyNotFoundError
+from currency_convert.domain.agency.entities.interface import AgencyRepository
+from tests.data import INSERTS
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from currency_convert.infrastructure.agency.export import (  # noqa: E402
+    ExportFormat,
+    RateExporter,
+)
+
+EXPECTED = {
+    "currency_from": [rate["currency_from"] for rate in INSERTS],
+    "currency_to": [rate["currency_to"] for rate in INSERTS],
+    "rate": [110000000, 80000000, 90000000],
+    "date": [
+        datetime.datetime.fromisoformat(rate["date"]).replace(tzinfo=datetime.UTC)
+        for rate in INSERTS
+    ],
+    "derived": [False, False, False],
+}
+
+
+def _read(data: bytes, format: ExportFormat) -> "pa.Table":
+    if format == "parquet":
+        return pq.read_table(pa.BufferReader(data))
+    return pa.ipc.open_file(pa.BufferReader(data)).read_all()
+
+
+@pytest.mark.parametrize(
+    "format",
+    ["arrow", "parquet"],
+    ids=[
+        "export_when_arrow_should_write_columnar_rates",
+        "export_when_parquet_should_write_columnar_rates",
+    ],
+)
+def test_export(
+    MemoryEngine: Engine, MemoryAgencyRepository: AgencyRepository, format: ExportFormat
+) -> None:
+    exporter = RateExporter(MemoryEngine)
+    exporter.CHUNK_SIZE = 2
+    sink = io.BytesIO()
+
+    rows = exporter("EZB", sink, format)
+
+    table = _read(sink.getvalue(), format)
+    assert rows == table.num_rows == 3
+    assert pa.types.is_dictionary(table.schema.field("currency_to").type)
+    assert table.schema.field("rate").metadata == {b"scale": b"8"}
+    assert table.to_pydict() == EXPECTED
+
+
+def test_stream_should_match_export(
+    MemoryEngine: Engine, MemoryAgencyRepository: AgencyRepository
+) -> None:
+    exporter = RateExporter(MemoryEngine)
+    exporter.CHUNK_SIZE = 2
+
+    chunks = list(exporter.stream("EZB"))
+
+    assert len(chunks) > 2
+    assert _read(b"".join(chunks), "arrow").to_pydict() == EXPECTED
+
+
+def test_stream_when_agency_missing_should_raise_before_iterating(
+    MemoryEngine: Engine, MemoryAgencyRepository: AgencyRepository
+) -> None:
+    with pytest.raises(AgencyNotFoundError):
+        RateExporter(MemoryEngine).stream("ECB")
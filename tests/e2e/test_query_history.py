@@ -0,0 +1,65 @@
+import datetime
+
+import pytest
+
+from currency_convert.application.agency.queries.fetch_all.command import (
+    FetchHistory,
+)
+from currency_convert.application.agency.queries.fetch_all.handler import (
+    FetchHistoryHandler,
+)
+from currency_convert.domain.agency.entities.agency import AgencyNotFoundError
+from currency_convert.domain.agency.entities.interface import AgencyRepository
+from currency_convert.domain.agency.valueobjects.rate import Rate
+from tests.data import INSERTS
+
+EXPECTED = tuple(
+    Rate.create(
+        currency_from=rate["currency_from"],
+        currency_to=rate["currency_to"],
+        rate=rate["rate"],
+        dt=datetime.datetime.fromisoformat(rate["date"]),
+    )
+    for rate in sorted(INSERTS, key=lambda x: x["date"])
+)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        (FetchHistory("EZB"), EXPECTED),
+        (
+            FetchHistory(
+                "EZB",
+                start=datetime.datetime(2021, 1, 2),
+                end=datetime.datetime(2021, 1, 3),
+            ),
+            EXPECTED[1:],
+        ),
+        (FetchHistory("EZB", "EUR", "USD"), EXPECTED[:1]),
+        (FetchHistory("EZB", "USD", "EUR"), ()),
+    ],
+    ids=[
+        "query_history_when_no_filter_should_return_all_rates_oldest_first",
+        "query_history_when_date_range_should_return_rates_within_range",
+        "query_history_when_pair_should_return_rates_of_pair",
+        "query_history_when_pair_not_stored_should_return_no_rates",
+    ],
+)
+def test_query_history(
+    MemoryAgencyRepository: AgencyRepository,
+    query: FetchHistory,
+    expected: tuple[Rate, ...],
+) -> None:
+    handler = FetchHistoryHandler(MemoryAgencyRepository)
+
+    assert tuple(handler.execute(query)) == expected
+
+
+def test_query_history_when_agency_missing_should_raise_before_iterating(
+    MemoryAgencyRepository: AgencyRepository,
+) -> None:
+    handler = FetchHistoryHandler(MemoryAgencyRepository)
+
+    with pytest.raises(AgencyNotFoundError):
+        handler.execute(FetchHistory("missing"))
@@ -1,11 +1,20 @@
 import datetime
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine.base import Engine
 
 from currency_convert.application.agency.queries.fetch_one.handler import (
     FetchOneHandler,
 )
 from currency_convert.application.agency.queries.fetch_one.query import FetchOne
+from currency_convert.domain.agency.entities.agency import RateNotFoundError
 from currency_convert.domain.agency.entities.interface import AgencyRepository
 from currency_convert.domain.agency.valueobjects.rate import Rate
+from currency_convert.infrastructure.agency import memory
+from currency_convert.infrastructure.agency.cache import AgencyCache, CachedAgencyRepo
+from currency_convert.infrastructure.agency.repository import AgencyRepo
 from tests.data import INSERTS
 
 
@@ -19,3 +28,115 @@ def test_query_one_rate(MemoryAgencyRepository: AgencyRepository) -> None:
     cmd = FetchOne("EZB", "EUR", "USD", to_get)
     handler = FetchOneHandler(MemoryAgencyRepository)
     assert handler.execute(cmd) == expected
+
+
+def test_query_one_rate_as_of(MemoryAgencyRepository: AgencyRepository) -> None:
+    expected = Rate.create(
+        currency_from=INSERTS[1]["currency_from"],
+        currency_to=INSERTS[1]["currency_to"],
+        rate=INSERTS[1]["rate"],
+        dt=datetime.datetime.fromisoformat(INSERTS[1]["date"]),
+    )
+    cmd = FetchOne("EZB", "EUR", "GBP", datetime.datetime(2021, 1, 9), as_of=True)
+    handler = FetchOneHandler(MemoryAgencyRepository)
+    assert handler.execute(cmd) == expected
+
+
+def test_query_one_rate_when_lazy_should_load_only_requested_rates(
+    MemoryAgencyRepository: AgencyRepo,
+) -> None:
+    repo = AgencyRepo(MemoryAgencyRepository.session, lazy=True)
+    agency = repo.find_by_name("EZB")
+    assert not agency.rates
+
+    rate = agency.get_rate("USD", "GBP", datetime.datetime(2021, 1, 2), as_of=True)
+
+    assert rate.currency_to == "GBP"
+    assert {r.currency_to.code for r in agency.rates} == {"USD", "GBP"}
+    assert len(agency.get_rates()) == len(INSERTS)
+
+
+@pytest.mark.parametrize(
+    "cmd",
+    [
+        FetchOne("EZB", "USD", "GBP", datetime.datetime(2021, 1, 3), as_of=True),
+        FetchOne("EZB", "GBP", "EUR"),
+        FetchOne(
+            "EZB",
+            "EUR",
+            "USD",
+            datetime.datetime(2021, 1, 3),
+            as_of=True,
+            max_staleness=datetime.timedelta(days=1),
+        ),
+        FetchOne("EZB", "EUR", "GBP", datetime.datetime(2021, 1, 3)),
+    ],
+    ids=[
+        "query_one_when_cross_rate_should_match_loaded_agency",
+        "query_one_when_latest_inverted_should_match_loaded_agency",
+        "query_one_when_stale_should_match_loaded_agency",
+        "query_one_when_no_rate_at_dt_should_match_loaded_agency",
+    ],
+)
+def test_query_one_rate_should_read_at_most_two_rates(
+    MemoryEngine: Engine, MemoryAgencyRepository: AgencyRepo, cmd: FetchOne
+) -> None:
+    agency = MemoryAgencyRepository.find_by_name("EZB")
+    try:
+        expected: Rate | type[RateNotFoundError] = agency.get_rate(
+            cmd.currency_from,
+            cmd.currency_to,
+            cmd.dt,
+            as_of=cmd.as_of,
+            max_staleness=cmd.max_staleness,
+        )
+    except RateNotFoundError:
+        expected = RateNotFoundError
+    lookups: list[str] = []
+
+    def count(_conn: Any, _cursor: Any, sql: str, *_: Any) -> None:
+        if "FROM rates" in sql:
+            lookups.append(sql)
+
+    event.listen(MemoryEngine, "after_cursor_execute", count)
+    try:
+        actual: Rate | type[RateNotFoundError] = FetchOneHandler(
+            MemoryAgencyRepository
+        ).execute(cmd)
+    except RateNotFoundError:
+        actual = RateNotFoundError
+    finally:
+        event.remove(MemoryEngine, "after_cursor_execute", count)
+
+    assert actual == expected
+    assert 0 < len(lookups) <= 2
+    assert all("LIMIT" in sql for sql in lookups)
+
+
+@pytest.mark.parametrize("source", ["sql", "memory", "cached"])
+@pytest.mark.parametrize(
+    "dt",
+    [
+        datetime.datetime(2021, 1, 3, tzinfo=datetime.UTC),
+        datetime.datetime(
+            2021, 1, 2, 19, tzinfo=datetime.timezone(-datetime.timedelta(hours=5))
+        ),
+    ],
+    ids=[
+        "query_one_when_dt_utc_should_find_stored_rate",
+        "query_one_when_dt_with_offset_should_find_stored_rate",
+    ],
+)
+def test_query_one_rate_when_dt_aware(
+    MemoryAgencyRepository: AgencyRepo, dt: datetime.datetime, source: str
+) -> None:
+    repository: AgencyRepository = MemoryAgencyRepository
+    if source == "memory":
+        repository = memory.AgencyRepo({MemoryAgencyRepository.find_by_name("EZB")})
+    elif source == "cached":
+        repository = CachedAgencyRepo(MemoryAgencyRepository, AgencyCache())
+        repository.find_by_name("EZB")
+
+    rate = FetchOneHandler(repository).execute(FetchOne("EZB", "EUR", "RUB", dt))
+
+    assert rate.dt == datetime.datetime(2021, 1, 3)
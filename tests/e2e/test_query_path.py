@@ -0,0 +1,29 @@
+import datetime
+
+import pytest
+
+from currency_convert.application.agency.queries.fetch_path.handler import (
+    FetchPathHandler,
+)
+from currency_convert.application.agency.queries.fetch_path.query import FetchPath
+from currency_convert.domain.agency.entities.agency import RateNotFoundError
+from currency_convert.domain.agency.services.graph import CurrencyGraph
+from currency_convert.domain.agency.valueobjects.rate import Rate
+from currency_convert.infrastructure.agency.cache import AgencyCache, CachedAgencyRepo
+from currency_convert.infrastructure.agency.repository import AgencyRepo
+
+DAY = datetime.datetime(2021, 1, 5)
+
+
+def test_query_path_when_rates_bulk_inserted_should_reload_agency(
+    MemoryAgencyRepository: AgencyRepo,
+) -> None:
+    repo = CachedAgencyRepo(MemoryAgencyRepository, AgencyCache())
+    handler = FetchPathHandler(repo, CurrencyGraph())
+    with pytest.raises(RateNotFoundError):
+        handler.execute(FetchPath("EUR", "USD", DAY))
+
+    added = Rate.create("EUR", "USD", "1.3", DAY)
+    MemoryAgencyRepository.bulk_insert(repo.find_by_name("EZB"), [added])
+
+    assert handler.execute(FetchPath("EUR", "USD", DAY)).rate == added
@@ -0,0 +1,59 @@
+import datetime
+from typing import Any, Callable, Iterator
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine.base import Engine
+
+from currency_convert.infrastructure.agency.repository import AgencyRepo
+
+Statement = tuple[str, Any]
+
+
+@pytest.fixture
+def statements(MemoryEngine: Engine) -> Iterator[list[Statement]]:
+    captured: list[Statement] = []
+
+    def capture(_conn: Any, _cursor: Any, sql: str, params: Any, *_: Any) -> None:
+        if sql.lstrip().startswith("SELECT"):
+            captured.append((sql, params))
+
+    event.listen(MemoryEngine, "before_cursor_execute", capture)
+    yield captured
+    event.remove(MemoryEngine, "before_cursor_execute", capture)
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda repo: repo.find_by_name("EZB"),
+        lambda repo: list(repo.find_rates("EZB", "EUR", "USD")),
+        lambda repo: AgencyRepo(repo.session, lazy=True)
+        .find_by_name("EZB")
+        .get_rate("EUR", "USD", datetime.datetime(2021, 1, 1)),
+        lambda repo: repo.find_rate(
+            "EZB", "USD", "GBP", datetime.datetime(2021, 1, 3), as_of=True
+        ),
+    ],
+    ids=[
+        "find_by_name_should_search_agencies_and_rates_by_index",
+        "find_rates_should_search_rates_by_index",
+        "lazy_get_rate_should_search_rates_by_index",
+        "find_rate_should_search_rates_by_index",
+    ],
+)
+def test_query_plan_should_not_scan_tables(
+    MemoryEngine: Engine,
+    MemoryAgencyRepository: AgencyRepo,
+    statements: list[Statement],
+    call: Callable[[AgencyRepo], Any],
+) -> None:
+    call(MemoryAgencyRepository)
+
+    assert statements
+    with MemoryEngine.connect() as conn:
+        for sql, params in statements:
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params).all()
+            details = [row[-1] for row in plan]
+            assert not [d for d in details if d.startswith("SCAN")], sql
+            assert any("USING" in d and "INDEX" in d for d in details), sql
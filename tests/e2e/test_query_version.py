@@ -0,0 +1,103 @@
+import datetime
+from typing import Callable
+
+import pytest
+
+from currency_convert.application.agency.queries.fetch_version.handler import (
+    FetchVersionHandler,
+)
+from currency_convert.application.agency.queries.fetch_version.query import (
+    FetchVersion,
+)
+from currency_convert.domain.agency.entities.agency import (
+    Agency,
+    AgencyNotFoundError,
+)
+from currency_convert.domain.agency.valueobjects.rate import Rate
+from currency_convert.infrastructure.agency import memory
+from currency_convert.infrastructure.agency.repository import AgencyRepo
+
+NEW_RATE = Rate.create("EUR", "USD", "1.3", datetime.datetime(2022, 1, 1))
+
+
+def _add_rate(repo: AgencyRepo, agency: Agency) -> None:
+    agency.add_rate("EUR", "USD", "1.3", "2022-01-01T00:00:00")
+    repo.save(agency)
+
+
+@pytest.mark.parametrize(
+    "change, version",
+    [
+        (lambda repo, agency: None, 1),
+        (lambda repo, agency: repo.save(agency), 1),
+        (_add_rate, 2),
+        (lambda repo, agency: repo.bulk_insert(agency, [NEW_RATE]), 2),
+        (lambda repo, agency: repo.bulk_insert(agency, agency.rates), 1),
+    ],
+    ids=[
+        "find_version_when_updated_once_should_be_one",
+        "find_version_when_saved_unchanged_should_stay",
+        "find_version_when_rate_added_should_increase",
+        "find_version_when_bulk_inserted_should_increase",
+        "find_version_when_bulk_insert_skipped_all_should_stay",
+    ],
+)
+def test_find_version(
+    MemoryAgencyRepository: AgencyRepo,
+    change: Callable[[AgencyRepo, Agency], None],
+    version: int,
+) -> None:
+    before = MemoryAgencyRepository.find_version("EZB")
+
+    change(MemoryAgencyRepository, MemoryAgencyRepository.find_by_name("EZB"))
+
+    after = FetchVersionHandler(MemoryAgencyRepository).execute(FetchVersion("EZB"))
+    assert after.version == version
+    assert after.modified >= before.modified
+    assert after.modified.tzinfo is None
+
+
+def test_find_version_when_agency_created_should_be_zero(
+    EmptyAgencyRepository: AgencyRepo,
+) -> None:
+    assert EmptyAgencyRepository.find_version("EZB").version == 0
+
+
+@pytest.mark.parametrize(
+    "repository",
+    [lambda repo: repo, lambda repo: memory.AgencyRepo()],
+    ids=[
+        "find_version_when_agency_missing_should_raise_not_found",
+        "find_version_when_agency_missing_in_memory_should_raise_not_found",
+    ],
+)
+def test_find_version_when_agency_missing(
+    EmptyAgencyRepository: AgencyRepo,
+    repository: Callable[[AgencyRepo], AgencyRepo],
+) -> None:
+    with pytest.raises(AgencyNotFoundError):
+        repository(EmptyAgencyRepository).find_version("FED")
+
+
+@pytest.mark.parametrize(
+    "change, version",
+    [
+        (lambda agency: None, 0),
+        (lambda agency: agency.add_rate("EUR", "USD", "1.3", "2022-01-01"), 1),
+    ],
+    ids=[
+        "find_version_in_memory_when_saved_unchanged_should_stay",
+        "find_version_in_memory_when_rate_added_should_increase",
+    ],
+)
+def test_find_version_in_memory_when_saved(
+    change: Callable[[Agency], None], version: int
+) -> None:
+    agency = Agency.create("EUR", "EZB", "https://test.com", "Test Country")
+    repo = memory.AgencyRepo({agency})
+
+    change(agency)
+    repo.save(agency)
+
+    assert repo.find_version("EZB").version == version
+    assert agency.pending_rates() == ((), ())
@@ -1,10 +1,14 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
 import pytest
 
-from currency_convert.domain.agency.entities.agency import Agency, RateNotFoundError
+from currency_convert.domain.agency.entities.agency import (
+    Agency,
+    GapFill,
+    RateNotFoundError,
+)
 from currency_convert.domain.agency.valueobjects.currency import Currency
 from currency_convert.domain.agency.valueobjects.money import Money
 from currency_convert.domain.agency.valueobjects.rate import Rate
@@ -195,3 +199,199 @@ def test_get_rate_when_base_and_date_should_return_rate_from_date(
     rate = agency.get_rate("USD", "JPY", datetime.fromisoformat("2023-08-01T00:00:00"))
     expected_rate = Money.from_str("120.00")
     assert rate.rate == expected_rate
+
+
+def test_get_rate_when_date_between_observations_should_raise_rate_not_found_error(
+    agency: Agency,
+) -> None:
+    agency.add_rate("USD", "JPY", "110.00", "2023-10-01T00:00:00")
+    agency.add_rate("USD", "JPY", "120.00", "2023-08-01T00:00:00")
+    with pytest.raises(RateNotFoundError):
+        agency.get_rate("USD", "JPY", datetime.fromisoformat("2023-09-01T00:00:00"))
+
+
+def test_get_rate_when_rates_added_out_of_order_should_match_get_rates(
+    agency: Agency,
+) -> None:
+    for day in (5, 1, 9, 3, 7):
+        agency.add_rate("USD", "JPY", f"1{day}0.00", f"2023-10-0{day}T00:00:00")
+    latest = agency.get_rates(lambda r: r.currency_to == "JPY")[0]
+    assert agency.get_rate("USD", "JPY") == latest
+    for rate in agency.get_rates():
+        assert agency.get_rate("USD", "JPY", rate.dt) == rate
+
+
+def test_from_attributes_when_rates_given_should_index_rates() -> None:
+    rate = Rate.create("USD", "EUR", "0.85", datetime.fromisoformat("2023-10-01"))
+    agency = Agency.from_attributes(
+        str(uuid.uuid4()), "USD", "Test Agency", "https://test.com", "Test", {rate}
+    )
+    assert agency.get_rate("USD", "EUR", rate.dt) == rate
+
+
+@pytest.mark.parametrize(
+    "rate1, rate2, expected_count",
+    [
+        (
+            ("USD", "EUR", "0.85", "2023-10-01T00:00:00"),
+            ("USD", "EUR", "0.85", "2023-10-01T00:00:00"),
+            1,
+        ),
+        (
+            ("USD", "EUR", "0.85", "2023-10-01T00:00:00"),
+            ("USD", "EUR", "0.86", "2023-10-01T00:00:00"),
+            1,
+        ),
+        (
+            ("USD", "EUR", "0.85", "2023-10-01T00:00:00"),
+            ("GBP", "EUR", "0.85", "2023-10-01T00:00:00"),
+            2,
+        ),
+    ],
+    ids=[
+        "add_rate_when_identical_rate_exists_should_ignore_rate",
+        "add_rate_when_rate_for_same_pair_and_date_exists_should_ignore_rate",
+        "add_rate_when_other_pair_on_same_date_should_add_rate",
+    ],
+)
+def test_add_rate_when_rate_exists_should_not_grow_rates(
+    agency: Agency,
+    rate1: tuple[Any, ...],
+    rate2: tuple[Any, ...],
+    expected_count: int,
+) -> None:
+    agency.add_rate(*rate1)
+    agency.add_rate(*rate2)
+    assert len(agency.rates) == expected_count
+    assert agency.get_rate("USD", "EUR").rate == Money.from_str("0.85")
+
+
+@pytest.mark.parametrize(
+    "date, max_staleness, expected_rate",
+    [
+        ("2023-09-15T00:00:00", None, Money.from_str("115.00")),
+        ("2023-09-01T00:00:00", None, Money.from_str("115.00")),
+        ("2023-12-31T00:00:00", None, Money.from_str("110.00")),
+        ("2023-09-03T00:00:00", timedelta(days=2), Money.from_str("115.00")),
+    ],
+    ids=[
+        "get_rate_when_as_of_between_observations_should_return_previous_rate",
+        "get_rate_when_as_of_on_observation_should_return_that_rate",
+        "get_rate_when_as_of_after_last_observation_should_return_latest_rate",
+        "get_rate_when_as_of_within_max_staleness_should_return_previous_rate",
+    ],
+)
+def test_get_rate_when_as_of_should_return_latest_rate_at_or_before_date(
+    agency: Agency,
+    date: str,
+    max_staleness: timedelta | None,
+    expected_rate: Money,
+) -> None:
+    agency.add_rate("USD", "JPY", "110.00", "2023-10-01T00:00:00")
+    agency.add_rate("USD", "JPY", "115.00", "2023-09-01T00:00:00")
+    agency.add_rate("USD", "JPY", "120.00", "2023-08-01T00:00:00")
+    rate = agency.get_rate(
+        "USD",
+        "JPY",
+        datetime.fromisoformat(date),
+        as_of=True,
+        max_staleness=max_staleness,
+    )
+    assert rate.rate == expected_rate
+
+
+@pytest.mark.parametrize(
+    "date, max_staleness",
+    [
+        ("2023-07-31T00:00:00", None),
+        ("2023-09-04T00:00:00", timedelta(days=2)),
+    ],
+    ids=[
+        "get_rate_when_as_of_before_first_observation_should_raise_rate_not_found_error",
+        "get_rate_when_as_of_beyond_max_staleness_should_raise_rate_not_found_error",
+    ],
+)
+def test_get_rate_when_as_of_without_match_should_raise_rate_not_found_error(
+    agency: Agency, date: str, max_staleness: timedelta | None
+) -> None:
+    agency.add_rate("USD", "JPY", "115.00", "2023-09-01T00:00:00")
+    agency.add_rate("USD", "JPY", "120.00", "2023-08-01T00:00:00")
+    with pytest.raises(RateNotFoundError):
+        agency.get_rate(
+            "USD",
+            "JPY",
+            datetime.fromisoformat(date),
+            as_of=True,
+            max_staleness=max_staleness,
+        )
+
+
+def test_iter_rates_when_range_given_should_return_rates_oldest_first(
+    agency: Agency,
+) -> None:
+    agency.add_rate("USD", "JPY", "110.00", "2023-10-01T00:00:00")
+    agency.add_rate("USD", "EUR", "0.90", "2023-09-15T00:00:00")
+    agency.add_rate("USD", "JPY", "115.00", "2023-09-01T00:00:00")
+    agency.add_rate("USD", "JPY", "120.00", "2023-08-01T00:00:00")
+    rates = agency.iter_rates(
+        start=datetime.fromisoformat("2023-09-01T00:00:00"),
+        end=datetime.fromisoformat("2023-10-01T00:00:00"),
+    )
+    assert [rate.rate for rate in rates] == [
+        Money.from_str("115.00"),
+        Money.from_str("0.90"),
+        Money.from_str("110.00"),
+    ]
+    assert [rate.rate for rate in agency.iter_rates("USD", "EUR")] == [
+        Money.from_str("0.90")
+    ]
+
+
+@pytest.mark.parametrize(
+    "method, expected",
+    [
+        ("forward", ["110.00", "110.00", "110.00", "113.00"]),
+        ("linear", ["110.00", "111.00", "112.00", "113.00"]),
+    ],
+    ids=[
+        "fill_gaps_when_forward_should_repeat_last_published_rate",
+        "fill_gaps_when_linear_should_interpolate_between_published_rates",
+    ],
+)
+def test_fill_gaps_should_add_derived_rates_for_missing_days(
+    agency: Agency, method: GapFill, expected: list[str]
+) -> None:
+    agency.add_rate("USD", "JPY", "110.00", "2023-09-01T00:00:00")
+    agency.add_rate("USD", "JPY", "113.00", "2023-09-04T00:00:00")
+
+    added = agency.fill_gaps(method)
+
+    rates = list(agency.iter_rates("USD", "JPY"))
+    assert [rate.rate for rate in rates] == [Money.from_str(v) for v in expected]
+    assert [rate.derived for rate in rates] == [False, True, True, False]
+    assert sorted(added, key=lambda rate: rate.dt) == rates[1:3]
+    saturday = agency.get_rate("JPY", "USD", datetime.fromisoformat("2023-09-02"))
+    assert saturday.derived
+
+
+def test_fill_gaps_when_published_rate_arrives_should_replace_derived_rates(
+    agency: Agency,
+) -> None:
+    agency.add_rate("USD", "JPY", "110.00", "2023-09-01T00:00:00")
+    agency.add_rate("USD", "JPY", "113.00", "2023-09-04T00:00:00")
+    agency.fill_gaps("linear")
+
+    late = agency.add_rate("USD", "JPY", "116.00", "2023-09-03T00:00:00")
+    assert late is not None
+    refilled = agency.fill_gaps("linear", [late])
+
+    assert [rate.rate for rate in refilled] == [Money.from_str("113.00")]
+    assert len(agency.rates) == 4
+    assert [rate.derived for rate in agency.iter_rates()] == [
+        False,
+        True,
+        False,
+        False,
+    ]
+    assert agency.add_rate("USD", "JPY", "111.00", "2023-09-02T00:00:00")
+    assert not agency.fill_gaps("linear")
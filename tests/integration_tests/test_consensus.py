@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+
+from currency_convert.domain.agency.entities.agency import Agency, RateNotFoundError
+from currency_convert.domain.agency.services.consensus import Consensus, Method
+from currency_convert.domain.agency.valueobjects.money import Money
+
+DATE = "2023-10-01T00:00:00"
+
+
+@pytest.fixture
+def agencies() -> list[Agency]:
+    agencies = []
+    for name, rate in (("A", "1.10"), ("B", "1.12"), ("C", "1.11"), ("D", "1.50")):
+        agency = Agency.create("EUR", name, "https://test.com", "Test Country")
+        agency.add_rate("EUR", "USD", rate, DATE)
+        agencies.append(agency)
+    return agencies
+
+
+@pytest.mark.parametrize(
+    "method, currency_from, currency_to, expected",
+    [
+        ("median", "EUR", "USD", Money.from_str("1.115")),
+        ("trimmed_mean", "EUR", "USD", Money.from_str("1.115")),
+        ("median", "USD", "EUR", Money.from_str("0.89687902")),
+    ],
+    ids=[
+        "get_rate_when_median_should_return_median_of_agencies",
+        "get_rate_when_trimmed_mean_should_drop_outliers",
+        "get_rate_when_pair_inverted_should_return_consensus_of_inverted_quotes",
+    ],
+)
+def test_get_rate_should_return_consensus_over_agencies(
+    agencies: list[Agency],
+    method: Method,
+    currency_from: str,
+    currency_to: str,
+    expected: Money,
+) -> None:
+    consensus = Consensus(method, trim=0.25)
+    consensus.load(agencies)
+
+    rate = consensus.get_rate(currency_from, currency_to)
+
+    assert rate.rate == expected
+    assert rate.dt == datetime.fromisoformat(DATE)
+
+
+def test_rates_added_when_agency_updated_should_update_only_new_pairs(
+    agencies: list[Agency],
+) -> None:
+    consensus = Consensus()
+    consensus.load(agencies[:3])
+    added = agencies[0].add_rate("EUR", "USD", "1.20", "2023-10-02T00:00:00")
+    assert added is not None
+
+    consensus.rates_added(agencies[0], [added])
+
+    assert consensus.get_rate("EUR", "USD").rate == Money.from_str("1.20")
+    assert consensus.get_rate(
+        "EUR", "USD", datetime.fromisoformat(DATE)
+    ).rate == Money.from_str("1.11")
+
+
+def test_get_rate_when_pair_unknown_should_raise_rate_not_found_error(
+    agencies: list[Agency],
+) -> None:
+    consensus = Consensus()
+    consensus.load(agencies)
+
+    with pytest.raises(RateNotFoundError):
+        consensus.get_rate("EUR", "JPY")
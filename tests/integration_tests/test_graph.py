@@ -0,0 +1,124 @@
+from datetime import datetime
+
+import pytest
+
+from currency_convert.domain.agency.entities.agency import Agency, RateNotFoundError
+from currency_convert.domain.agency.entities.interface import UnprocessedRate
+from currency_convert.domain.agency.services.graph import CurrencyGraph
+from currency_convert.domain.agency.valueobjects.money import Money
+
+DATE = "2023-10-01T00:00:00"
+
+
+@pytest.fixture
+def ezb() -> Agency:
+    agency = Agency.create("EUR", "EZB", "https://ezb.test", "Test Country")
+    agency.add_rate("EUR", "USD", "1.10", DATE)
+    agency.add_rate("EUR", "GBP", "0.80", DATE)
+    return agency
+
+
+@pytest.fixture
+def fed() -> Agency:
+    agency = Agency.create("USD", "FED", "https://fed.test", "Test Country")
+    agency.add_rate("USD", "CAD", "1.30", DATE)
+    agency.add_rate("USD", "GBP", "0.75", DATE)
+    return agency
+
+
+def test_find_path_when_pair_spans_agencies_should_chain_rates(
+    ezb: Agency, fed: Agency
+) -> None:
+    graph = CurrencyGraph()
+    graph.load([ezb, fed])
+
+    path = graph.find_path("EUR", "CAD", datetime.fromisoformat(DATE))
+
+    assert [hop.agency for hop in path.hops] == ["EZB", "FED"]
+    assert path.rate.currency_from == "EUR"
+    assert path.rate.currency_to == "CAD"
+    assert path.rate.rate == Money.from_str("1.43")
+
+
+@pytest.mark.parametrize(
+    "hop_costs, expected_agencies",
+    [
+        ({}, ["FED"]),
+        ({"FED": 5.0}, ["EZB", "EZB"]),
+    ],
+    ids=[
+        "find_path_when_costs_equal_should_return_shortest_path",
+        "find_path_when_agency_less_trusted_should_avoid_agency",
+    ],
+)
+def test_find_path_should_return_cheapest_path(
+    ezb: Agency,
+    fed: Agency,
+    hop_costs: dict[str, float],
+    expected_agencies: list[str],
+) -> None:
+    graph = CurrencyGraph(hop_costs)
+    graph.load([ezb, fed])
+
+    path = graph.find_path("USD", "GBP")
+
+    assert [hop.agency for hop in path.hops] == expected_agencies
+
+
+def test_find_path_when_no_edge_at_date_should_raise_rate_not_found_error(
+    ezb: Agency, fed: Agency
+) -> None:
+    graph = CurrencyGraph()
+    graph.load([ezb, fed])
+
+    with pytest.raises(RateNotFoundError):
+        graph.find_path("EUR", "CAD", datetime.fromisoformat("2023-10-02T00:00:00"))
+
+
+def test_rates_added_when_rates_added_should_drop_only_paths_of_their_dates(
+    ezb: Agency, fed: Agency
+) -> None:
+    graph = CurrencyGraph()
+    graph.load([ezb, fed])
+    kept = graph.find_path("EUR", "CAD", datetime.fromisoformat(DATE))
+    with pytest.raises(RateNotFoundError):
+        graph.find_path("EUR", "JPY", datetime.fromisoformat("2023-10-02T00:00:00"))
+
+    fed_added = fed.update(lambda: [_unprocessed("USD", "JPY", "150")])
+    ezb_added = ezb.update(lambda: [_unprocessed("EUR", "USD", "1.10")])
+    graph.rates_added(fed, fed_added)
+    graph.rates_added(ezb, ezb_added)
+
+    date = datetime.fromisoformat(DATE)
+    assert graph.find_path("EUR", "CAD", date).hops is kept.hops
+    path = graph.find_path("EUR", "JPY", datetime.fromisoformat("2023-10-02"))
+    assert path.rate.rate == Money.from_str("165")
+
+
+def test_load_when_agency_reloaded_should_drop_only_its_paths(
+    ezb: Agency, fed: Agency
+) -> None:
+    graph = CurrencyGraph()
+    graph.load([ezb, fed])
+    date = datetime.fromisoformat(DATE)
+    through_ezb = graph.find_path("EUR", "CAD", date)
+    kept = graph.find_path("USD", "CAD", date)
+
+    reloaded = Agency.create("EUR", "EZB", "https://ezb.test", "Test Country")
+    reloaded.add_rate("EUR", "USD", "1.20", DATE)
+    reloaded.add_rate("EUR", "GBP", "0.80", DATE)
+    graph.load([reloaded])
+
+    assert graph.find_path("USD", "CAD", date).hops is kept.hops
+    path = graph.find_path("EUR", "CAD", date)
+    assert path.hops is not through_ezb.hops
+    assert path.rate.rate == Money.from_str("1.56")
+
+
+def _unprocessed(currency_from: str, currency_to: str, rate: str) -> UnprocessedRate:
+    return UnprocessedRate(
+        currency_from=currency_from,
+        currency_to=currency_to,
+        rate=rate,
+        date="2023-10-02T00:00:00",
+    )
@@ -0,0 +1,68 @@
+import datetime
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.orm import Session
+
+from currency_convert.domain.agency.entities.interface import RateFilter
+from currency_convert.domain.agency.valueobjects.rate import Rate
+from currency_convert.infrastructure.agency.repository import AgencyRepo
+
+AGENCY_ID = "2d8dba5e843a42ad9b120ec308021869"
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> Config:
+    config = Config()
+    config.set_main_option("script_location", "currency_convert/infrastructure/alembic")
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{tmp_path / 'rates.db'}")
+    return config
+
+
+@pytest.mark.parametrize(
+    "stored, dt",
+    [
+        ("2021-01-01T00:00:00", datetime.datetime(2021, 1, 1)),
+        ("2021-01-05T10:11:12.000450", datetime.datetime(2021, 1, 5, 10, 11, 12, 450)),
+        ("2021-01-06 08:00:00.250000", datetime.datetime(2021, 1, 6, 8, 0, 0, 250000)),
+    ],
+    ids=[
+        "upgrade_when_date_without_fraction_should_match_lookups",
+        "upgrade_when_date_with_microseconds_should_keep_them",
+        "upgrade_when_date_already_bound_format_should_match_lookups",
+    ],
+)
+def test_timestamp_dates_upgrade_should_store_dates_as_bound(
+    config: Config, stored: str, dt: datetime.datetime
+) -> None:
+    command.upgrade(config, "8f2d4a61c0e9")
+    engine = sa.create_engine(config.get_main_option("sqlalchemy.url") or "")
+    with engine.begin() as conn:
+        conn.execute(
+            sa.text(
+                "INSERT INTO agencies (id, base, name, address, country) "
+                "VALUES (:id, 'EUR', 'EZB', 'https://test.com', 'Test Country')"
+            ),
+            {"id": AGENCY_ID},
+        )
+        conn.execute(
+            sa.text(
+                "INSERT INTO rates (currency_from, currency_to, rate, date, agency_id)"
+                " VALUES ('EUR', 'USD', 1.1, :date, :id)"
+            ),
+            {"date": stored, "id": AGENCY_ID},
+        )
+
+    command.upgrade(config, "head")
+
+    with Session(engine) as session:
+        repo = AgencyRepo(session)
+        expected = Rate.create("EUR", "USD", "1.1", dt)
+        assert repo.select_rates("EZB", RateFilter(dt=dt)) == (expected,)
+        assert repo.find_rate("EZB", "EUR", "USD", dt) == expected
+        agency = repo.find_by_name("EZB")
+        assert repo.bulk_insert(agency, [expected]).rows == 0
+    engine.dispose()
@@ -0,0 +1,208 @@
+import datetime
+
+import pytest
+
+from currency_convert.domain.agency.entities.agency import Agency, ReadOnlyAgencyError
+from currency_convert.domain.agency.entities.interface import RateFilter
+from currency_convert.domain.agency.valueobjects.currency import Currency
+from currency_convert.domain.agency.valueobjects.rate import Rate
+from currency_convert.infrastructure.agency import memory
+from currency_convert.infrastructure.agency.cache import AgencyCache, CachedAgencyRepo
+from currency_convert.infrastructure.agency.repository import AgencyRepo
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingRepo(memory.AgencyRepo):
+    def __init__(self, agencies: set[Agency]) -> None:
+        super().__init__(agencies)
+        self.loads = 0
+
+    def find_by_name(self, name: str) -> Agency:
+        self.loads += 1
+        return super().find_by_name(name)
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def inner() -> CountingRepo:
+    agencies = set()
+    for name in ("EZB", "FED", "BOE"):
+        agency = Agency.create("EUR", name, "https://test.com", "Test Country")
+        agency.add_rate("EUR", "USD", "1.10", "2021-01-01T00:00:00")
+        agencies.add(agency)
+    return CountingRepo(agencies)
+
+
+def test_find_by_name_when_cached_should_not_load_again(
+    inner: CountingRepo, clock: Clock
+) -> None:
+    cache = AgencyCache(maxsize=2, ttl=60, clock=clock)
+    repo = CachedAgencyRepo(inner, cache)
+
+    first = repo.find_by_name("EZB")
+    second = repo.find_by_name("EZB")
+
+    assert first is second
+    assert inner.loads == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_find_by_name_when_ttl_passed_should_load_again(
+    inner: CountingRepo, clock: Clock
+) -> None:
+    cache = AgencyCache(maxsize=2, ttl=60, clock=clock)
+    repo = CachedAgencyRepo(inner, cache)
+
+    repo.find_by_name("EZB")
+    clock.now = 60
+    repo.find_by_name("EZB")
+
+    assert inner.loads == 2
+    assert cache.stats.expirations == 1
+
+
+def test_find_by_name_when_full_should_evict_least_recently_used(
+    inner: CountingRepo, clock: Clock
+) -> None:
+    cache = AgencyCache(maxsize=2, ttl=60, clock=clock)
+    repo = CachedAgencyRepo(inner, cache)
+
+    repo.find_by_name("EZB")
+    repo.find_by_name("FED")
+    repo.find_by_name("EZB")
+    repo.find_by_name("BOE")
+
+    assert cache.stats.evictions == 1
+    assert cache.get("FED") is None
+    assert cache.get("EZB") is not None
+
+
+def test_find_by_name_should_return_read_only_agency(
+    inner: CountingRepo, clock: Clock
+) -> None:
+    repo = CachedAgencyRepo(inner, AgencyCache(clock=clock))
+
+    agency = repo.find_by_name("EZB")
+
+    with pytest.raises(ReadOnlyAgencyError):
+        agency.add_rate("EUR", "GBP", "0.80", "2021-01-01T00:00:00")
+
+
+def test_save_should_invalidate_cached_agency(
+    MemoryAgencyRepository: AgencyRepo, clock: Clock
+) -> None:
+    cache = AgencyCache(clock=clock)
+    reader = CachedAgencyRepo(MemoryAgencyRepository, cache)
+    writer = CachedAgencyRepo(MemoryAgencyRepository, cache, read_only=False)
+    cached = reader.find_by_name("EZB")
+
+    agency = writer.find_by_name("EZB")
+    agency.add_rate("EUR", "CHF", "0.95", "2021-01-04T00:00:00")
+    writer.save(agency)
+
+    assert cache.stats.invalidations == 1
+    assert reader.find_by_name("EZB") is not cached
+    assert reader.find_by_name("EZB").get_rate("EUR", "CHF").rate == (
+        agency.get_rate("EUR", "CHF").rate
+    )
+
+
+def test_find_rate_when_cached_should_answer_from_cached_agency(
+    inner: CountingRepo, clock: Clock
+) -> None:
+    cache = AgencyCache(clock=clock)
+    repo = CachedAgencyRepo(inner, cache)
+    repo.find_by_name("EZB")
+
+    rate = repo.find_rate("EZB", "USD", "EUR", datetime.datetime(2021, 1, 1))
+    rates = repo.select_rates("EZB", RateFilter(currency_to="USD"))
+
+    assert rate.currency_from == "USD"
+    assert len(rates) == 1
+    assert cache.stats.hits == 2
+
+
+def test_find_rate_when_written_past_cache_should_not_answer_from_cache(
+    MemoryAgencyRepository: AgencyRepo, clock: Clock
+) -> None:
+    cache = AgencyCache(clock=clock)
+    repo = CachedAgencyRepo(MemoryAgencyRepository, cache)
+    agency = repo.find_by_name("EZB")
+
+    rate = Rate.create("EUR", "USD", "1.3", datetime.datetime(2021, 1, 5))
+    MemoryAgencyRepository.bulk_insert(agency, [rate])
+
+    assert repo.find_rate("EZB", "EUR", "USD").rate == rate.rate
+    assert repo.find_by_name("EZB").get_rate("EUR", "USD").rate == rate.rate
+    assert repo.select_rates("EZB", RateFilter(currency_to="USD", limit=1)) == (
+        repo.find_by_name("EZB").get_rate("EUR", "USD"),
+    )
+    assert cache.stats.outdated == 1
+
+
+class RecordingEngine:
+    def __init__(self, base: Currency) -> None:
+        self.lookups = 0
+
+    def add(self, rate: Rate) -> None:
+        pass
+
+    def lookup(
+        self, currency_from: int, currency_to: int, dt: datetime.datetime | None
+    ) -> Rate | None:
+        self.lookups += 1
+        return None
+
+
+@pytest.mark.parametrize(
+    "load_on_miss, loaded",
+    [(False, False), (True, True)],
+    ids=[
+        "find_rate_when_not_cached_should_query_repository",
+        "find_rate_when_not_cached_and_load_on_miss_should_consult_engine",
+    ],
+)
+def test_find_rate_when_not_cached(
+    MemoryAgencyRepository: AgencyRepo, load_on_miss: bool, loaded: bool
+) -> None:
+    engines: list[RecordingEngine] = []
+
+    def engine(base: Currency) -> RecordingEngine:
+        engines.append(RecordingEngine(base))
+        return engines[-1]
+
+    cache = AgencyCache()
+    inner = AgencyRepo(MemoryAgencyRepository.session, engine)
+    repo = CachedAgencyRepo(inner, cache, load_on_miss=load_on_miss)
+
+    rate = repo.find_rate(
+        "EZB", "USD", "GBP", datetime.datetime(2021, 1, 2), as_of=True
+    )
+
+    assert (rate.currency_from, rate.currency_to) == ("USD", "GBP")
+    assert (cache.stats.misses, cache.stats.bypassed) == (int(loaded), int(not loaded))
+    assert (cache.get("EZB") is not None) is loaded
+    assert sum(engine.lookups for engine in engines) == int(loaded)
+
+
+def test_select_rates_when_not_cached_should_count_bypass_not_miss(
+    inner: CountingRepo,
+) -> None:
+    cache = AgencyCache()
+    repo = CachedAgencyRepo(inner, cache)
+
+    rates = repo.select_rates("EZB", RateFilter(currency_from="EUR"))
+
+    assert len(rates) == 1
+    assert (cache.stats.misses, cache.stats.bypassed) == (0, 1)
@@ -1,6 +1,6 @@
 import pytest
 
-from currency_convert.domain.agency.valueobjects.currency import Currency
+from currency_convert.domain.agency.valueobjects.currency import ISO_4217, Currency
 from currency_convert.domain.primitives.valueobject import ValueObjectError
 
 
@@ -53,3 +53,36 @@ def test_create_when_code_is_invalid_length_should_raise_value_object_error(
 ) -> None:
     with pytest.raises(ValueObjectError):
         Currency.from_str(code)
+
+
+# Registry Tests
+@pytest.mark.parametrize(
+    "code, expected_ordinal",
+    [
+        ("EUR", 47),
+        ("USD", 147),
+    ],
+    ids=[
+        "from_str_when_code_is_iso_4217_should_return_registry_ordinal_for_eur",
+        "from_str_when_code_is_iso_4217_should_return_registry_ordinal_for_usd",
+    ],
+)
+def test_from_str_when_code_is_iso_4217_should_return_shared_instance(
+    code: str, expected_ordinal: int
+) -> None:
+    currency = Currency.from_str(code)
+    assert currency is Currency.from_str(code)
+    assert currency.ordinal == expected_ordinal
+    assert Currency.ordinal_of(code) == expected_ordinal
+
+
+def test_from_str_when_code_is_not_iso_4217_should_register_new_ordinal() -> None:
+    currency = Currency.from_str("HRK")
+    assert currency is Currency.from_str("HRK")
+    assert currency.ordinal >= len(ISO_4217)
+    assert currency == Currency(code="HRK")
+    assert currency != Currency.from_str("EUR")
+
+
+def test_ordinal_of_when_code_is_unknown_should_return_none() -> None:
+    assert Currency.ordinal_of("QQQQ") is None
@@ -1,3 +1,4 @@
+import datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -5,6 +6,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.session import Session
 
 from currency_convert.domain.agency.entities.agency import Agency, AgencySaveError
+from currency_convert.domain.agency.valueobjects.rate import Rate
 from currency_convert.infrastructure.agency.repository import AgencyRepo
 
 
@@ -25,7 +27,7 @@ def agency() -> Agency:
 
 
 @pytest.mark.parametrize(
-    "mock_into_db_side_effect, mock_merge_side_effect, mock_commit_side_effect, expected_error",
+    "mock_into_db_side_effect, mock_add_side_effect, mock_commit_side_effect, expected_error",
     [
         (
             SQLAlchemyError("Into DB error"),
@@ -33,12 +35,12 @@ def agency() -> Agency:
             None,
             AgencySaveError,
         ),
-        (None, SQLAlchemyError("Merge error"), None, AgencySaveError),
+        (None, SQLAlchemyError("Add error"), None, AgencySaveError),
         (None, None, SQLAlchemyError("Commit error"), AgencySaveError),
     ],
     ids=[
         "save_when_into_db_fails_should_roll_back_and_return_error",
-        "save_when_merge_fails_should_roll_back_and_return_error",
+        "save_when_add_fails_should_roll_back_and_return_error",
         "save_when_commit_fails_should_roll_back_and_return_error",
     ],
 )
@@ -48,16 +50,62 @@ def test_save_when_error_occurs_should__roll_back_and_return_error(
     agency_repo: tuple[AgencyRepo, MagicMock],
     agency: Agency,
     mock_into_db_side_effect: Exception,
-    mock_merge_side_effect: Exception,
+    mock_add_side_effect: Exception,
     mock_commit_side_effect: Exception,
     expected_error: str,
 ) -> None:
     repo, session = agency_repo
     mock_into_db.side_effect = mock_into_db_side_effect
-    session.merge.side_effect = mock_merge_side_effect
+    session.get.return_value = None
+    session.add.side_effect = mock_add_side_effect
     session.commit.side_effect = mock_commit_side_effect
 
     with pytest.raises(expected_error):
         repo.save(agency)
 
     session.rollback.assert_called_once()
+
+
+def test_save_when_agency_stored_should_insert_only_added_rates(
+    agency_repo: tuple[AgencyRepo, MagicMock], agency: Agency
+) -> None:
+    repo, session = agency_repo
+    agency.add_rate("USD", "EUR", "0.9", "2023-10-01T00:00:00")
+    repo.save(agency)
+    session.execute.reset_mock()
+
+    agency.add_rate("USD", "EUR", "0.8", "2023-10-02T00:00:00")
+    agency.add_rate("USD", "JPY", "150", "2023-10-02T00:00:00")
+    repo.save(agency)
+
+    session.merge.assert_not_called()
+    insert, touch = session.execute.call_args_list
+    _, rows = insert.args
+    assert [row["currency_to"] for row in rows] == ["EUR", "JPY"]
+    assert touch.args[0].table.name == "agencies"
+    assert agency.pending_rates() == ((), ())
+
+
+def test_bulk_insert_when_postgresql_should_copy_through_staging_table(
+    agency_repo: tuple[AgencyRepo, MagicMock], agency: Agency
+) -> None:
+    repo, session = agency_repo
+    repo.CHUNK_SIZE = 2
+    session.get_bind.return_value.dialect.name = "postgresql"
+    cursor = session.connection.return_value.connection.cursor.return_value
+    cursor.rowcount = 3
+    rates = [
+        Rate.create("USD", "EUR", "0.9", datetime.datetime(2023, 10, day))
+        for day in (1, 2, 3)
+    ]
+
+    result = repo.bulk_insert(agency, rates)
+
+    assert result.rows == 3
+    assert cursor.copy_expert.call_count == 2
+    statements = [call.args[0] for call in cursor.execute.call_args_list]
+    assert statements[0].startswith("CREATE TEMP TABLE rates_staging")
+    assert statements[-1].endswith(
+        "ON CONFLICT (agency_id, currency_to, currency_from, date) DO NOTHING"
+    )
+    session.commit.assert_called_once()
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from currency_convert.domain.agency.entities.agency import Agency
+from currency_convert.domain.agency.valueobjects.rate import Rate
+from currency_convert.infrastructure.agency.lazy import LazyAgency
+
+
+class _Source:
+    def __init__(self, rates: list[Rate]) -> None:
+        self._rates = rates
+        self.calls: list[tuple[str, datetime | None, datetime | None]] = []
+
+    def currencies(self) -> list[str]:
+        return sorted({rate.currency_to.code for rate in self._rates})
+
+    def rates(
+        self,
+        currency_to: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[Rate]:
+        self.calls.append((currency_to, start, end))
+        return [
+            rate
+            for rate in self._rates
+            if rate.currency_to == currency_to
+            and (start is None or start <= rate.dt)
+            and (end is None or rate.dt <= end)
+        ]
+
+
+def test_get_rate_should_load_only_touched_slices() -> None:
+    source = _Source(
+        [
+            Rate.create("USD", code, "1.50", datetime(2023, 9, day))
+            for code in ("EUR", "JPY")
+            for day in (1, 2, 3)
+        ]
+    )
+    agency = LazyAgency.from_agency(
+        Agency.create("USD", "Test Agency", "https://test.com", "Test Country"), source
+    )
+    date = datetime(2023, 9, 2)
+
+    agency.get_rate("USD", "EUR", date)
+    agency.get_rate("EUR", "USD", date)
+    agency.get_rate("USD", "EUR")
+
+    assert source.calls == [("EUR", date, date), ("EUR", None, None)]
+    assert [c.code for c in agency.currencies] == ["EUR", "JPY"]
+    assert len(agency.rates) == 3
+    agency.materialize()
+    assert len(agency.rates) == 6
@@ -0,0 +1,50 @@
+import datetime
+
+import pytest
+
+from currency_convert.infrastructure.agency.mapper import AgencyMapper
+
+CET = datetime.timezone(datetime.timedelta(hours=1))
+
+
+@pytest.mark.parametrize(
+    "dt, expected",
+    [
+        (
+            datetime.datetime(2021, 1, 1),
+            datetime.datetime(2021, 1, 1, tzinfo=datetime.UTC),
+        ),
+        (
+            datetime.datetime(2021, 1, 1, tzinfo=CET),
+            datetime.datetime(2020, 12, 31, 23, tzinfo=datetime.UTC),
+        ),
+    ],
+    ids=[
+        "into_db_date_when_naive_should_assume_utc",
+        "into_db_date_when_aware_should_convert_to_utc",
+    ],
+)
+def test_into_db_date(dt: datetime.datetime, expected: datetime.datetime) -> None:
+    stored = AgencyMapper.into_db_date(dt)
+    assert stored == expected
+    assert stored.tzinfo is datetime.UTC
+
+
+@pytest.mark.parametrize(
+    "dt, expected",
+    [
+        (datetime.datetime(2021, 1, 1), datetime.datetime(2021, 1, 1)),
+        (
+            datetime.datetime(2021, 1, 1, tzinfo=CET),
+            datetime.datetime(2020, 12, 31, 23),
+        ),
+    ],
+    ids=[
+        "from_db_date_when_naive_should_return_it_unchanged",
+        "from_db_date_when_aware_should_return_naive_utc",
+    ],
+)
+def test_from_db_date(dt: datetime.datetime, expected: datetime.datetime) -> None:
+    loaded = AgencyMapper.from_db_date(dt)
+    assert loaded == expected
+    assert loaded.tzinfo is None
@@ -0,0 +1,131 @@
+import datetime
+import itertools
+
+import pytest
+
+from currency_convert.domain.agency.entities.agency import Agency, RateNotFoundError
+from currency_convert.domain.agency.valueobjects.currency import Currency
+
+pytest.importorskip("numpy")
+
+from currency_convert.infrastructure.agency.matrix import MatrixEngine  # noqa: E402
+
+RATES = {
+    "USD": ("1.08450000", "1.09120000", "1.07730000"),
+    "JPY": ("155.12345678", "157.40000000", "156.03000000"),
+    "GBP": ("0.85210000", "0.84970000", "0.85330000"),
+    "CHF": ("0.97700000", "0.98010000", "0.96880000"),
+}
+DATES = ("2024-06-03T00:00:00", "2024-06-04T00:00:00", "2024-06-05T00:00:00")
+
+
+def _agency() -> Agency:
+    agency = Agency.create("EUR", "EZB", "https://test.com", "Test Country")
+    for code, rates in RATES.items():
+        for rate, date in zip(rates, DATES):
+            agency.add_rate("EUR", code, rate, date)
+    return agency
+
+
+@pytest.fixture
+def agency() -> Agency:
+    return _agency()
+
+
+@pytest.fixture
+def matrix_agency() -> Agency:
+    agency = _agency()
+    agency.use_engine(MatrixEngine(agency.base))
+    return agency
+
+
+@pytest.mark.parametrize(
+    "date",
+    [None, *(datetime.datetime.fromisoformat(date) for date in DATES)],
+    ids=[
+        "get_rate_when_no_date_should_match_decimal_path",
+        "get_rate_when_first_date_should_match_decimal_path",
+        "get_rate_when_second_date_should_match_decimal_path",
+        "get_rate_when_third_date_should_match_decimal_path",
+    ],
+)
+def test_get_rate_when_matrix_engine_should_match_decimal_path(
+    agency: Agency, matrix_agency: Agency, date: datetime.datetime | None
+) -> None:
+    for currency_from, currency_to in itertools.permutations([*RATES, "EUR"], 2):
+        expected = agency.get_rate(currency_from, currency_to, date)
+        actual = matrix_agency.get_rate(currency_from, currency_to, date)
+        assert actual.currency_from == expected.currency_from
+        assert actual.currency_to == expected.currency_to
+        assert actual.dt == expected.dt
+        assert abs(actual.rate.units - expected.rate.units) <= 1
+
+
+def test_lookup_when_rate_added_should_rebuild_matrix_for_date(
+    matrix_agency: Agency,
+) -> None:
+    date = datetime.datetime.fromisoformat(DATES[0])
+    assert matrix_agency.get_rate("USD", "JPY", date)
+    with pytest.raises(RateNotFoundError):
+        matrix_agency.get_rate("USD", "SEK", date)
+
+    matrix_agency.add_rate("EUR", "SEK", "11.50000000", DATES[0])
+
+    rate = matrix_agency.get_rate("USD", "SEK", date)
+    assert rate == matrix_agency.get_rate("EUR", "SEK", date).multiply(
+        matrix_agency.get_rate("USD", "EUR", date)
+    )
+
+
+def test_lookup_when_latest_dates_differ_should_return_none() -> None:
+    base = Currency.from_str("EUR")
+    agency = Agency.create("EUR", "EZB", "https://test.com", "Test Country")
+    agency.add_rate("EUR", "USD", "1.08", DATES[1])
+    agency.add_rate("EUR", "JPY", "155.00", DATES[0])
+    engine = MatrixEngine(base)
+    agency.use_engine(engine)
+
+    usd, jpy = Currency.from_str("USD"), Currency.from_str("JPY")
+    assert engine.lookup(usd.ordinal, jpy.ordinal, None) is None
+    assert agency.get_rate("USD", "JPY").dt == datetime.datetime.fromisoformat(DATES[0])
+
+
+@pytest.mark.parametrize(
+    "currency_from, currency_to, day, publish",
+    [
+        ("USD", "JPY", 1, False),
+        ("JPY", "USD", 1, False),
+        ("EUR", "USD", 1, False),
+        ("USD", "JPY", 0, False),
+        ("USD", "JPY", 1, True),
+    ],
+    ids=[
+        "lookup_when_leg_derived_should_be_derived",
+        "lookup_when_inverted_leg_derived_should_be_derived",
+        "lookup_when_base_pair_derived_should_be_derived",
+        "lookup_when_legs_published_should_not_be_derived",
+        "lookup_when_derived_leg_replaced_should_not_be_derived",
+    ],
+)
+def test_lookup_should_flag_derived_like_decimal_path(
+    currency_from: str, currency_to: str, day: int, publish: bool
+) -> None:
+    def gap_filled(engine: bool) -> Agency:
+        agency = Agency.create("EUR", "EZB", "https://test.com", "Test Country")
+        if engine:
+            agency.use_engine(MatrixEngine(agency.base))
+        for date in DATES:
+            agency.add_rate("EUR", "JPY", "155.00", date)
+        agency.add_rate("EUR", "USD", "1.08", DATES[0])
+        agency.add_rate("EUR", "USD", "1.09", DATES[2])
+        agency.fill_gaps("forward")
+        if publish:
+            agency.add_rate("EUR", "USD", "1.10", DATES[1])
+        return agency
+
+    date = datetime.datetime.fromisoformat(DATES[day])
+    expected = gap_filled(False).get_rate(currency_from, currency_to, date)
+    actual = gap_filled(True).get_rate(currency_from, currency_to, date)
+
+    assert actual.derived == expected.derived
+    assert expected.derived == (day == 1 and not publish)
@@ -56,6 +56,75 @@ def test_Money_from_str_when_valid_value_should_return_expected_results(
     assert values == expected_values
 
 
+# Arithmetic Tests
+@pytest.mark.parametrize(
+    "left, right, expected",
+    [
+        ("1.20", "1.33333333", decimal.Decimal("1.60000000")),
+        ("0.00000005", "0.5", decimal.Decimal("0.00000002")),
+        ("0.00000003", "0.5", decimal.Decimal("0.00000002")),
+        ("155.12345678", "0.00712345", decimal.Decimal("1.10501419")),
+    ],
+    ids=[
+        "Money_multiply_when_product_has_more_digits_should_round_to_precision",
+        "Money_multiply_when_remainder_is_half_and_quotient_even_should_round_down",
+        "Money_multiply_when_remainder_is_half_and_quotient_odd_should_round_up",
+        "Money_multiply_when_values_are_arbitrary_should_match_decimal_quantize",
+    ],
+)
+def test_Money_multiply_should_match_decimal_arithmetic(
+    left: str, right: str, expected: decimal.Decimal
+) -> None:
+    product = Money.from_str(left).multiply(Money.from_str(right))
+    assert product.amount == expected
+    assert product == Money.from_str(
+        str(decimal.Decimal(left) * decimal.Decimal(right))
+    )
+
+
+@pytest.mark.parametrize(
+    "input_str, expected",
+    [
+        ("0.65", decimal.Decimal("1.53846154")),
+        ("0.75", decimal.Decimal("1.33333333")),
+        ("8", decimal.Decimal("0.12500000")),
+        ("155.12345678", decimal.Decimal("0.00644648")),
+    ],
+    ids=[
+        "Money_invert_when_quotient_is_periodic_should_round_up",
+        "Money_invert_when_quotient_is_periodic_should_round_down",
+        "Money_invert_when_quotient_is_exact_should_not_round",
+        "Money_invert_when_value_is_large_should_round_to_precision",
+    ],
+)
+def test_Money_invert_should_match_decimal_arithmetic(
+    input_str: str, expected: decimal.Decimal
+) -> None:
+    inverted = Money.from_str(input_str).invert()
+    assert inverted.amount == expected
+    assert inverted == Money.from_str(str(1 / decimal.Decimal(input_str)))
+
+
+@pytest.mark.parametrize(
+    "left, right, step, steps, expected",
+    [
+        ("1.00", "1.10", 1, 3, decimal.Decimal("1.03333333")),
+        ("1.10", "1.00", 1, 3, decimal.Decimal("1.06666667")),
+        ("1.00", "1.10", 1, 2, decimal.Decimal("1.05000000")),
+    ],
+    ids=[
+        "Money_interpolate_when_rising_should_round_to_precision",
+        "Money_interpolate_when_falling_should_round_to_precision",
+        "Money_interpolate_when_midpoint_should_return_mean",
+    ],
+)
+def test_Money_interpolate_should_match_decimal_arithmetic(
+    left: str, right: str, step: int, steps: int, expected: decimal.Decimal
+) -> None:
+    value = Money.from_str(left).interpolate(Money.from_str(right), step, steps)
+    assert value.amount == expected
+
+
 # Error Tests
 @pytest.mark.parametrize(
     "input_str, exception",
@@ -83,3 +152,10 @@ def test_Money_from_str_when_invalid_value_should_raise_expected_errors(
 ) -> None:
     with pytest.raises(exception):
         Money.from_str(input_str)
+
+
+def test_Money_multiply_when_product_rounds_to_zero_should_raise_negative_error() -> (
+    None
+):
+    with pytest.raises(NegativeError):
+        Money.from_str("0.00000001").multiply(Money.from_str("0.25"))
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, create_engine, exc, text
+
+from currency_convert.infrastructure.pool import MeteredQueuePool, PoolMetrics
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Engine:
+    return create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=MeteredQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.01,
+    )
+
+
+def test_observe_when_connections_used_should_count_checkouts_and_overflow(
+    engine: Engine,
+) -> None:
+    metrics = PoolMetrics().observe(engine)
+
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("SELECT 1"))
+        second.execute(text("SELECT 1"))
+        during = metrics.snapshot(engine.pool)
+
+    after = metrics.snapshot(engine.pool)
+    assert during["checked_out"] == 2
+    assert during["overflow"] == 1
+    assert after["checkouts"] == after["checkins"] == 2
+    assert after["connects"] == after["peak_overflow"] + 1 == 2
+    assert after["wait_seconds"] >= after["max_wait_seconds"] > 0
+
+
+def test_observe_when_pool_exhausted_should_count_timeout(engine: Engine) -> None:
+    metrics = PoolMetrics().observe(engine)
+
+    with engine.connect(), engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert metrics.timeouts == 1
+    assert metrics.max_wait_seconds >= 0.01
+
+
+def test_observe_when_connection_invalidated_should_count_invalidation(
+    engine: Engine,
+) -> None:
+    metrics = PoolMetrics().observe(engine)
+
+    with engine.connect() as conn:
+        conn.invalidate()
+
+    assert metrics.invalidations == 1
+
+
+def test_observe_when_engine_disposed_should_keep_counting(engine: Engine) -> None:
+    metrics = PoolMetrics().observe(engine)
+    with engine.connect():
+        pass
+
+    engine.dispose()
+    with engine.connect():
+        pass
+
+    assert metrics.checkouts == 2
+    assert getattr(engine.pool, "metrics") is metrics
+    assert metrics.snapshot(engine.pool)["size"] == 1
@@ -85,6 +85,16 @@ def test_create_when_all_parameters_are_valid_should_return_rate_instance(
     assert rate_instance.dt == expected_date
 
 
+def test_hash_when_rates_are_equal_should_be_equal_and_deduplicate() -> None:
+    dt = datetime.datetime(2023, 10, 1, 0, 0, 0)
+    first = Rate.create("USD", "EUR", "0.85", dt)
+    second = Rate.create("USD", "EUR", "0.850", dt)
+    assert hash(first) == hash(second)
+    assert hash(first.currency_from) == hash(Currency.from_str("USD"))
+    assert hash(first.rate) == hash(Money.from_str("0.85"))
+    assert len({first, second}) == 1
+
+
 # Error Tests
 @pytest.mark.parametrize(
     "currency_from, currency_to, rate, date, expected_error",
@@ -0,0 +1,62 @@
+import datetime
+
+import pytest
+
+from currency_convert.domain.agency.valueobjects.rate import Rate
+from currency_convert.presentation.converter import schemas, serializers
+
+UTC = datetime.UTC
+DAY = datetime.datetime(2021, 1, 4)
+
+RATES = [
+    Rate.create("EUR", "USD", "1.1", DAY),
+    Rate.create("EUR", "JPY", "0.00000001", DAY.replace(microsecond=450)),
+    Rate.create("EUR", "CHF", "123456789.5", DAY, derived=True),
+    Rate.create("EUR", "GBP", "0.0000001", DAY.replace(tzinfo=UTC)),
+    Rate.create(
+        "EUR",
+        "RUB",
+        "90",
+        DAY.replace(tzinfo=datetime.timezone(datetime.timedelta(hours=-5, seconds=30))),
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "rate",
+    RATES,
+    ids=[
+        "rate_json_when_plain_should_match_schema",
+        "rate_json_when_microseconds_and_exponent_should_match_schema",
+        "rate_json_when_derived_and_large_should_match_schema",
+        "rate_json_when_utc_should_match_schema",
+        "rate_json_when_offset_with_seconds_should_match_schema",
+    ],
+)
+def test_rate_json(rate: Rate) -> None:
+    expected = schemas.Rate.model_validate(rate).model_dump_json()
+
+    assert serializers.rate_json(rate) == expected
+
+
+@pytest.mark.parametrize(
+    "rates",
+    [RATES, RATES[:1], []],
+    ids=[
+        "products_json_when_many_should_match_schema",
+        "products_json_when_one_should_match_schema",
+        "products_json_when_empty_should_match_schema",
+    ],
+)
+def test_products_json(rates: list[Rate]) -> None:
+    expected = schemas.Products(
+        data=[schemas.Rate.model_validate(rate) for rate in rates]
+    ).model_dump_json()
+
+    assert serializers.products_json(rates) == expected.encode()
+
+
+def test_product_json_should_match_schema() -> None:
+    expected = schemas.Product(data=schemas.Rate.model_validate(RATES[0]))
+
+    assert serializers.product_json(RATES[0]) == expected.model_dump_json().encode()
@@ -0,0 +1,200 @@
+import datetime
+from pathlib import Path
+
+import pytest
+
+from currency_convert.domain.agency.entities.agency import Agency, RateNotFoundError
+from currency_convert.domain.agency.entities.interface import (
+    AgencyVersion,
+    RateFilter,
+)
+from currency_convert.infrastructure.agency import memory
+from currency_convert.infrastructure.agency.shared import (
+    HEADER,
+    RECORD,
+    SharedRateRepo,
+    SharedRateStore,
+)
+
+DAY = datetime.datetime(2021, 1, 4)
+VERSION = AgencyVersion(0, DAY)
+
+
+@pytest.fixture
+def agency() -> Agency:
+    agency = Agency.create("EUR", "EZB", "https://test.com", "Test Country")
+    agency.add_rate("EUR", "USD", "1.10", "2021-01-01T00:00:00")
+    agency.add_rate("EUR", "USD", "1.20", "2021-01-04T00:00:00")
+    agency.add_rate("EUR", "GBP", "0.80", "2021-01-02T00:00:00")
+    agency.add_rate("EUR", "JPY", "130", "2021-01-04T00:00:00")
+    agency.fill_gaps("linear")
+    return agency
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SharedRateStore:
+    return SharedRateStore(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "currency_from, currency_to, dt, options",
+    [
+        ("EUR", "USD", DAY, {}),
+        ("USD", "EUR", None, {}),
+        ("USD", "GBP", DAY, {"as_of": True}),
+        ("GBP", "JPY", DAY, {"as_of": True, "max_staleness": datetime.timedelta(1)}),
+        ("EUR", "GBP", DAY, {}),
+        ("EUR", "CHF", None, {}),
+        ("EUR", "USD", DAY.replace(tzinfo=datetime.timezone.utc), {}),
+    ],
+    ids=[
+        "find_rate_when_exact_date_should_match_agency",
+        "find_rate_when_latest_inverted_should_match_agency",
+        "find_rate_when_cross_as_of_should_match_agency",
+        "find_rate_when_too_stale_should_match_agency",
+        "find_rate_when_no_rate_at_date_should_match_agency",
+        "find_rate_when_currency_unknown_should_match_agency",
+        "find_rate_when_date_aware_should_match_agency",
+    ],
+)
+def test_find_rate_should_answer_like_agency(
+    agency: Agency,
+    store: SharedRateStore,
+    currency_from: str,
+    currency_to: str,
+    dt: datetime.datetime | None,
+    options: dict[str, object],
+) -> None:
+    store.publish(agency, VERSION)
+
+    def answer(lookup: object) -> object:
+        try:
+            return lookup(currency_from, currency_to, dt, **options)  # type: ignore[operator]
+        except RateNotFoundError:
+            return RateNotFoundError
+
+    def from_store(*args: object, **kwargs: object) -> object:
+        return store.find_rate("EZB", *args, **kwargs)  # type: ignore[arg-type]
+
+    assert answer(from_store) == answer(agency.get_rate)
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        RateFilter(),
+        RateFilter(currency_to="USD", order="asc"),
+        RateFilter(start=datetime.datetime(2021, 1, 2), end=DAY, limit=3),
+        RateFilter(dt=DAY),
+        RateFilter(currency_from="USD"),
+    ],
+    ids=[
+        "select_rates_when_no_filter_should_match_agency",
+        "select_rates_when_currency_ascending_should_match_agency",
+        "select_rates_when_range_with_limit_should_match_agency",
+        "select_rates_when_date_should_match_agency",
+        "select_rates_when_nothing_matches_should_match_agency",
+    ],
+)
+def test_select_rates_should_answer_like_agency(
+    agency: Agency, store: SharedRateStore, spec: RateFilter
+) -> None:
+    store.publish(agency, VERSION)
+
+    rates = store.select_rates("EZB", spec)
+
+    assert rates is not None
+    assert sorted(rates, key=str) == sorted(agency.select_rates(spec), key=str)
+    assert [r.dt for r in rates] == [r.dt for r in agency.select_rates(spec)]
+
+
+def test_publish_should_write_fixed_width_records(
+    agency: Agency, store: SharedRateStore, tmp_path: Path
+) -> None:
+    store.publish(agency, VERSION)
+
+    size = (tmp_path / "EZB.rates").stat().st_size
+    assert RECORD.size == 24
+    assert size == HEADER.size + RECORD.size * len(agency.rates)
+
+
+def test_publish_when_other_worker_reads_should_refresh_without_reopening(
+    agency: Agency, store: SharedRateStore, tmp_path: Path
+) -> None:
+    reader = SharedRateStore(tmp_path)
+    assert reader.find_rate("EZB", "EUR", "USD") is None
+
+    store.publish(agency, VERSION)
+    assert reader.generation("EZB") == 1
+    agency.add_rate("EUR", "USD", "1.30", "2021-01-05T00:00:00")
+    store.publish(agency, AgencyVersion(1, DAY))
+
+    assert reader.generation("EZB") == 2
+    latest = reader.find_rate("EZB", "EUR", "USD")
+    assert latest == agency.get_rate("EUR", "USD")
+
+
+def test_shared_repo_should_publish_on_lookup_after_save(
+    agency: Agency, store: SharedRateStore
+) -> None:
+    repo = SharedRateRepo(memory.AgencyRepo({agency}), store)
+
+    repo.find_rate("EZB", "EUR", "USD")
+    agency.add_rate("EUR", "USD", "1.30", "2021-01-05T00:00:00")
+    repo.save(agency)
+
+    assert repo.find_rate("EZB", "EUR", "USD") == agency.get_rate("EUR", "USD")
+    assert store.generation("EZB") == 2
+    assert store.version("EZB") == repo.find_version("EZB")
+
+
+def test_publish_when_version_already_stored_should_not_write(
+    agency: Agency, store: SharedRateStore, tmp_path: Path
+) -> None:
+    other = SharedRateStore(tmp_path)
+
+    assert store.publish(agency, VERSION) == 1
+    assert other.publish(agency, VERSION) == 1
+    assert store.generation("EZB") == 1
+
+
+def test_shared_repo_when_other_worker_publishing_should_answer_from_repository(
+    agency: Agency, store: SharedRateStore, tmp_path: Path
+) -> None:
+    repo = SharedRateRepo(memory.AgencyRepo({agency}), store)
+
+    with SharedRateStore(tmp_path).claim("EZB") as claimed:
+        assert claimed
+        rate = repo.find_rate("EZB", "EUR", "USD")
+        rates = repo.select_rates("EZB", RateFilter(currency_to="USD", limit=1))
+
+    assert rate == rates[0] == agency.get_rate("EUR", "USD")
+    assert store.generation("EZB") == 0
+
+
+def test_shared_repo_when_written_without_publish_should_republish(
+    agency: Agency, store: SharedRateStore
+) -> None:
+    # bulk_insert, another process or a file left over from a restart
+    store.publish(agency, VERSION)
+    source = memory.AgencyRepo({agency})
+    agency.add_rate("EUR", "USD", "1.30", "2021-01-05T00:00:00")
+    source.save(agency)
+    repo = SharedRateRepo(source, store)
+
+    rate = repo.find_rate("EZB", "EUR", "USD")
+    rates = repo.select_rates("EZB", RateFilter(currency_to="USD", limit=1))
+
+    assert rate == rates[0] == agency.get_rate("EUR", "USD")
+    assert store.version("EZB") == source.find_version("EZB")
+    assert store.generation("EZB") == 2
+
+
+def test_publish_when_file_of_old_layout_should_replace_it(
+    agency: Agency, store: SharedRateStore, tmp_path: Path
+) -> None:
+    (tmp_path / "EZB.rates").write_bytes(b"RATE\x01\x00" + bytes(34))
+
+    assert store.version("EZB") is None
+    assert store.publish(agency, VERSION) == 1
+    assert store.version("EZB") == VERSION
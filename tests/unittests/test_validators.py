@@ -0,0 +1,126 @@
+import datetime
+from typing import Annotated
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from currency_convert.domain.agency.entities.interface import AgencyVersion
+from currency_convert.presentation.converter.validators import (
+    Validators,
+    not_modified,
+)
+
+MODIFIED = datetime.datetime(2021, 1, 4, 12, 30, 15, 250)
+VERSION = AgencyVersion(3, MODIFIED)
+LAST_MODIFIED = "Mon, 04 Jan 2021 12:30:15 GMT"
+
+
+def request(path: str = "/EZB/rates", query: str = "", **headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query.encode(),
+            "headers": [
+                (name.replace("_", "-").encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+def test_of_should_tag_version_per_path_and_query() -> None:
+    validators = Validators.of(VERSION, request())
+
+    assert validators.etag.startswith('"3-')
+    assert validators.last_modified == MODIFIED.replace(
+        microsecond=0, tzinfo=datetime.UTC
+    )
+    assert validators == Validators.of(VERSION, request())
+    assert validators.etag != Validators.of(VERSION, request(query="limit=1")).etag
+    assert validators.etag != Validators.of(VERSION, request("/EZB/rate")).etag
+    assert validators.etag != Validators.of(AgencyVersion(4, MODIFIED), request()).etag
+
+
+def test_headers_should_send_validators_and_max_age() -> None:
+    validators = Validators.of(VERSION, request())
+
+    assert validators.headers(60) == {
+        "ETag": validators.etag,
+        "Last-Modified": LAST_MODIFIED,
+        "Cache-Control": "public, max-age=60",
+    }
+
+
+ETAG = Validators.of(VERSION, request()).etag
+
+
+@pytest.mark.parametrize(
+    "headers, fresh",
+    [
+        ({}, False),
+        ({"if_none_match": ETAG}, True),
+        ({"if_none_match": f'"other", W/{ETAG}'}, True),
+        ({"if_none_match": "*"}, True),
+        ({"if_none_match": '"3-other"'}, False),
+        ({"if_modified_since": LAST_MODIFIED}, True),
+        ({"if_modified_since": "Tue, 05 Jan 2021 00:00:00 GMT"}, True),
+        ({"if_modified_since": "Mon, 04 Jan 2021 12:30:14 GMT"}, False),
+        ({"if_modified_since": "yesterday"}, False),
+        ({"if_none_match": '"other"', "if_modified_since": LAST_MODIFIED}, False),
+    ],
+    ids=[
+        "fresh_when_no_conditions_should_be_false",
+        "fresh_when_etag_matches_should_be_true",
+        "fresh_when_weak_etag_in_list_matches_should_be_true",
+        "fresh_when_any_etag_should_be_true",
+        "fresh_when_etag_of_other_body_should_be_false",
+        "fresh_when_not_modified_since_should_be_true",
+        "fresh_when_modified_before_date_should_be_true",
+        "fresh_when_modified_after_date_should_be_false",
+        "fresh_when_date_invalid_should_be_false",
+        "fresh_when_etag_differs_should_ignore_date",
+    ],
+)
+def test_fresh(headers: dict[str, str], fresh: bool) -> None:
+    assert Validators.of(VERSION, request(**headers)).fresh(request(**headers)) is fresh
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+
+    def headers(request: Request) -> dict[str, str]:
+        return not_modified(VERSION, request, 60)
+
+    @app.get("/EZB/rates")
+    def rates(headers: Annotated[dict[str, str], Depends(headers)]) -> JSONResponse:
+        return JSONResponse({"rates": []}, headers=headers)
+
+    return TestClient(app)
+
+
+def test_not_modified_when_client_copy_stale_should_send_body(
+    client: TestClient,
+) -> None:
+    response = client.get("/EZB/rates", headers={"If-None-Match": '"2-stale"'})
+
+    assert response.status_code == 200
+    assert response.json() == {"rates": []}
+
+
+def test_not_modified_when_client_copy_current_should_answer_304(
+    client: TestClient,
+) -> None:
+    etag = client.get("/EZB/rates").headers["ETag"]
+
+    for headers in ({"If-None-Match": etag}, {"If-Modified-Since": LAST_MODIFIED}):
+        response = client.get("/EZB/rates", headers=headers)
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        assert response.headers["Cache-Control"] == "public, max-age=60"